@@ -0,0 +1,125 @@
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.standin_server import StandInState, base_urls, start_server
+from proc_stats import process_tree_rss
+from run_report import percentile
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCES = {
+    "yes24": ("newbooks.py", "books_data.json", "/yes24"),
+    "oreilly": ("oreilly_scraper.py", "oreilly_books.json", "/oreilly"),
+    "manning": ("manning_fetch.py", "manning_books.json", "/manning"),
+}
+
+
+def count_records(path: Path) -> int:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return 0
+    if isinstance(data, dict):
+        return sum(len(books) for books in data.values())
+    return len(data)
+
+
+def run_source(name: str, extra_args: List[str], env: Dict[str, str], state: StandInState, timeout: float) -> Dict:
+    script, output_name, prefix = SOURCES[name]
+    state.reset()
+    with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as workdir:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, str(ROOT / script), *extra_args],
+            cwd=workdir,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        peak_rss = 0
+        done = threading.Event()
+
+        def sample() -> None:
+            nonlocal peak_rss
+            while not done.is_set():
+                peak_rss = max(peak_rss, process_tree_rss(process.pid))
+                done.wait(0.2)
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            returncode = "timeout"
+        wall = time.perf_counter() - start
+        done.set()
+        sampler.join()
+        books = count_records(Path(workdir) / output_name)
+
+    requests = [req for req in state.reset() if req["path"].startswith(prefix)]
+    latencies = [req["duration"] for req in requests]
+    return {
+        "source": name,
+        "exit": returncode,
+        "wall_s": round(wall, 3),
+        "pages": len(requests),
+        "failed_pages": sum(1 for req in requests if req["status"] >= 500),
+        "pages_per_s": round(len(requests) / wall, 2) if wall else 0,
+        "books": books,
+        "books_per_s": round(books / wall, 2) if wall else 0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "bytes_served": sum(req["bytes"] for req in requests),
+        "peak_rss_mb": round(peak_rss / (1024 * 1024), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline end-to-end scraper benchmark")
+    parser.add_argument("--sources", default="yes24,oreilly,manning")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0)
+    parser.add_argument("--manning-total", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=900)
+    parser.add_argument("--json", default="", help="also write the results to this JSON file")
+    for name in SOURCES:
+        parser.add_argument(f"--{name}-args", default="", help=f"extra arguments for the {name} scraper")
+    args = parser.parse_args()
+
+    state = StandInState(args.latency_ms, args.jitter_ms, args.failure_rate, args.manning_total)
+    server = start_server(state)
+    env = dict(os.environ, **base_urls(server))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH", "")]))
+
+    results = []
+    try:
+        for name in [source.strip() for source in args.sources.split(",") if source.strip()]:
+            extra_args = shlex.split(getattr(args, f"{name}_args"))
+            results.append(run_source(name, extra_args, env, state, args.timeout))
+    finally:
+        server.shutdown()
+
+    columns = ["source", "exit", "wall_s", "pages", "failed_pages", "pages_per_s", "books", "books_per_s", "p50_ms", "p95_ms", "peak_rss_mb"]
+    print("  ".join(f"{column:>12}" for column in columns))
+    for row in results:
+        print("  ".join(f"{str(row[column]):>12}" for column in columns))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if any(row["exit"] != 0 for row in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
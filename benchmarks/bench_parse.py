@@ -0,0 +1,97 @@
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import newbooks
+import oreilly_scraper
+from benchmarks import fixtures
+from html_engines import ENGINES
+
+
+def parse_yes24(page_source: str, engine: str) -> List[Dict[str, str]]:
+    return [book for book in map(newbooks.build_book, newbooks.extract_items(page_source, engine)) if book]
+
+
+PARSERS: Dict[str, Callable[[str, str], List[Dict[str, str]]]] = {
+    "oreilly": oreilly_scraper.parse_books,
+    "yes24": parse_yes24,
+}
+
+
+def load_fixtures(html_dir: str = "") -> List[Tuple[str, str, str]]:
+    """``html_dir``의 저장된 페이지나 생성한 fixture의 (site, name, page_source)."""
+    if html_dir:
+        pages = []
+        for path in sorted(Path(html_dir).glob("*.html")):
+            site = path.name.split("_", 1)[0]
+            if site in PARSERS:
+                pages.append((site, path.name, path.read_text(encoding="utf-8")))
+        return pages
+
+    oreilly_books = fixtures.load_oreilly_books()
+    pages = [("oreilly", f"oreilly_search_{seed}", fixtures.oreilly_search_page(oreilly_books, seed)) for seed in range(3)]
+    pages.append(("oreilly", "oreilly_nested_blocks", fixtures.oreilly_nested_blocks_page(oreilly_books)))
+    for publisher in newbooks.PUBLISHERS[:5]:
+        books = fixtures.yes24_books(publisher["id"])
+        pages.append(("yes24", f"yes24_search_{publisher['id']}", fixtures.yes24_search_page(books, int(publisher["id"]))))
+    return pages
+
+
+def time_engine(parse: Callable, page_source: str, engine: str, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(page_source, engine)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(html_dir: str = "", repeat: int = 10) -> List[Dict]:
+    results = []
+    for site, name, page_source in load_fixtures(html_dir):
+        parse = PARSERS[site]
+        reference = parse(page_source, "soup")
+        baseline = None
+        for engine in ENGINES:
+            median = statistics.median(time_engine(parse, page_source, engine, repeat))
+            if engine == "soup":
+                baseline = median
+            results.append({
+                "site": site,
+                "fixture": name,
+                "bytes": len(page_source.encode("utf-8")),
+                "records": len(reference),
+                "engine": engine,
+                "median_ms": round(median * 1000, 3),
+                "speedup": round(baseline / median, 2) if baseline and median else None,
+                "identical": parse(page_source, engine) == reference,
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the scraper parse engines")
+    parser.add_argument("--html-dir", default="", help="directory of saved oreilly_*.html / yes24_*.html pages")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", default="", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.html_dir, args.repeat)
+    print(f"{'fixture':<28} {'engine':<9} {'KB':>7} {'records':>7} {'median ms':>10} {'speedup':>8} identical")
+    for row in results:
+        print(
+            f"{row['fixture']:<28} {row['engine']:<9} {row['bytes'] / 1024:>7.1f} {row['records']:>7} "
+            f"{row['median_ms']:>10.2f} {row['speedup'] or 0:>7.2f}x {row['identical']}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    if not all(row["identical"] for row in results):
+        raise SystemExit("Some engines produced different output")
+
+
+if __name__ == "__main__":
+    main()
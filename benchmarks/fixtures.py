@@ -0,0 +1,154 @@
+import html
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+OREILLY_DATA = ROOT / "oreilly_books.json"
+
+_SCRIPT_NOISE = "window.__APOLLO_STATE__ = " + json.dumps({f"k{i}": "x" * 40 for i in range(800)}) + ";"
+
+
+def _page(body: str, seed: int) -> str:
+    rng = random.Random(seed)
+    nav = "".join(f'<li class="nav-item"><a href="/c/{i}">메뉴 {i}</a></li>' for i in range(60))
+    footer = "".join(f'<p class="foot">{"·" * rng.randint(5, 40)} 링크 {i}</p>' for i in range(80))
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>fixture</title>'
+        f"<style>{'.x{color:red}' * 300}</style></head><body>"
+        f'<header><ul class="nav">{nav}</ul></header><main>{body}</main>'
+        f"<footer>{footer}</footer><script>{_SCRIPT_NOISE}</script></body></html>"
+    )
+
+
+def load_oreilly_books() -> List[Dict[str, str]]:
+    return json.loads(OREILLY_DATA.read_text(encoding="utf-8"))
+
+
+def oreilly_search_page(books: List[Dict[str, str]], seed: int = 0) -> str:
+    """책마다 ``search-card`` 하나가 있는 검색 페이지 (불완전한 중복 카드 몇 개 포함)."""
+    rng = random.Random(seed)
+    cards = []
+    for index, book in enumerate(books):
+        href = book["detail_link"].replace("https://learning.oreilly.com", "") if rng.random() < 0.5 else book["detail_link"]
+        cover = html.escape(book["cover_image"].replace("https://www.oreilly.com", ""))
+        image = f'<img src="{cover}" alt="">' if rng.random() < 0.7 else f'<img data-src="{cover}" alt="">'
+        prefix = "출판일: " if rng.random() < 0.3 else ""
+        footers = (
+            f'<p class="MuiTypography-root MuiTypography-cardFooter">{rng.choice(["", "  ", "320 pages"])}</p>'
+            f'<p class="MuiTypography-root MuiTypography-cardFooter">{prefix}{html.escape(book["published_at"])}</p>'
+        )
+        title = f'<h4 class="MuiTypography-root title">  {html.escape(book["title"])}\n</h4>' if rng.random() < 0.8 else ""
+        cards.append(
+            f'<div class="MuiCard-root" data-testid="search-card-{index}"><div class="cover">{image}</div>{title}'
+            f'<a class="MuiTypography-root MuiTypography-link" href="{html.escape(href)}">{html.escape(book["title"])}</a>'
+            f'<div data-testid="search-card-description-{index}"><span>{html.escape(book["description"])}</span></div>'
+            f"{footers}</div>"
+        )
+        if rng.random() < 0.1:
+            cards.append(
+                f'<div data-testid="search-card-dup-{index}">'
+                f'<a class="MuiTypography-link" href="{html.escape(href)}">{html.escape(book["title"])}</a></div>'
+            )
+    return _page(f'<section class="results">{"".join(cards)}</section>', seed)
+
+
+def oreilly_nested_blocks_page(books: List[Dict[str, str]], seed: int = 0) -> str:
+    """React가 그리는 것처럼 ``<p>``와 제목 태그 안에 블록 요소가 들어간 검색 페이지.
+
+    HTML4 규칙을 따르는 파서(lxml 등)는 블록을 밖으로 옮겨 날짜와 제목 일부를 잃으므로 엔진을 추가할 때 확인한다.
+    """
+    rng = random.Random(seed)
+    cards = []
+    for index, book in enumerate(books):
+        words = book["title"].split(" ", 1)
+        rest = f"<p>{html.escape(words[1])}</p>" if len(words) > 1 else ""
+        cards.append(
+            f'<div class="MuiCard-root" data-testid="search-card-{index}">'
+            f'<div class="cover"><img src="{html.escape(book["cover_image"])}" alt=""></div>'
+            f'<h4 class="MuiTypography-root title">{html.escape(words[0])} {rest}</h4>'
+            f'<a class="MuiTypography-root MuiTypography-link" href="{html.escape(book["detail_link"])}">'
+            f'{html.escape(book["title"])}</a>'
+            f'<div data-testid="search-card-description-{index}"><p><div>{html.escape(book["description"])}</div></p></div>'
+            f'<p class="MuiTypography-root MuiTypography-cardFooter"><div>{rng.choice(["", "320 pages"])}</div></p>'
+            f'<p class="MuiTypography-root MuiTypography-cardFooter"><div>{html.escape(book["published_at"])}</div></p>'
+            "</div>"
+        )
+    return _page(f'<section class="results">{"".join(cards)}</section>', seed)
+
+
+def yes24_books(publisher_id: str, count: int = 12) -> List[Dict[str, str]]:
+    """출판사 하나의 가상 yes24 도서 (출판사 id가 같으면 항상 같다)."""
+    rng = random.Random(publisher_id)
+    books = []
+    for index in range(count):
+        goods_no = str(100000000 + rng.randint(0, 99999999))
+        books.append({
+            "goods_no": goods_no,
+            "title": f"{rng.choice(['실전', '처음 배우는', '혼자 공부하는', '모던'])} {rng.choice(['파이썬', '자바', '쿠버네티스', 'LLM', 'SQL'])} {index + 1}",
+            "author": f"저자{rng.randint(1, 99)} 저",
+            "price": f"{rng.randint(15, 45)},000",
+            "release_date": f"2026년 {rng.randint(1, 12):02d}월 {rng.randint(1, 28):02d}일",
+            "sell_num": str(rng.randint(0, 30000)),
+        })
+    return books
+
+
+def yes24_search_page(books: List[Dict[str, str]], seed: int = 0) -> str:
+    rng = random.Random(seed)
+    items = []
+    for book in books:
+        goods_no = book["goods_no"]
+        attrs = f' data-goods-no="{goods_no}"' if rng.random() < 0.9 else ""
+        image = rng.choice([
+            f'<img data-original="//image.yes24.com/goods/{goods_no}/L" src="//image.yes24.com/sysimage/lazy.gif">',
+            f'<img src="https://image.yes24.com/goods/{goods_no}/L">',
+            '<img src="https://image.yes24.com/momo/Noimg_L.jpg">',
+        ])
+        items.append(
+            f'<li class="itemUnit"{attrs}><div class="item_img">{image}</div><div class="item_info">'
+            f'<a class="info_name" href="/goods/detail/{goods_no}"> <span>[도서]</span> {html.escape(book["title"])}\n</a>'
+            f'<span class="info_auth"> {html.escape(book["author"])} </span>'
+            f'<span class="info_price"><em class="txt_num">{book["price"]}</em>원</span></div></li>'
+        )
+    return _page(f'<ul class="goodsList">{"".join(items)}</ul>', seed)
+
+
+def yes24_detail_page(book: Dict[str, str], seed: int = 0) -> str:
+    sell_num = f"{int(book['sell_num']):,}"
+    body = (
+        f'<div class="gd_infoTop"><h2 class="gd_name">{html.escape(book["title"])}</h2>'
+        f'<span class="authPub"><span class="auth">{html.escape(book["author"])}</span>'
+        f'<span class="date">{book["release_date"]}</span></span></div>'
+        f'<div class="gdBasicSet gdRating"><span class="sellNum">판매지수 <span class="num">{sell_num}</span></span></div>'
+    )
+    return _page(body, seed)
+
+
+def yes24_home_page() -> str:
+    return _page('<div class="home">YES24 fixture</div>', 0)
+
+
+MANNING_DATA = ROOT / "manning_books.json"
+MANNING_COVER_BASE = "https://images.manning.com/320/400/resize/"
+
+
+def manning_catalog_items(total: int = 0) -> List[Dict[str, str]]:
+    """``manning_books.json``으로 만든 ``getCatalogData`` 항목. ``total``이 더 크면 페이지 넘김용 가상 도서를 덧붙인다."""
+    books = json.loads(MANNING_DATA.read_text(encoding="utf-8"))
+    items = [
+        {
+            "title": book["title"],
+            "link": book["detail_link"],
+            "imageUrl": book["cover_image"].replace(MANNING_COVER_BASE, "/"),
+        }
+        for book in books
+    ]
+    for index in range(len(items), total):
+        items.append({
+            "title": f"Synthetic Title {index + 1}",
+            "link": f"https://www.manning.com/books/synthetic-title-{index + 1}",
+            "imageUrl": f"/book/s/synthetic-{index + 1}.png",
+        })
+    return items
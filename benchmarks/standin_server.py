@@ -0,0 +1,161 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import newbooks
+from benchmarks import fixtures
+
+MANNING_PAGE_SIZE = 24
+
+
+class StandInState:
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, failure_rate: float = 0, manning_total: int = 0, seed: int = 0) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests: List[Dict] = []
+
+        self.yes24_books: Dict[str, List[Dict[str, str]]] = {}
+        self.yes24_goods: Dict[str, Dict[str, str]] = {}
+        for publisher in newbooks.PUBLISHERS:
+            books = fixtures.yes24_books(publisher["id"])
+            self.yes24_books[publisher["id"]] = books
+            for book in books:
+                self.yes24_goods[book["goods_no"]] = book
+        self.oreilly_page = fixtures.oreilly_search_page(fixtures.load_oreilly_books())
+        self.manning_items = fixtures.manning_catalog_items(manning_total)
+
+    def delay_and_fail(self) -> bool:
+        with self.lock:
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            fail = self.rng.random() < self.failure_rate
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def record(self, method: str, path: str, status: int, duration: float, size: int) -> None:
+        with self.lock:
+            self.requests.append({"method": method, "path": path, "status": status, "duration": duration, "bytes": size})
+
+    def reset(self) -> List[Dict]:
+        with self.lock:
+            requests, self.requests = self.requests, []
+        return requests
+
+    def route(self, method: str, raw_path: str, body: bytes) -> Tuple[int, str, bytes]:
+        parts = urlsplit(raw_path)
+        path, query = parts.path, parse_qs(parts.query)
+
+        if method == "GET" and path.rstrip("/") == "/yes24":
+            return 200, "text/html; charset=utf-8", fixtures.yes24_home_page().encode()
+        if method == "GET" and path == "/yes24/search":
+            publisher_id = query.get("mkEntrNo", [""])[0]
+            books = self.yes24_books.get(publisher_id)
+            if books is None:
+                return 404, "text/plain", b"unknown publisher"
+            return 200, "text/html; charset=utf-8", fixtures.yes24_search_page(books, int(publisher_id)).encode()
+        if method == "GET" and path.startswith("/yes24/goods/detail/"):
+            book = self.yes24_goods.get(path.rsplit("/", 1)[-1])
+            if book is None:
+                return 404, "text/plain", b"unknown goods"
+            return 200, "text/html; charset=utf-8", fixtures.yes24_detail_page(book).encode()
+        if method == "GET" and path == "/oreilly/search/":
+            if int(query.get("page", ["1"])[0]) > 1:
+                # 기록된 결과는 한 페이지뿐이고, 그 뒤 페이지는 실제 검색처럼 비어 있다
+                return 200, "text/html; charset=utf-8", fixtures.oreilly_search_page([]).encode()
+            return 200, "text/html; charset=utf-8", self.oreilly_page.encode()
+        if method == "POST" and path == "/manning/search/getCatalogData":
+            payload = json.loads(body or b"{}")
+            return 200, "application/json", json.dumps(self.manning_page(int(payload.get("page") or 1))).encode()
+        return 404, "text/plain", b"not found"
+
+    def manning_page(self, page: int) -> Dict:
+        total = len(self.manning_items)
+        start = (page - 1) * MANNING_PAGE_SIZE
+        return {
+            "items": self.manning_items[start:start + MANNING_PAGE_SIZE],
+            "page": page,
+            "pageSize": MANNING_PAGE_SIZE,
+            "totalCount": total,
+            "totalPages": max(1, -(-total // MANNING_PAGE_SIZE)),
+        }
+
+
+def make_handler(state: StandInState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _serve(self, method: str) -> None:
+            start = time.perf_counter()
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            if state.delay_and_fail():
+                status, content_type, payload = 503, "text/plain", b"injected failure"
+            else:
+                status, content_type, payload = state.route(method, self.path, body)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            if status == 503:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(payload)
+            state.record(method, self.path, status, time.perf_counter() - start, len(payload))
+
+        def do_GET(self) -> None:
+            self._serve("GET")
+
+        def do_POST(self) -> None:
+            self._serve("POST")
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return Handler
+
+
+def start_server(state: StandInState, port: int = 0, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def base_urls(server: ThreadingHTTPServer) -> Dict[str, str]:
+    host, port = server.server_address[:2]
+    root = f"http://{host}:{port}"
+    return {
+        "YES24_BASE_URL": f"{root}/yes24",
+        "OREILLY_BASE_URL": f"{root}/oreilly",
+        "MANNING_BASE_URL": f"{root}/manning",
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve recorded scraper fixtures locally")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0)
+    parser.add_argument("--manning-total", type=int, default=0, help="pad the Manning catalog to this many items")
+    args = parser.parse_args(argv)
+
+    state = StandInState(args.latency_ms, args.jitter_ms, args.failure_rate, args.manning_total)
+    server = start_server(state, args.port)
+    for name, url in base_urls(server).items():
+        print(f"export {name}={url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import release_dates
+from change_feed import flatten
+from ndjson_output import iter_records
+
+STORE_PATH_ENV = "BOOK_STORE_PATH"
+# BOOK_STORE_PATH로 위치를 바꾸거나, 빈 문자열로 지정하면 저장소를 쓰지 않는다
+DEFAULT_STORE_PATH = Path(".cache") / "books.sqlite3"
+# .cache는 CI 캐시라 지워질 수 있으므로 판매지수 표본은 커밋되는 월별 파일에도 남긴다
+DEFAULT_HISTORY_ROOT = Path("history") / "sell_num"
+SOURCE_FILES = {
+    "yes24": "books_data.json",
+    "oreilly": "oreilly_books.json",
+    "manning": "manning_books.json",
+}
+# yes24 외에는 출판사가 하나뿐이다
+SOURCE_PUBLISHERS = {
+    "oreilly": "O'Reilly",
+    "manning": "Manning",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    source TEXT NOT NULL,
+    book_key TEXT NOT NULL,
+    publisher TEXT,
+    title TEXT,
+    goods_no TEXT,
+    release_date TEXT,
+    position INTEGER NOT NULL,
+    present INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (source, book_key)
+);
+CREATE INDEX IF NOT EXISTS idx_books_source ON books (source, present, position);
+CREATE INDEX IF NOT EXISTS idx_books_publisher ON books (publisher);
+CREATE INDEX IF NOT EXISTS idx_books_release_date ON books (release_date);
+CREATE INDEX IF NOT EXISTS idx_books_goods_no ON books (goods_no);
+CREATE TABLE IF NOT EXISTS sell_num_history (
+    source TEXT NOT NULL,
+    book_key TEXT NOT NULL,
+    observed_at TEXT NOT NULL,
+    sell_num INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sell_num_history ON sell_num_history (source, book_key, observed_at);
+CREATE INDEX IF NOT EXISTS idx_sell_num_history_time ON sell_num_history (observed_at);
+CREATE TABLE IF NOT EXISTS source_groups (
+    source TEXT PRIMARY KEY,
+    names TEXT NOT NULL
+);
+"""
+
+def normalize_release_date(record: Dict) -> Optional[str]:
+    """레코드 출간일의 ISO 날짜. 일이 없으면 1일로 본다."""
+    released = release_dates.to_date(record.get("release_date") or record.get("published_at"))
+    return released.isoformat() if released is not None else None
+
+
+def parse_sell_num(value: object) -> Optional[int]:
+    digits = re.sub(r"\D", "", str(value or ""))
+    return int(digits) if digits else None
+
+
+class BookStore:
+    """모든 스크레이퍼의 책과 yes24 판매지수 기록을 보관하는 SQLite 저장소.
+
+    ``books``는 소스별 최신 레코드를 :mod:`change_feed`와 같은 키로 원본 JSON과 함께
+    보관하고, 최신 결과에서 빠진 책은 ``present = 0``으로 남긴다. ``sell_num_history``는
+    상세 페이지에서 실제로 읽은 판매지수만 한 줄씩 쌓는다.
+    """
+
+    def __init__(
+        self, path: Union[str, Path] = DEFAULT_STORE_PATH, history_root: Optional[Union[str, Path]] = None
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.history_root = Path(history_root) if history_root is not None else None
+        # run_all.py가 세 스크레이퍼를 동시에 돌리므로 잠금을 기다릴 수 있게 한다
+        self.conn = sqlite3.connect(str(self.path), timeout=60)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        if self.history_root is not None:
+            restored = self.restore_history()
+            if restored:
+                print(f"[store] restored {restored} sales-index samples from {self.history_root}")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "BookStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _add_sample(self, source: str, key: str, observed_at: str, sell_num: int) -> bool:
+        cursor = self.conn.execute(
+            """
+            INSERT INTO sell_num_history (source, book_key, observed_at, sell_num)
+            SELECT ?, ?, ?, ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM sell_num_history WHERE source = ? AND book_key = ? AND observed_at = ?
+            )
+            """,
+            (source, key, observed_at, sell_num, source, key, observed_at),
+        )
+        return cursor.rowcount > 0
+
+    def restore_history(self) -> int:
+        """내보낸 표본 중 DB의 가장 최근 표본 이후 것을 다시 넣고, 넣은 개수를 돌려준다."""
+        if not self.history_root.is_dir():
+            return 0
+        latest = self.conn.execute("SELECT MAX(observed_at) FROM sell_num_history").fetchone()[0]
+        restored = 0
+        with self.conn:
+            for path in sorted(self.history_root.glob("*.ndjson")):
+                # 파일은 월별이므로 가장 최근 표본이 있는 달부터만 읽는다
+                if latest and path.stem < latest[:7]:
+                    continue
+                for sample in iter_records(path):
+                    restored += self._add_sample(
+                        sample["source"], sample["book_key"], sample["observed_at"], sample["sell_num"]
+                    )
+        return restored
+
+    def _export_samples(self, samples: List[Dict]) -> None:
+        by_month: Dict[str, List[Dict]] = {}
+        for sample in samples:
+            by_month.setdefault(sample["observed_at"][:7], []).append(sample)
+        self.history_root.mkdir(parents=True, exist_ok=True)
+        for month, rows in by_month.items():
+            with (self.history_root / f"{month}.ndjson").open("a", encoding="utf-8") as fp:
+                fp.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+    def upsert(self, source: str, data: Union[Dict, List], observed_at: Optional[datetime] = None) -> int:
+        """``source``의 실행 결과 한 번을 저장하고 레코드 수를 돌려준다.
+
+        판매지수는 가져온 시각인 ``sell_num_at``으로 가져올 때마다 한 번만 기록한다.
+        이 필드가 없는 레코드는 ``observed_at``으로 기록하고, ``None``이면 이번에 가져온
+        값이 아니므로 기록하지 않는다.
+        """
+        observed = (observed_at or datetime.now(timezone.utc)).isoformat(timespec="seconds")
+        records = flatten(source, data)
+        samples = []
+        with self.conn:
+            self.conn.execute("UPDATE books SET present = 0 WHERE source = ?", (source,))
+            if isinstance(data, dict):
+                # 도서가 없는 출판사도 내보낼 때 같은 자리에 다시 나오도록 순서를 저장한다
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO source_groups (source, names) VALUES (?, ?)",
+                    (source, json.dumps(list(data), ensure_ascii=False)),
+                )
+            for position, (key, record) in enumerate(records.items()):
+                original = record
+                if isinstance(data, dict):
+                    original = {field: value for field, value in record.items() if field != "publisher"}
+                self.conn.execute(
+                    """
+                    INSERT INTO books (source, book_key, publisher, title, goods_no, release_date,
+                                       position, present, data, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?, ?)
+                    ON CONFLICT (source, book_key) DO UPDATE SET
+                        publisher = excluded.publisher,
+                        title = excluded.title,
+                        goods_no = excluded.goods_no,
+                        release_date = excluded.release_date,
+                        position = excluded.position,
+                        present = 1,
+                        data = excluded.data,
+                        last_seen = excluded.last_seen
+                    """,
+                    (
+                        source,
+                        key,
+                        record.get("publisher") or SOURCE_PUBLISHERS.get(source),
+                        record.get("title"),
+                        record.get("goods_no") or None,
+                        normalize_release_date(record),
+                        position,
+                        json.dumps(original, ensure_ascii=False),
+                        observed,
+                        observed,
+                    ),
+                )
+                sell_num = parse_sell_num(record.get("sell_num"))
+                sample_at = record.get("sell_num_at", observed)
+                if "sell_num" in record and sell_num is not None and sample_at:
+                    if self._add_sample(source, key, sample_at, sell_num):
+                        samples.append(
+                            {"source": source, "book_key": key, "observed_at": sample_at, "sell_num": sell_num}
+                        )
+        if samples and self.history_root is not None:
+            self._export_samples(samples)
+        return len(records)
+
+    def export(self, source: str) -> Union[Dict, List]:
+        """``source``의 최신 결과 (JSON 파일과 같은 구조)."""
+        rows = self.conn.execute(
+            "SELECT publisher, data FROM books WHERE source = ? AND present = 1 ORDER BY position", (source,)
+        ).fetchall()
+        if source != "yes24":
+            return [json.loads(row["data"]) for row in rows]
+        names = self.conn.execute("SELECT names FROM source_groups WHERE source = ?", (source,)).fetchone()
+        grouped: Dict[str, List[Dict]] = {name: [] for name in json.loads(names["names"])} if names else {}
+        for row in rows:
+            grouped.setdefault(row["publisher"], []).append(json.loads(row["data"]))
+        return grouped
+
+    def released_since(self, since: date, until: Optional[date] = None) -> List[sqlite3.Row]:
+        """``since``와 ``until`` 사이에 나온 모든 소스의 책. 출간일이 없으면 처음 본 날을 쓴다."""
+        until = until or date.today()
+        return self.conn.execute(
+            """
+            SELECT source, publisher, title, release_date, first_seen FROM books
+            WHERE present = 1 AND release_date BETWEEN ? AND ?
+            UNION ALL
+            SELECT source, publisher, title, release_date, first_seen FROM books
+            WHERE present = 1 AND release_date IS NULL AND first_seen >= ?
+            ORDER BY release_date DESC, first_seen DESC
+            """,
+            (since.isoformat(), until.isoformat(), since.isoformat()),
+        ).fetchall()
+
+    def rising(self, since: datetime, limit: int = 20) -> List[sqlite3.Row]:
+        """``since`` 이후 처음과 마지막 기록 사이에 ``sell_num``이 가장 많이 오른 책."""
+        return self.conn.execute(
+            """
+            WITH recent AS (
+                SELECT source, book_key, sell_num,
+                       ROW_NUMBER() OVER (PARTITION BY source, book_key ORDER BY observed_at) AS oldest,
+                       ROW_NUMBER() OVER (PARTITION BY source, book_key ORDER BY observed_at DESC) AS newest
+                FROM sell_num_history WHERE observed_at >= ?
+            )
+            SELECT b.source, b.publisher, b.title, earliest.sell_num AS start, latest.sell_num AS end,
+                   latest.sell_num - earliest.sell_num AS rise
+            FROM recent AS earliest
+            JOIN recent AS latest
+              ON latest.source = earliest.source AND latest.book_key = earliest.book_key AND latest.newest = 1
+            JOIN books AS b ON b.source = earliest.source AND b.book_key = earliest.book_key
+            WHERE earliest.oldest = 1 AND latest.sell_num > earliest.sell_num
+            ORDER BY rise DESC LIMIT ?
+            """,
+            (since.isoformat(timespec="seconds"), limit),
+        ).fetchall()
+
+
+def store_path() -> Optional[Path]:
+    value = os.environ.get(STORE_PATH_ENV)
+    if value is None:
+        return DEFAULT_STORE_PATH
+    return Path(value) if value else None
+
+
+def ingest_file(source: str, data_path: Union[str, Path]) -> None:
+    """``data_path``의 결과를 저장소에 반영한다. 저장소 오류는 출력만 하고 스크레이퍼 실행을 실패시키지 않는다."""
+    path = store_path()
+    if path is None:
+        return
+    try:
+        data = json.loads(Path(data_path).read_text(encoding="utf-8"))
+        with BookStore(path, DEFAULT_HISTORY_ROOT) as store:
+            count = store.upsert(source, data)
+        print(f"[store] {source}: upserted {count} records into {path}")
+    except (OSError, ValueError, sqlite3.Error) as exc:
+        print(f"[store] {source}: could not update {path}: {exc}")
+
+
+def _write_json(data: Union[Dict, List], output_path: Path) -> None:
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        json.dump(data, fp, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, output_path)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Query and export the SQLite book store")
+    parser.add_argument("--db", type=Path, default=store_path() or DEFAULT_STORE_PATH, help="database path")
+    parser.add_argument(
+        "--history-dir", type=Path, default=DEFAULT_HISTORY_ROOT, help="committed sales-index history (NDJSON)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_cmd = commands.add_parser("import", help="upsert an existing JSON data file")
+    import_cmd.add_argument("source", choices=sorted(SOURCE_FILES))
+    import_cmd.add_argument("path", nargs="?", help="data file (default: the source's usual file)")
+
+    export_cmd = commands.add_parser("export", help="regenerate the JSON data files from the store")
+    export_cmd.add_argument("--source", choices=sorted(SOURCE_FILES) + ["all"], default="all")
+    export_cmd.add_argument("--out-dir", type=Path, default=Path("."))
+
+    new_cmd = commands.add_parser("new", help="books released in the last N days across all sources")
+    new_cmd.add_argument("--days", type=int, default=7)
+
+    rising_cmd = commands.add_parser("rising", help="fastest-rising yes24 sales index over the last N days")
+    rising_cmd.add_argument("--days", type=int, default=7)
+    rising_cmd.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args(argv)
+    with BookStore(args.db, args.history_dir) as store:
+        if args.command == "import":
+            data_path = Path(args.path or SOURCE_FILES[args.source])
+            count = store.upsert(args.source, json.loads(data_path.read_text(encoding="utf-8")))
+            print(f"Imported {count} {args.source} records from {data_path}")
+        elif args.command == "export":
+            sources = sorted(SOURCE_FILES) if args.source == "all" else [args.source]
+            args.out_dir.mkdir(parents=True, exist_ok=True)
+            for source in sources:
+                output_path = args.out_dir / SOURCE_FILES[source]
+                _write_json(store.export(source), output_path)
+                print(f"Exported {source} to {output_path}")
+        elif args.command == "new":
+            for row in store.released_since(date.today() - timedelta(days=args.days)):
+                print(f"{row['release_date'] or '-':10}  {row['source']:8} {row['publisher'] or '':20} {row['title']}")
+        elif args.command == "rising":
+            since = datetime.now(timezone.utc) - timedelta(days=args.days)
+            for row in store.rising(since, args.limit):
+                print(f"+{row['rise']:<8} {row['start']:>8} -> {row['end']:<8} {row['publisher'] or '':20} {row['title']}")
+
+
+if __name__ == "__main__":
+    main()
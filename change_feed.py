@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import run_report
+
+# deltas/<source>/index.json에는 최근 델타와 그 전후 스냅샷 해시가 있어, 자기 스냅샷 해시를
+# 아는 클라이언트는 빠진 델타만 받아 가면 된다
+DELTA_ROOT = Path("deltas")
+DELTA_HISTORY = 30
+# 매 실행마다 조금씩 바뀌는 값이라 변경 여부 판단에서 뺀다
+VOLATILE_FIELDS = {
+    "yes24": ("sell_num", "sell_num_at"),
+}
+
+
+def staging_path(output_path: Union[str, Path]) -> Path:
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + ".new")
+
+
+def record_key(source: str, record: Dict) -> str:
+    if source == "yes24":
+        key = record.get("goods_no") or record.get("detail_url")
+        return key or f"{record.get('publisher', '')}/{record.get('title', '')}"
+    return record.get("detail_link") or record.get("title") or ""
+
+
+def record_hash(record: Dict, volatile: tuple = ()) -> str:
+    stable = {field: value for field, value in record.items() if field not in volatile}
+    canonical = json.dumps(stable, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def flatten(source: str, data: Union[Dict, List]) -> Dict[str, Dict]:
+    """데이터 파일의 레코드를 키별로. yes24의 출판사별 목록에는 ``publisher`` 필드를 붙인다."""
+    if isinstance(data, dict):
+        records = [dict(book, publisher=publisher) for publisher, books in data.items() for book in books]
+    else:
+        records = list(data)
+    return {record_key(source, record): record for record in records}
+
+
+def snapshot_hash(hashes: Dict[str, str]) -> str:
+    """순서와 상관없는 스냅샷 전체의 해시."""
+    digest = hashlib.sha256()
+    for key in sorted(hashes):
+        digest.update(f"{key}\0{hashes[key]}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def diff_snapshots(source: str, old: Dict[str, Dict], new: Dict[str, Dict]) -> Dict:
+    volatile = VOLATILE_FIELDS.get(source, ())
+    old_hashes = {key: record_hash(record, volatile) for key, record in old.items()}
+    new_hashes = {key: record_hash(record, volatile) for key, record in new.items()}
+    return {
+        "source": source,
+        "base": snapshot_hash(old_hashes),
+        "snapshot": snapshot_hash(new_hashes),
+        "added": [new[key] for key in new if key not in old],
+        "removed": [key for key in old if key not in new],
+        "changed": [new[key] for key in new if key in old and old_hashes[key] != new_hashes[key]],
+    }
+
+
+def _load(path: Path) -> Union[Dict, List]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return []
+    except ValueError as exc:
+        print(f"[delta] {path} is not valid JSON, treating it as empty: {exc}")
+        return []
+
+
+def _write_json(path: Path, data: Union[Dict, List]) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def write_delta(delta: Dict, root: Union[str, Path] = DELTA_ROOT, now: Optional[datetime] = None) -> Path:
+    """``delta``를 쓰고 소스의 index에 추가한다. ``DELTA_HISTORY``개를 넘으면 오래된 것부터 지운다."""
+    now = now or datetime.now(timezone.utc)
+    directory = Path(root) / delta["source"]
+    directory.mkdir(parents=True, exist_ok=True)
+    name = now.strftime("%Y%m%dT%H%M%SZ") + ".json"
+    _write_json(directory / name, dict(delta, generated_at=now.isoformat(timespec="seconds")))
+
+    index_path = directory / "index.json"
+    index = _load(index_path)
+    entries = index.get("deltas", []) if isinstance(index, dict) else []
+    entries = [entry for entry in entries if entry.get("file") != name]
+    entries.append({
+        "file": name,
+        "generated_at": now.isoformat(timespec="seconds"),
+        "base": delta["base"],
+        "snapshot": delta["snapshot"],
+        "added": len(delta["added"]),
+        "removed": len(delta["removed"]),
+        "changed": len(delta["changed"]),
+    })
+    for stale in entries[:-DELTA_HISTORY]:
+        (directory / stale["file"]).unlink(missing_ok=True)
+    entries = entries[-DELTA_HISTORY:]
+    _write_json(index_path, {"source": delta["source"], "snapshot": delta["snapshot"], "deltas": entries})
+    return directory / name
+
+
+def commit(source: str, output_path: Union[str, Path], delta_root: Union[str, Path] = DELTA_ROOT) -> Optional[Dict]:
+    """스테이징 파일(``<data file>.new``)을 지난 실행의 데이터 파일과 레코드 단위로 비교한다.
+
+    의미 있는 변경이 없으면 스테이징 파일을 버리고 데이터 파일을 그대로 두므로 워크플로가
+    커밋도 배포도 하지 않는다. 바뀌었으면 데이터 파일을 바꾸고 추가/삭제/변경된 레코드를
+    ``deltas/<source>/<timestamp>.json``에 남긴 뒤 그 델타를 돌려준다 (아니면 ``None``).
+    """
+    output_path = Path(output_path)
+    staged = staging_path(output_path)
+    with run_report.span("diff"):
+        delta = diff_snapshots(source, flatten(source, _load(output_path)), flatten(source, _load(staged)))
+    run_report.count("records_added", len(delta["added"]))
+    run_report.count("records_removed", len(delta["removed"]))
+    run_report.count("records_changed", len(delta["changed"]))
+
+    if not (delta["added"] or delta["removed"] or delta["changed"]) and output_path.exists():
+        staged.unlink()
+        run_report.note("data_written", False)
+        print(f"[delta] {source}: no meaningful changes, keeping {output_path} as is")
+        return None
+
+    os.replace(staged, output_path)
+    delta_path = write_delta(delta, delta_root)
+    run_report.note("data_written", True)
+    print(
+        f"[delta] {source}: {len(delta['added'])} added, {len(delta['removed'])} removed, "
+        f"{len(delta['changed'])} changed -> {delta_path}"
+    )
+    return delta
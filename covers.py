@@ -0,0 +1,216 @@
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import http_cache
+import rate_limiter
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow는 선택 의존성 (없으면 원래 표지 URL을 그대로 쓴다)
+    Image = None
+
+COVERS_DIR = "covers"
+DEFAULT_WORKERS = 8
+WEBP_QUALITY = 80
+OREILLY_BASE = "https://www.oreilly.com"
+USER_AGENT = "Mozilla/5.0 (compatible; newReleaseBooks cover fetcher)"
+
+# 페이지에 표시되는 크기의 2배 (고해상도 화면용)
+THUMB_SIZES: Dict[str, Tuple[int, int]] = {
+    "yes24": (100, 140),
+    "oreilly": (180, 240),
+    "manning": (240, 320),
+}
+COVER_FIELDS = {
+    "yes24": "image_url",
+    "oreilly": "cover_image",
+    "manning": "cover_image",
+}
+
+Artifact = Union[Dict, List]
+
+
+def available() -> bool:
+    return Image is not None
+
+
+def absolute_url(source: str, url: str) -> str:
+    if source == "oreilly" and url.startswith("/"):
+        return OREILLY_BASE + url
+    if url.startswith("//"):
+        return "https:" + url
+    return url
+
+
+def _records(data: Artifact) -> Iterator[Dict]:
+    if isinstance(data, dict):
+        for books in data.values():
+            yield from books
+    else:
+        yield from data
+
+
+def collect(loaded: Dict[str, Artifact]) -> Dict[str, List[Tuple[int, int]]]:
+    """중복 없는 표지 절대 URL과 그 표지가 표시되는 썸네일 크기들."""
+    wanted: Dict[str, List[Tuple[int, int]]] = {}
+    for source, data in loaded.items():
+        field = COVER_FIELDS.get(source)
+        if field is None:
+            continue
+        for record in _records(data):
+            url = record.get(field)
+            if not url:
+                continue
+            sizes = wanted.setdefault(absolute_url(source, url), [])
+            if THUMB_SIZES[source] not in sizes:
+                sizes.append(THUMB_SIZES[source])
+    return wanted
+
+
+def create_session(pool_size: int = DEFAULT_WORKERS) -> requests.Session:
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+def thumbnail_name(sha256: str, size: Tuple[int, int]) -> str:
+    return f"{sha256[:16]}-{size[0]}x{size[1]}.webp"
+
+
+def make_thumbnail(body: bytes, size: Tuple[int, int]) -> bytes:
+    """``body``를 ``object-fit: cover``처럼 ``size``에 맞춰 자르고 줄인 WebP. 작은 원본은 키우지 않는다."""
+    with Image.open(io.BytesIO(body)) as image:
+        image.load()
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        scale = min(1.0, image.width / size[0], image.height / size[1])
+        box = (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+        thumb = ImageOps.fit(image, box, Image.LANCZOS)
+        buffer = io.BytesIO()
+        thumb.save(buffer, "WEBP", quality=WEBP_QUALITY, method=6)
+        return buffer.getvalue()
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    # 같은 이미지를 두 스레드가 동시에 쓸 수 있으므로 임시 파일 이름을 스레드마다 다르게 한다
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+class CoverBuilder:
+    """표지를 받아 ``out_dir``에 썸네일을 쓴다. 같은 이미지는 해시 이름의 파일 하나를 함께 쓴다."""
+
+    def __init__(self, out_dir: Path, session: requests.Session, cache: http_cache.HttpCache) -> None:
+        self.out_dir = out_dir
+        self.session = session
+        self.cache = cache
+        self.written = 0
+        self.failed = 0
+        self.original_bytes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def build(self, url: str, sizes: List[Tuple[int, int]]) -> Dict[Tuple[int, int], str]:
+        try:
+            with rate_limiter.for_url(url).request() as slot:
+                response = self.cache.request(self.session, "GET", url, timeout=20)
+                slot.observe(response.response)
+            response.raise_for_status()
+            sha256, body = response.sha256, response.content
+            thumbs = {}
+            for size in sizes:
+                name = thumbnail_name(sha256, size)
+                path = self.out_dir / name
+                if not path.exists():
+                    _write_atomic(path, make_thumbnail(body, size))
+                    with self._lock:
+                        self.written += 1
+                thumbs[size] = name
+        except (requests.RequestException, OSError, ValueError, Image.DecompressionBombError) as exc:
+            print(f"[covers] keeping remote cover {url}: {exc}")
+            with self._lock:
+                self.failed += 1
+            return {}
+        with self._lock:
+            self.original_bytes[sha256] = len(body)
+        return thumbs
+
+
+def build(
+    loaded: Dict[str, Artifact], out_dir: Union[str, Path], workers: int = DEFAULT_WORKERS
+) -> Dict[str, Dict[Tuple[int, int], str]]:
+    """``loaded``의 모든 표지 썸네일: ``{절대 URL: {크기: out_dir 기준 경로}}``.
+
+    받을 때는 호스트의 rate_limiter와 ``covers`` HTTP 캐시를 거치므로 바뀌지 않은 표지는 304로 끝난다.
+    """
+    covers_dir = Path(out_dir) / COVERS_DIR
+    covers_dir.mkdir(parents=True, exist_ok=True)
+    wanted = collect(loaded)
+    builder = CoverBuilder(covers_dir, create_session(workers), http_cache.named("covers"))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = dict(zip(wanted, executor.map(lambda item: builder.build(*item), wanted.items())))
+    http_cache.save_all()
+
+    thumbs = {
+        url: {size: f"{COVERS_DIR}/{name}" for size, name in names.items()}
+        for url, names in results.items()
+        if names
+    }
+    names = {Path(path).name for sizes in thumbs.values() for path in sizes.values()}
+    thumb_bytes = sum((covers_dir / name).stat().st_size for name in names)
+    print(
+        f"[covers] {len(wanted)} cover URLs, {len(builder.original_bytes)} distinct images "
+        f"({sum(builder.original_bytes.values())} bytes) -> {len(names)} thumbnails ({thumb_bytes} bytes); "
+        f"{builder.written} written, {builder.failed} kept remote"
+    )
+    return thumbs
+
+
+def prune(out_dir: Union[str, Path], thumbs: Dict[str, Dict[Tuple[int, int], str]]) -> int:
+    """``thumbs``가 더 이상 가리키지 않는 썸네일을 지운다."""
+    covers_dir = Path(out_dir) / COVERS_DIR
+    keep = {Path(path).name for sizes in thumbs.values() for path in sizes.values()}
+    removed = 0
+    for path in covers_dir.iterdir():
+        if path.name not in keep:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def rewrite(
+    source: str, index: Artifact, thumbs: Dict[str, Dict[Tuple[int, int], str]], prefix: str = ""
+) -> Artifact:
+    """표지 필드가 썸네일(``prefix`` + 상대 경로)을 가리키는 ``index`` 사본. 원래 URL은 ``cover_original``에 남긴다."""
+    field = COVER_FIELDS.get(source)
+    if field is None or not thumbs:
+        return index
+
+    def rewrite_record(record: Dict) -> Dict:
+        url = record.get(field)
+        if not url:
+            return record
+        original = absolute_url(source, url)
+        path = thumbs.get(original, {}).get(THUMB_SIZES[source])
+        if path is None:
+            return record
+        record = dict(record)
+        record[field] = prefix + path
+        record["cover_original"] = original
+        return record
+
+    if isinstance(index, dict):
+        return {key: [rewrite_record(record) for record in records] for key, records in index.items()}
+    return [rewrite_record(record) for record in index]
@@ -0,0 +1,72 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Union
+
+DEFAULT_PARTIALS_DIR = Path("partials")
+
+Publisher = Dict[str, str]
+
+
+def shard_of(publisher_id: str, shard_count: int) -> int:
+    """출판사 id의 해시로 정한 샤드 번호. 목록에 출판사가 추가되어도 기존 출판사의 샤드는 그대로다."""
+    digest = hashlib.sha256(str(publisher_id).encode("utf-8")).hexdigest()
+    return int(digest[:8], 16) % shard_count
+
+
+def validate(shard_index: int, shard_count: int) -> None:
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"Invalid shard {shard_index} of {shard_count}; expected 0 <= index < count")
+
+
+def select(publishers: List[Publisher], shard_index: int, shard_count: int) -> List[Publisher]:
+    """이 샤드가 맡을 출판사 (원래 순서 유지)."""
+    validate(shard_index, shard_count)
+    return [publisher for publisher in publishers if shard_of(publisher["id"], shard_count) == shard_index]
+
+
+def shard_label(shard_index: int, shard_count: int) -> str:
+    return f"shard-{shard_index}-of-{shard_count}"
+
+
+def shard_path(path: Union[str, Path], shard_index: int, shard_count: int) -> Path:
+    """``path``에 샤드 표시를 붙인 경로. 같은 디렉터리에서 여러 샤드를 동시에 돌려도 파일이 겹치지 않는다."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{shard_label(shard_index, shard_count)}{path.suffix}")
+
+
+def partial_path(
+    output: Union[str, Path], shard_index: int, shard_count: int, root: Union[str, Path] = DEFAULT_PARTIALS_DIR
+) -> Path:
+    """샤드의 부분 결과 파일: ``partials/books_data.shard-0-of-4.json``."""
+    return Path(root) / shard_path(Path(output).name, shard_index, shard_count)
+
+
+def merge(
+    publishers: List[Publisher],
+    shard_count: int,
+    output: Union[str, Path],
+    root: Union[str, Path] = DEFAULT_PARTIALS_DIR,
+) -> Dict[str, List[Dict]]:
+    """모든 샤드의 부분 결과를 출판사 목록 순서대로 합친다.
+
+    부분 결과가 하나라도 없거나, 다른 샤드가 맡은 출판사가 들어 있으면(샤드 수가
+    바뀐 경우 등) 예외를 던지고 아무것도 합치지 않는다.
+    """
+    validate(0, shard_count)
+    partials = [partial_path(output, index, shard_count, root) for index in range(shard_count)]
+    missing = [str(path) for path in partials if not path.exists()]
+    if missing:
+        raise FileNotFoundError(f"Missing {len(missing)}/{shard_count} shard partials: {', '.join(missing)}")
+
+    owner = {publisher["name"]: shard_of(publisher["id"], shard_count) for publisher in publishers}
+    collected: Dict[str, List[Dict]] = {}
+    for index, path in enumerate(partials):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(data, dict):
+            raise ValueError(f"{path} is not a publisher -> books mapping")
+        for name, books in data.items():
+            if owner.get(name) != index:
+                raise ValueError(f"{path} contains {name!r}, which is not in shard {index} of {shard_count}")
+            collected[name] = books
+    return {publisher["name"]: collected[publisher["name"]] for publisher in publishers if publisher["name"] in collected}
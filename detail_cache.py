@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+DEFAULT_CACHE_PATH = Path(".cache") / "yes24_details.json"
+# 판매지수는 매일 조금씩 바뀌므로 일정 기간이 지나면 다시 가져온다
+DEFAULT_SELL_NUM_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+CACHE_VERSION = 1
+
+
+class DetailCache:
+    """goods_no별 상세 정보(출간일, 판매지수)를 디스크에 보관하는 캐시.
+
+    출간일은 한 번 얻으면 영구히 보관하고, 판매지수는 ``sell_num_ttl`` 초가 지나면
+    만료된 것으로 본다. 저장 시 가장 오래 사용되지 않은 항목부터 지워
+    ``max_entries`` 개를 넘지 않도록 한다.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_CACHE_PATH,
+        sell_num_ttl: float = DEFAULT_SELL_NUM_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.path = Path(path)
+        self.sell_num_ttl = sell_num_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            print(f"Ignoring unreadable detail cache {self.path}: {exc}")
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION and isinstance(data.get("entries"), dict):
+            self._entries = data["entries"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, goods_no: str) -> Optional[Tuple[str, Optional[str]]]:
+        """저장된 (출간일, 판매지수). 판매지수가 만료되었으면 (출간일, None), 항목이 없으면 None.
+
+        판매지수가 만료된 항목은 판매지수만 다시 가져와야 하므로 miss로 센다.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(goods_no)
+            if not entry:
+                self.misses += 1
+                return None
+            entry["last_used"] = now
+            if now - entry.get("sell_num_at", 0) < self.sell_num_ttl:
+                self.hits += 1
+                return entry["release_date"], entry["sell_num"]
+            self.misses += 1
+            return entry["release_date"], None
+
+    def peek(self, goods_no: str) -> Optional[Tuple[str, str]]:
+        """만료 여부와 상관없이 저장된 (출간일, 판매지수). 상세 페이지가 바뀌지 않았을 때 다시 쓴다."""
+        with self._lock:
+            entry = self._entries.get(goods_no)
+            return (entry["release_date"], entry["sell_num"]) if entry else None
+
+    def sell_num_at(self, goods_no: str) -> Optional[float]:
+        """저장된 판매지수를 상세 페이지에서 읽은 시각 (epoch 초)."""
+        with self._lock:
+            entry = self._entries.get(goods_no)
+            return entry.get("sell_num_at") if entry else None
+
+    def store(self, goods_no: str, release_date: str, sell_num: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._entries[goods_no] = {
+                "release_date": release_date,
+                "sell_num": sell_num,
+                "sell_num_at": now,
+                "last_used": now,
+            }
+
+    def save(self) -> None:
+        with self._lock:
+            if len(self._entries) > self.max_entries:
+                keep = sorted(self._entries.items(), key=lambda item: item[1].get("last_used", 0), reverse=True)
+                self._entries = dict(keep[: self.max_entries])
+            payload = {"version": CACHE_VERSION, "entries": self._entries}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def report(self) -> str:
+        total = self.hits + self.misses
+        ratio = (self.hits / total * 100) if total else 0.0
+        return f"Detail cache: {self.hits} hits, {self.misses} misses ({ratio:.1f}% hit rate, {len(self)} entries)"
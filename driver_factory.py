@@ -0,0 +1,562 @@
+import atexit
+import json
+import os
+import signal
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+
+import run_report
+from proc_stats import is_running, process_memory, process_tree_pids
+
+DRIVER_PATH_CACHE = Path(".cache") / "chromedriver_path"
+CHROME_BINARY_CANDIDATES = [
+    "/usr/bin/google-chrome",
+    "/usr/bin/google-chrome-stable",
+    "/usr/bin/chromium",
+    "/usr/bin/chromium-browser",
+]
+
+BLOCK_ENV = "SCRAPER_BLOCK_RESOURCES"
+BLOCKED_TYPES_ENV = "SCRAPER_BLOCKED_TYPES"
+BLOCKED_URLS_ENV = "SCRAPER_BLOCKED_URLS"
+# setBlockedURLs는 URL 패턴만 받으므로 리소스 종류를 확장자 패턴으로 바꾼다
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*", "*.bmp*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.m4a*", "*.ogg*"],
+    "stylesheet": ["*.css*"],
+}
+# 스타일시트는 .itemUnit/검색 카드 렌더링에 영향을 줄 수 있어 기본으로는 막지 않는다
+DEFAULT_BLOCKED_TYPES = ("image", "font", "media")
+DEFAULT_BLOCKED_URLS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googlesyndication.com*",
+    "*googleadservices.com*",
+    "*doubleclick.net*",
+    "*adservice.google.*",
+    "*connect.facebook.net*",
+    "*facebook.com/tr*",
+    "*analytics.tiktok.com*",
+    "*bat.bing.com*",
+    "*criteo.*",
+    "*hotjar.com*",
+    "*scorecardresearch.com*",
+    "*newrelic.com*",
+    "*nr-data.net*",
+    "*optimizely.com*",
+    "*segment.io*",
+    "*cdn.segment.com*",
+    "*clarity.ms*",
+    "*kakaopixel*",
+    "*wcs.naver.net*",
+]
+# 차단된 요청은 응답이 없어 크기를 알 수 없으므로, 같은 종류의 응답을 아직 못 봤을 때 쓰는 대략적인 크기 (바이트)
+BLOCKED_SIZE_DEFAULTS = {
+    "Image": 40_000,
+    "Font": 30_000,
+    "Media": 300_000,
+    "Stylesheet": 20_000,
+    "Script": 30_000,
+    "Other": 5_000,
+}
+
+MAX_PAGES_ENV = "SCRAPER_DRIVER_MAX_PAGES"
+MAX_RSS_ENV = "SCRAPER_DRIVER_MAX_RSS_MB"
+# 이 횟수만큼 메모리를 확인할 때마다 Chrome 프로세스 목록을 다시 찾는다
+PID_REFRESH_CHECKS = 25
+DEFAULT_MAX_PAGES_PER_DRIVER = 150
+DEFAULT_MAX_DRIVER_RSS_MB = 1024
+# 이 문구가 들어간 오류는 브라우저(탭)가 죽었다는 뜻이라 같은 드라이버로는 재시도할 수 없다
+CRASH_MARKERS = (
+    "tab crashed",
+    "session deleted",
+    "invalid session id",
+    "chrome not reachable",
+    "disconnected",
+    "no such window",
+)
+
+T = TypeVar("T")
+
+_driver_path_lock = threading.Lock()
+_resolved_driver_path: Optional[str] = None
+_resolved = False
+
+# 대기 중인 드라이버 풀은 프로세스 안에서만 공유된다 (run_all.py는 스크레이퍼마다 프로세스를 따로 띄운다)
+_pool_lock = threading.Lock()
+_idle: Dict[Tuple, List[webdriver.Chrome]] = {}
+_all_drivers: List[webdriver.Chrome] = []
+# 리소스 종류별로 받은 응답의 (총 바이트, 개수) — 차단된 요청의 크기 추정에 쓴다
+_sizes_lock = threading.Lock()
+_observed_sizes: Dict[str, Tuple[int, int]] = {}
+
+# 마지막으로 새 드라이버를 띄우는 데 걸린 시간 (초)
+last_startup_seconds: Optional[float] = None
+
+
+def _ensure_chromedriver_binary(path: str) -> str:
+    candidate = Path(path)
+    if candidate.name.startswith("THIRD_PARTY_NOTICES"):
+        sibling = candidate.with_name("chromedriver")
+        if sibling.exists():
+            return str(sibling)
+        sibling = candidate.parent / "chromedriver"
+        if sibling.exists():
+            return str(sibling)
+    return str(candidate)
+
+
+def _install_with_manager() -> Optional[str]:
+    os.environ.setdefault("WDM_LOG_LEVEL", "0")
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        return _ensure_chromedriver_binary(ChromeDriverManager().install())
+    except Exception as exc:
+        print(f"webdriver_manager could not install chromedriver: {exc}")
+        return None
+
+
+def resolve_driver_path() -> Optional[str]:
+    """프로세스마다 한 번만 chromedriver를 찾는다.
+
+    ``CHROMEDRIVER_PATH``, ``PATH``의 ``chromedriver``, 지난 실행에서 기억한 경로,
+    webdriver_manager 순서로 찾고, ``None``이면 Selenium Manager가 고르게 둔다.
+    """
+    global _resolved_driver_path, _resolved
+    with _driver_path_lock:
+        if _resolved:
+            return _resolved_driver_path
+
+        with run_report.span("driver_resolve"):
+            path = os.environ.get("CHROMEDRIVER_PATH") or shutil.which("chromedriver")
+            if path and not os.path.exists(path):
+                path = None
+            if not path:
+                try:
+                    cached = DRIVER_PATH_CACHE.read_text(encoding="utf-8").strip()
+                except OSError:
+                    cached = ""
+                if cached and os.path.exists(cached):
+                    path = cached
+            if not path and "GITHUB_ACTIONS" not in os.environ:
+                path = _install_with_manager()
+                if path:
+                    try:
+                        DRIVER_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+                        DRIVER_PATH_CACHE.write_text(path, encoding="utf-8")
+                    except OSError:
+                        pass
+
+        _resolved_driver_path = path
+        _resolved = True
+        return path
+
+
+def blocked_types() -> List[str]:
+    """차단할 리소스 종류 (``SCRAPER_BLOCK_RESOURCES=0``이면 [])."""
+    if os.environ.get(BLOCK_ENV, "1").lower() in ("0", "false", "off"):
+        return []
+    configured = os.environ.get(BLOCKED_TYPES_ENV)
+    if configured is None:
+        return list(DEFAULT_BLOCKED_TYPES)
+    types = [name.strip() for name in configured.split(",") if name.strip()]
+    unknown = [name for name in types if name not in RESOURCE_TYPE_PATTERNS]
+    if unknown:
+        raise ValueError(f"Unknown resource type(s) in {BLOCKED_TYPES_ENV}: {', '.join(unknown)}")
+    return types
+
+
+def blocked_url_patterns() -> List[str]:
+    """설정된 리소스 종류와 추적 스크립트의 ``Network.setBlockedURLs`` 패턴 (차단을 끄면 [])."""
+    if os.environ.get(BLOCK_ENV, "1").lower() in ("0", "false", "off"):
+        return []
+    patterns = [pattern for name in blocked_types() for pattern in RESOURCE_TYPE_PATTERNS[name]]
+    patterns += DEFAULT_BLOCKED_URLS
+    patterns += [pattern.strip() for pattern in os.environ.get(BLOCKED_URLS_ENV, "").split(",") if pattern.strip()]
+    return patterns
+
+
+def apply_resource_blocking(driver: webdriver.Chrome) -> None:
+    """드라이버의 현재 탭에 차단 목록을 건다 (새 탭은 따로 호출해야 한다)."""
+    patterns = blocked_url_patterns()
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except WebDriverException as exc:
+        print(f"Resource blocking unavailable: {exc}")
+
+
+def _estimated_size(resource_type: str) -> int:
+    with _sizes_lock:
+        total, count = _observed_sizes.get(resource_type, (0, 0))
+    if count:
+        return total // count
+    return BLOCKED_SIZE_DEFAULTS.get(resource_type, BLOCKED_SIZE_DEFAULTS["Other"])
+
+
+def record_page_weight(driver: webdriver.Chrome) -> None:
+    """지난 호출 이후 받은 바이트와 차단된 요청 수를 실행 리포트에 더한다.
+
+    chromedriver 성능 로그를 읽어 비운다. 차단된 요청은 응답이 없으므로 이 프로세스에서
+    본 같은 종류 응답의 평균 크기(없으면 ``BLOCKED_SIZE_DEFAULTS``)로 추정해
+    ``blocked_bytes_estimate``에 더한다. 카운터는 모든 실행에서 기록한다.
+    """
+    try:
+        entries = driver.get_log("performance")
+    except (WebDriverException, ValueError):
+        return
+    received = finished = blocked = blocked_bytes = 0
+    types: Dict[str, str] = {}
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        request_id = params.get("requestId")
+        if method in ("Network.requestWillBeSent", "Network.responseReceived") and params.get("type"):
+            types[request_id] = params["type"]
+        elif method == "Network.loadingFinished":
+            size = params.get("encodedDataLength", 0)
+            finished += 1
+            received += size
+            resource_type = types.get(request_id, "Other")
+            with _sizes_lock:
+                total, count = _observed_sizes.get(resource_type, (0, 0))
+                _observed_sizes[resource_type] = (total + size, count + 1)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked += 1
+            blocked_bytes += _estimated_size(params.get("type") or types.get(request_id, "Other"))
+    run_report.count("network_bytes", received)
+    run_report.count("network_requests", finished)
+    run_report.count("blocked_requests", blocked)
+    run_report.count("blocked_bytes_estimate", blocked_bytes)
+
+
+def build_chrome_options(user_agent: Optional[str] = None) -> Options:
+    chrome_options = Options()
+
+    # 기본 헤드리스 설정 (안정성 우선)
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1280,1024")
+
+    # 로그 및 에러 메시지 억제
+    chrome_options.add_argument("--log-level=3")
+    chrome_options.add_argument("--disable-logging")
+    chrome_options.add_argument("--silent")
+
+    # 불필요한 기능 비활성화 (JavaScript는 유지)
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-plugins")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--disable-default-apps")
+
+    # 자동화 감지 방지
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+
+    if user_agent:
+        chrome_options.add_argument(f"--user-agent={user_agent}")
+
+    # 새 헤드리스 모드는 --disable-images를 무시하므로 콘텐츠 설정으로 이미지를 막는다
+    if "image" in blocked_types():
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    # record_page_weight()가 네트워크 이벤트를 읽을 수 있도록 성능 로그는 항상 켜고,
+    # 페이지 이벤트까지 담은 전체 로그는 SCRAPER_PROFILE 실행에서만 남긴다
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if not run_report.current().profile:
+        chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    if "GITHUB_ACTIONS" in os.environ:
+        # 안정성을 위한 GitHub Actions 전용 설정
+        chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+        chrome_options.add_argument("--disable-background-timer-throttling")
+        chrome_options.add_argument("--disable-renderer-backgrounding")
+        chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+        chrome_options.add_argument("--disable-crash-reporter")
+        chrome_options.add_argument("--disable-breakpad")
+        chrome_options.add_argument("--memory-pressure-off")
+
+    chrome_binary = os.environ.get("CHROME_BIN")
+    if chrome_binary and os.path.exists(chrome_binary):
+        chrome_options.binary_location = chrome_binary
+    elif "GITHUB_ACTIONS" in os.environ:
+        for binary in CHROME_BINARY_CANDIDATES:
+            if os.path.exists(binary):
+                chrome_options.binary_location = binary
+                break
+
+    return chrome_options
+
+
+def create_driver(user_agent: Optional[str] = None, page_load_timeout: int = 30) -> webdriver.Chrome:
+    """새 헤드리스 Chrome을 띄우고 시작 시간을 기록한다."""
+    global last_startup_seconds
+    chrome_options = build_chrome_options(user_agent)
+    driver_path = resolve_driver_path()
+
+    start = time.perf_counter()
+    try:
+        with run_report.span("driver_launch"):
+            driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    except Exception as exc:
+        if driver_path is None:
+            raise Exception(f"Chrome driver initialization failed: {exc}")
+        # 캐시된 경로가 브라우저 버전과 맞지 않으면 Selenium Manager에 맡긴다
+        print(f"Chrome 드라이버 초기화 실패 ({driver_path}): {exc}")
+        try:
+            with run_report.span("driver_launch", fallback=True):
+                driver = webdriver.Chrome(service=Service(), options=chrome_options)
+        except Exception as fallback_error:
+            raise Exception(f"Chrome driver initialization failed: {fallback_error}")
+
+    driver.set_page_load_timeout(page_load_timeout)
+    driver.implicitly_wait(10)
+    apply_resource_blocking(driver)
+    # acquire_driver()가 같은 설정의 드라이버만 재사용하도록 설정값을 기록
+    driver._factory_key = (user_agent, page_load_timeout)
+    last_startup_seconds = time.perf_counter() - start
+    run_report.current().add("driver_startup", last_startup_seconds)
+    run_report.count("driver_cold_starts")
+    run_report.note("resource_blocking", {"types": blocked_types(), "url_patterns": len(blocked_url_patterns())})
+    print(f"Chrome driver initialized in {last_startup_seconds:.2f}s")
+
+    with _pool_lock:
+        _all_drivers.append(driver)
+    return driver
+
+
+def wait_for_selector(driver: webdriver.Chrome, selector: str, timeout: float = 3.0) -> bool:
+    """``selector``에 맞는 요소가 생길 때까지 기다린다. 시간이 지나면 ``False``.
+
+    암묵적 대기가 제한 시간을 늘리지 않도록 ``querySelector``로 확인한다.
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script("return document.querySelector(arguments[0]) !== null;", selector)
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_stable_count(driver: webdriver.Chrome, selector: str, timeout: float = 2.0, interval: float = 0.25) -> int:
+    """``selector``에 맞는 요소 수가 더 바뀌지 않을 때까지(또는 ``timeout``) 기다려 그 수를 돌려준다.
+
+    동적 콘텐츠를 위한 고정 대기 대신 쓴다. 이미 다 그려진 페이지는 두 번 확인하고 끝난다.
+    """
+    deadline = time.monotonic() + timeout
+    count = driver.execute_script("return document.querySelectorAll(arguments[0]).length;", selector)
+    while time.monotonic() < deadline:
+        time.sleep(interval)
+        latest = driver.execute_script("return document.querySelectorAll(arguments[0]).length;", selector)
+        if latest == count:
+            break
+        count = latest
+    return count
+
+
+def _is_alive(driver: webdriver.Chrome) -> bool:
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+def _quit(driver: webdriver.Chrome) -> None:
+    with _pool_lock:
+        if driver in _all_drivers:
+            _all_drivers.remove(driver)
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def acquire_driver(user_agent: Optional[str] = None, page_load_timeout: int = 30) -> webdriver.Chrome:
+    """이 프로세스의 풀에서 같은 설정의 대기 중인 드라이버를 꺼내고, 없으면 새로 띄운다."""
+    key = (user_agent, page_load_timeout)
+    while True:
+        with _pool_lock:
+            idle = _idle.get(key)
+            driver = idle.pop() if idle else None
+        if driver is None:
+            return create_driver(user_agent, page_load_timeout)
+        if _is_alive(driver):
+            run_report.count("driver_warm_reuses")
+            return driver
+        _quit(driver)
+
+
+def release_driver(driver: webdriver.Chrome, healthy: bool = True) -> None:
+    """드라이버를 풀에 돌려준다 (상태가 나쁘면 종료한다)."""
+    if not healthy or not _is_alive(driver):
+        _quit(driver)
+        return
+    try:
+        record_page_weight(driver)
+        # 다음 사용자를 위해 탭 하나만 남기고 빈 페이지로 이동
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get("about:blank")
+    except Exception:
+        _quit(driver)
+        return
+
+    with _pool_lock:
+        _idle.setdefault(driver._factory_key, []).append(driver)
+
+
+def browser_pids(driver: webdriver.Chrome, refresh: bool = False) -> List[int]:
+    """chromedriver와 그것이 띄운 Chrome 프로세스들 (드라이버에 캐시).
+
+    프로세스 트리를 찾으려면 ``/proc``을 모두 읽어야 하므로 새 드라이버일 때, 캐시된
+    프로세스가 끝났을 때, ``PID_REFRESH_CHECKS``번마다(새 탭은 렌더러를 새로 띄운다)만 찾는다.
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return []
+    pids = getattr(driver, "_browser_pids", None)
+    checks = getattr(driver, "_browser_pid_checks", 0) + 1
+    if refresh or not pids or checks >= PID_REFRESH_CHECKS or not all(map(is_running, pids)):
+        pids = process_tree_pids(process.pid)
+        checks = 0
+    driver._browser_pids = pids
+    driver._browser_pid_checks = checks
+    return pids
+
+
+def browser_memory(driver: webdriver.Chrome) -> int:
+    """chromedriver와 Chrome 프로세스들의 메모리 (바이트, PSS를 읽을 수 없으면 RSS)."""
+    return sum(process_memory(pid) for pid in browser_pids(driver))
+
+
+def is_crash(driver: webdriver.Chrome, exc: BaseException) -> bool:
+    """``exc``가 페이지 실패가 아니라 브라우저 자체가 죽었다는 뜻인지."""
+    if not isinstance(exc, WebDriverException):
+        return False
+    message = str(exc).lower()
+    return any(marker in message for marker in CRASH_MARKERS) or not _is_alive(driver)
+
+
+class DriverSupervisor:
+    """작업자 하나의 드라이버를 쥐고, 페이지 수, 메모리, 크래시에 따라 새로 띄운다.
+
+    페이지 로드는 :meth:`load`를 거쳐 ``max_pages``까지 세고, 브라우저 메모리를
+    ``max_rss_mb``와 비교하며, 도중에 브라우저가 죽으면 새 브라우저에서 한 번 더 실행한다.
+    ``on_start``는 새 드라이버마다 실행된다 (예: 워밍업 요청).
+    """
+
+    def __init__(
+        self,
+        user_agent: Optional[str] = None,
+        page_load_timeout: int = 30,
+        max_pages: Optional[int] = None,
+        max_rss_mb: Optional[float] = None,
+        on_start: Optional[Callable[[webdriver.Chrome], None]] = None,
+    ) -> None:
+        self.user_agent = user_agent
+        self.page_load_timeout = page_load_timeout
+        self.max_pages = max_pages or int(os.environ.get(MAX_PAGES_ENV, DEFAULT_MAX_PAGES_PER_DRIVER))
+        self.max_rss_mb = max_rss_mb or float(os.environ.get(MAX_RSS_ENV, DEFAULT_MAX_DRIVER_RSS_MB))
+        self.on_start = on_start
+        self.recycles = 0
+        self._driver: Optional[webdriver.Chrome] = None
+
+    @property
+    def driver(self) -> webdriver.Chrome:
+        if self._driver is None:
+            # 처음에는 풀의 웜 드라이버를 쓰고, 교체할 때는 새로 띄운다
+            if self.recycles:
+                driver = create_driver(self.user_agent, self.page_load_timeout)
+            else:
+                driver = acquire_driver(self.user_agent, self.page_load_timeout)
+            self._driver = driver
+            if self.on_start is not None:
+                self.on_start(driver)
+        return self._driver
+
+    def load(self, fetch: Callable[..., T], *args, pages: int = 1) -> T:
+        """``fetch(driver, *args)``를 실행하고, 브라우저가 죽었으면 새 브라우저에서 한 번 더 시도한다."""
+        driver = self.driver
+        try:
+            result = fetch(driver, *args)
+        except Exception as exc:
+            if not is_crash(driver, exc):
+                raise
+            self.recycle(f"browser crashed: {str(exc).splitlines()[0]}", healthy=False)
+            result = fetch(self.driver, *args)
+        self.pages_served(pages)
+        return result
+
+    def pages_served(self, pages: int = 1) -> None:
+        """페이지 로드를 ``pages``만큼 세고, 기준을 넘으면 드라이버를 새로 띄운다."""
+        driver = self._driver
+        if driver is None:
+            return
+        driver._pages_served = getattr(driver, "_pages_served", 0) + pages
+        if driver._pages_served >= self.max_pages:
+            self.recycle(f"served {driver._pages_served} pages")
+            return
+        memory_mb = browser_memory(driver) / (1024 * 1024)
+        if memory_mb > self.max_rss_mb:
+            self.recycle(f"browser memory {memory_mb:.0f} MB > {self.max_rss_mb:.0f} MB")
+
+    def recycle(self, reason: str, healthy: bool = True) -> None:
+        driver, self._driver = self._driver, None
+        if driver is None:
+            return
+        print(f"Recycling Chrome driver ({reason})")
+        self.recycles += 1
+        run_report.count("driver_recycles")
+        if healthy:
+            record_page_weight(driver)
+        _quit(driver)
+
+    def close(self, healthy: bool = True) -> None:
+        """현재 드라이버를 풀에 돌려준다 (상태가 나쁘면 종료한다)."""
+        driver, self._driver = self._driver, None
+        if driver is not None:
+            release_driver(driver, healthy)
+
+
+def shutdown() -> None:
+    """이 프로세스가 띄운 드라이버를 모두 종료한다."""
+    with _pool_lock:
+        drivers = list(_all_drivers)
+        _idle.clear()
+    for driver in drivers:
+        _quit(driver)
+
+
+def _exit_on_sigterm(signum, frame) -> None:
+    # SIGTERM 기본 동작은 atexit를 건너뛰므로 정상 종료로 바꿔 드라이버를 정리하게 한다
+    raise SystemExit(128 + signum)
+
+
+atexit.register(shutdown)
+if threading.current_thread() is threading.main_thread() and signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
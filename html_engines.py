@@ -0,0 +1,41 @@
+import os
+
+ENGINE_ENV = "SCRAPER_PARSE_ENGINE"
+# soup: 페이지 전체를 html.parser로 (기존 방식), strained: SoupStrainer로 카드 부분만.
+# 두 엔진은 똑같은 값을 돌려줘야 한다 (benchmarks/bench_parse.py에서 확인)
+ENGINES = ("soup", "strained")
+DEFAULT_ENGINE = "soup"
+
+# 브라우저 안에서 실행하는 추출 스크립트용 텍스트 함수. BeautifulSoup get_text()와 같은 규칙으로,
+# 공백뿐인 문자열은 pre/textarea 밖에서는 공백/줄바꿈 하나로 줄이고 script/style/template 안은 건너뛴다
+JS_TEXT_HELPER = """
+const SKIP_TEXT = new Set(['SCRIPT', 'STYLE', 'TEMPLATE']);
+const PRESERVE_WS = new Set(['PRE', 'TEXTAREA']);
+const text = el => {
+  if (!el) return null;
+  let out = '';
+  const walk = (node, preserve) => {
+    for (const child of node.childNodes) {
+      if (child.nodeType === Node.TEXT_NODE) {
+        let value = child.data;
+        if (value && !preserve && !/[^ \\t\\n\\f\\r]/.test(value)) {
+          value = value.includes('\\n') ? '\\n' : ' ';
+        }
+        out += value;
+      } else if (child.nodeType === Node.ELEMENT_NODE && !SKIP_TEXT.has(child.tagName)) {
+        walk(child, preserve || PRESERVE_WS.has(child.tagName));
+      }
+    }
+  };
+  walk(el, Boolean(el.closest('pre, textarea')));
+  return out;
+};
+"""
+
+
+def resolve_engine(name: str = "") -> str:
+    """``name``(없으면 ``SCRAPER_PARSE_ENGINE``)을 확인해 엔진 이름으로 돌려준다."""
+    name = name or os.environ.get(ENGINE_ENV, DEFAULT_ENGINE)
+    if name not in ENGINES:
+        raise ValueError(f"Unknown parse engine {name!r}; expected one of {', '.join(ENGINES)}")
+    return name
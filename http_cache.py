@@ -0,0 +1,232 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import requests
+
+import run_report
+
+CACHE_ENV = "SCRAPER_HTTP_CACHE"
+DEFAULT_CACHE_ROOT = Path(".cache") / "http"
+DEFAULT_MAX_ENTRIES = 5000
+CACHE_VERSION = 1
+# 서버는 POST의 조건부 요청에 412로 답하므로 이 메서드만 재검증한다
+CONDITIONAL_METHODS = {"GET", "HEAD"}
+
+
+class CachedResponse:
+    """응답 본문과 캐시가 알고 있는 정보. ``unchanged``면 지난번과 같은 본문이다 (304 또는 같은 해시)."""
+
+    def __init__(
+        self,
+        response: requests.Response,
+        content: Optional[bytes],
+        sha256: Optional[str],
+        unchanged: bool,
+    ) -> None:
+        self.response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = response.url
+        self.content = content
+        self.sha256 = sha256
+        self.unchanged = unchanged
+        self.not_modified = response.status_code == 304
+        self._json = None
+
+    @property
+    def text(self) -> str:
+        if self.content is None:
+            return ""
+        return self.content.decode(self.response.encoding or "utf-8", errors="replace")
+
+    def json(self):
+        # 같은 응답을 여러 번 파싱하지 않는다
+        if self._json is None:
+            self._json = json.loads(self.content or b"null")
+        return self._json
+
+    def raise_for_status(self) -> None:
+        if not self.not_modified:
+            self.response.raise_for_status()
+
+
+def request_key(method: str, url: str, payload: object = None) -> str:
+    body = json.dumps(payload, sort_keys=True, ensure_ascii=False) if payload is not None else ""
+    return hashlib.sha256(f"{method.upper()} {url}\n{body}".encode("utf-8")).hexdigest()
+
+
+class HttpCache:
+    """스크레이퍼 하나의 요청별 ``ETag``/``Last-Modified``와 본문 해시를 보관하는 캐시 (스레드 안전).
+
+    본문은 선택적으로 해시 이름의 gzip 파일로 함께 보관한다. ``path=None``이면 디스크에
+    아무것도 남기지 않고 모든 응답을 바뀐 것으로 본다.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]], max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.path = Path(path) if path is not None else None
+        self.body_dir = self.path.with_suffix("") if self.path is not None else None
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            print(f"Ignoring unreadable HTTP cache {self.path}: {exc}")
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION and isinstance(data.get("entries"), dict):
+            self._entries = data["entries"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _body_path(self, sha256: str) -> Path:
+        return self.body_dir / f"{sha256}.gz"
+
+    def _read_body(self, entry: Dict) -> Optional[bytes]:
+        if not entry.get("body"):
+            return None
+        try:
+            return gzip.decompress(self._body_path(entry["sha256"]).read_bytes())
+        except (OSError, EOFError):
+            return None
+
+    def request(
+        self,
+        session: Union[requests.Session, object],
+        method: str,
+        url: str,
+        store_body: bool = True,
+        revalidate: bool = True,
+        **kwargs,
+    ) -> CachedResponse:
+        """요청을 보낸다. GET은 지난번 저장한 값으로 조건부 요청을 보낸다.
+
+        ``store_body=False``면 검증 값과 해시만 남기고, 304는 ``content=None``으로
+        돌아오므로 호출한 쪽이 본문에서 얻은 결과를 이미 갖고 있어야 한다.
+        ``revalidate=False``면 조건 없이 보낸다. 본문은 ``CONDITIONAL_METHODS``에서만 저장한다.
+        """
+        method = method.upper()
+        # POST 등은 재검증하지 않으므로 저장한 본문을 다시 읽을 일이 없다
+        store_body = store_body and method in CONDITIONAL_METHODS
+        key = request_key(method, url, kwargs.get("json", kwargs.get("data")))
+        with self._lock:
+            entry = dict(self._entries.get(key) or {})
+
+        cached_body = None
+        conditional = False
+        if self.path is not None and entry and revalidate and method in CONDITIONAL_METHODS:
+            if store_body:
+                cached_body = self._read_body(entry)
+            if cached_body is not None or not store_body:
+                headers = dict(kwargs.pop("headers", None) or {})
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+                kwargs["headers"] = headers
+                conditional = True
+
+        response = session.request(method, url, **kwargs)
+        if response.status_code == 304 and conditional:
+            run_report.count("http_not_modified")
+            with self._lock:
+                if key in self._entries:
+                    self._entries[key]["used_at"] = time.time()
+                    self._dirty = True
+            return CachedResponse(response, cached_body, entry.get("sha256"), unchanged=True)
+
+        content = response.content
+        sha256 = hashlib.sha256(content).hexdigest()
+        unchanged = bool(entry) and entry.get("sha256") == sha256
+        run_report.count("http_unchanged" if unchanged else "http_changed")
+        if self.path is not None and response.ok:
+            self._remember(key, entry, response, sha256, content if store_body else None)
+        return CachedResponse(response, content, sha256, unchanged)
+
+    def _remember(self, key: str, old: Dict, response: requests.Response, sha256: str, body: Optional[bytes]) -> None:
+        if body is not None:
+            body_path = self._body_path(sha256)
+            if not body_path.exists():
+                body_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = body_path.with_name(body_path.name + ".tmp")
+                tmp_path.write_bytes(gzip.compress(body, mtime=0))
+                os.replace(tmp_path, body_path)
+        now = time.time()
+        with self._lock:
+            self._entries[key] = {
+                "url": response.url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "sha256": sha256,
+                "body": body is not None,
+                "used_at": now,
+            }
+            self._dirty = True
+        if old.get("body") and (body is None or old.get("sha256") != sha256):
+            self._drop_body(old["sha256"])
+
+    def _drop_body(self, sha256: str) -> None:
+        # 본문은 해시로 저장되므로 같은 본문을 가리키는 다른 요청이 있으면 남겨 둔다
+        with self._lock:
+            shared = any(entry.get("body") and entry.get("sha256") == sha256 for entry in self._entries.values())
+        if not shared:
+            self._body_path(sha256).unlink(missing_ok=True)
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            if len(self._entries) > self.max_entries:
+                keep = sorted(self._entries.items(), key=lambda item: item[1].get("used_at", 0), reverse=True)
+                self._entries = dict(keep[: self.max_entries])
+                kept_bodies = {entry["sha256"] for entry in self._entries.values() if entry.get("body")}
+                for _, dropped in keep[self.max_entries:]:
+                    if dropped.get("body") and dropped["sha256"] not in kept_bodies:
+                        self._body_path(dropped["sha256"]).unlink(missing_ok=True)
+            payload = {"version": CACHE_VERSION, "entries": self._entries}
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+_caches: Dict[str, HttpCache] = {}
+_registry_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return os.environ.get(CACHE_ENV, "1").lower() not in ("0", "false", "no", "off")
+
+
+def named(name: str, root: Union[str, Path] = DEFAULT_CACHE_ROOT) -> HttpCache:
+    """``<root>/<name>.json``에 저장되는 공유 캐시. 스크레이퍼마다 이름을 달리해 같은 파일을 동시에 쓰지 않는다."""
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = HttpCache(Path(root) / f"{name}.json" if enabled() else None)
+        return cache
+
+
+def save_all() -> None:
+    with _registry_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        try:
+            cache.save()
+        except OSError as exc:
+            print(f"Could not save HTTP cache {cache.path}: {exc}")
@@ -1,11 +1,26 @@
+import argparse
 import json
 import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-API_URL = "https://www.manning.com/search/getCatalogData"
+import book_store
+import change_feed
+import http_cache
+import rate_limiter
+import release_dates
+import run_report
+from ndjson_output import NdjsonWriter, compact_list, ndjson_path_for, write_json_list
+
+BASE_URL = os.environ.get("MANNING_BASE_URL", "https://www.manning.com").rstrip("/")
+API_URL = f"{BASE_URL}/search/getCatalogData"
 OUTPUT_FILE = "manning_books.json"
 COVER_BASE = "https://images.manning.com/320/400/resize/"
 DEFAULT_PAYLOAD: Dict[str, Union[str, int, bool, List[str]]] = {
@@ -21,13 +36,53 @@ DEFAULT_PAYLOAD: Dict[str, Union[str, int, bool, List[str]]] = {
     "page": 1,
 }
 
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_PAGES = 50
+PAGE_COUNT_KEYS = ("totalPages", "pageCount", "numberOfPages", "pages")
+TOTAL_COUNT_KEYS = ("totalCount", "totalResults", "totalItems", "total", "count")
+PAGE_SIZE_KEYS = ("pageSize", "perPage", "itemsPerPage", "size")
+# 지금 카탈로그에는 날짜가 없지만, 생기면 이 키에서 가져온다
+RELEASE_DATE_KEYS = ("publicationDate", "publishedDate", "releaseDate", "pubDate")
+
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 
 
-def fetch_catalog(payload: Dict[str, Union[str, int, List[str]]]) -> Union[Dict, List]:
-    response = requests.post(API_URL, json=payload, timeout=30)
-    response.raise_for_status()
-    return response.json()
+def create_session(pool_size: int = DEFAULT_MAX_CONCURRENCY) -> requests.Session:
+    """``pool_size``개 동시 요청에 맞춘 keep-alive 세션 (재시도는 Retry-After를 따른다)."""
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=None)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_catalog_response(
+    payload: Dict[str, Union[str, int, List[str]]],
+    session: Optional[requests.Session] = None,
+    cache: Optional[http_cache.HttpCache] = None,
+) -> http_cache.CachedResponse:
+    """카탈로그 한 페이지를 HTTP 캐시를 거쳐 POST한다 (지난 실행 이후 바뀌었는지 알 수 있다)."""
+    cache = cache or http_cache.named("manning")
+    with run_report.span("catalog_request", page=payload.get("page")):
+        with rate_limiter.for_url(API_URL).request() as slot:
+            response = cache.request(session or requests, "POST", API_URL, store_body=False, json=payload, timeout=30)
+            slot.observe(response.response)
+        response.raise_for_status()
+    return response
+
+
+def parse_catalog(response: http_cache.CachedResponse) -> Union[Dict, List]:
+    with run_report.span("parse", page="catalog"):
+        return response.json()
+
+
+def fetch_catalog(
+    payload: Dict[str, Union[str, int, List[str]]],
+    session: Optional[requests.Session] = None,
+    cache: Optional[http_cache.HttpCache] = None,
+) -> Union[Dict, List]:
+    return parse_catalog(fetch_catalog_response(payload, session, cache))
 
 
 def flatten_items(data: Union[Dict, List]) -> List[Dict]:
@@ -46,6 +101,41 @@ def flatten_items(data: Union[Dict, List]) -> List[Dict]:
     return []
 
 
+def extract_items(raw: Union[Dict, List]) -> List[Dict]:
+    items = flatten_items(raw)
+    if not items and isinstance(raw, dict) and "catalog" in raw:
+        items = flatten_items(raw["catalog"])
+    return items
+
+
+def _find_int(data: Union[Dict, List], keys: Iterable[str]) -> Optional[int]:
+    """``keys`` 중 하나에 있는 첫 양의 정수 (중첩된 dict도 찾는다)."""
+    if not isinstance(data, dict):
+        return None
+    for key in keys:
+        value = data.get(key)
+        if isinstance(value, (int, str)) and not isinstance(value, bool) and str(value).isdigit() and int(value) > 0:
+            return int(value)
+    for value in data.values():
+        if isinstance(value, dict):
+            found = _find_int(value, keys)
+            if found is not None:
+                return found
+    return None
+
+
+def detect_page_count(raw: Union[Dict, List]) -> Optional[int]:
+    """카탈로그 응답이 알려 주는 페이지 수. 없으면 ``None``."""
+    pages = _find_int(raw, PAGE_COUNT_KEYS)
+    if pages is not None:
+        return pages
+    total = _find_int(raw, TOTAL_COUNT_KEYS)
+    page_size = _find_int(raw, PAGE_SIZE_KEYS) or len(extract_items(raw))
+    if total is not None and page_size:
+        return math.ceil(total / page_size)
+    return None
+
+
 def build_cover_url(raw_url: str) -> str:
     if not raw_url:
         return ""
@@ -57,24 +147,144 @@ def transform_item(item: Dict) -> Dict[str, str]:
     title = item.get("title") or item.get("name") or ""
     link = item.get("link") or ""
     cover_image = build_cover_url(str(item.get("imageUrl") or ""))
+    released = next((str(item[key]) for key in RELEASE_DATE_KEYS if item.get(key)), None)
 
-    return {
+    record = {
         "title": title,
         "detail_link": link,
         "cover_image": cover_image,
     }
+    return release_dates.annotate(record, released)
 
 
 def save_items(items: Iterable[Dict[str, str]], output_path: Path) -> None:
     data = list(items)
-    output_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    with run_report.span("write_json"):
+        output_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
     logging.info("Saved %s books to %s", len(data), output_path)
 
 
-def main() -> None:
+def stream_items(items: Iterable[Dict[str, str]], output_path: Path) -> int:
+    """``items``를 받는 대로 ``save_items()``와 같은 형식으로 쓴다. 임시 파일을 거치므로 실패해도 이전 결과는 그대로다."""
+    with run_report.span("write_json"):
+        count = write_json_list(items, output_path)
+    logging.info("Saved %s books to %s", count, output_path)
+    return count
+
+
+def stream_items_ndjson(items: Iterable[Dict[str, str]], output_path: Path) -> int:
+    """``items``를 받는 대로 ``manning_books.ndjson``에 쓰고 ``output_path``로 합친다. 실패하면 ``.partial``에 남는다."""
+    with NdjsonWriter(ndjson_path_for(OUTPUT_FILE)) as output:
+        for item in items:
+            output.write(item)
+    with run_report.span("write_json"):
+        count = compact_list(output.path, output_path)
+    logging.info("Saved %s books to %s", count, output_path)
+    return count
+
+
+def fetch_catalog_pages(
+    session: requests.Session,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_pages: int = DEFAULT_MAX_PAGES,
+    cache: Optional[http_cache.HttpCache] = None,
+) -> List[http_cache.CachedResponse]:
+    """카탈로그의 모든 페이지를 페이지 순서로 가져온다.
+
+    1페이지로 전체 페이지 수를 알아낸 뒤 나머지를 최대 ``max_concurrency``개(rate_limiter가
+    속도를 줄이는 동안은 더 적게) 동시에 가져온다. 페이지 수를 알 수 없으면 빈 페이지가 나올 때까지 하나씩 넘긴다.
+    """
+    first = fetch_catalog_response(dict(DEFAULT_PAYLOAD, page=1), session, cache)
+    responses = [first]
+
+    page_count = detect_page_count(parse_catalog(first))
+    if page_count is None:
+        logging.info("Catalog does not report a page count; walking pages sequentially")
+        page = 2
+        response = first
+        while extract_items(parse_catalog(response)) and page <= max_pages:
+            response = fetch_catalog_response(dict(DEFAULT_PAYLOAD, page=page), session, cache)
+            responses.append(response)
+            page += 1
+        return responses
+
+    if page_count > max_pages:
+        logging.warning("Catalog reports %s pages; only fetching the first %s", page_count, max_pages)
+        page_count = max_pages
+    logging.info("Fetching %s catalog pages with up to %s concurrent requests", page_count, max_concurrency)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        payloads = [dict(DEFAULT_PAYLOAD, page=page) for page in range(2, page_count + 1)]
+        responses.extend(executor.map(run_report.profiled(lambda payload: fetch_catalog_response(payload, session, cache)), payloads))
+    return responses
+
+
+def catalog_unchanged(responses: List[http_cache.CachedResponse]) -> bool:
+    """모든 페이지가 지난 실행과 같고 이전 결과 파일도 남아 있으면 True."""
+    return bool(responses) and all(response.unchanged for response in responses) and Path(OUTPUT_FILE).exists()
+
+
+def transform_pages(pages: Iterable[List[Dict]]) -> Iterator[Dict[str, str]]:
+    """카탈로그 항목을 페이지별로 변환한다. 제목이 없거나 ``detail_link``가 겹치는 책은 건너뛴다."""
+    seen = set()
+    for items in pages:
+        for item in items:
+            transformed = transform_item(item)
+            if not transformed["title"]:
+                continue
+            key = transformed["detail_link"] or transformed["title"]
+            if key in seen:
+                continue
+            seen.add(key)
+            yield transformed
+
+
+def main(
+    all_pages: bool = False,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_pages: int = DEFAULT_MAX_PAGES,
+    stream: bool = False,
+) -> None:
+    run_report.start_run("manning")
+    try:
+        if all_pages:
+            _run_all_pages(max_concurrency, max_pages, stream)
+        else:
+            _run(stream)
+        # 결과를 쓴 뒤에만 저장해야 실패한 실행이 다음번에 바뀌지 않은 것으로 보이지 않는다
+        http_cache.save_all()
+    finally:
+        run_report.finish_run(OUTPUT_FILE)
+
+
+def _run_all_pages(max_concurrency: int, max_pages: int, stream: bool = False) -> None:
+    write = stream_items_ndjson if stream else stream_items
+    with create_session(max_concurrency) as session:
+        try:
+            responses = fetch_catalog_pages(session, max_concurrency, max_pages)
+            if catalog_unchanged(responses):
+                logging.info("All %s catalog pages are unchanged; keeping %s", len(responses), OUTPUT_FILE)
+                return
+            pages = (extract_items(parse_catalog(response)) for response in responses)
+            count = write(transform_pages(pages), change_feed.staging_path(OUTPUT_FILE))
+        except requests.HTTPError as exc:
+            logging.error("HTTP error fetching Manning catalog: %s", exc)
+            raise
+        except requests.RequestException as exc:
+            logging.error("Network error fetching Manning catalog: %s", exc)
+            raise
+    run_report.count("books", count)
+    if not count:
+        logging.warning("No catalog items found in response")
+    book_store.ingest_file("manning", change_feed.staging_path(OUTPUT_FILE))
+    change_feed.commit("manning", OUTPUT_FILE)
+
+
+def _run(stream: bool = False) -> None:
     payload = DEFAULT_PAYLOAD.copy()
     try:
-        raw = fetch_catalog(payload)
+        with create_session(1) as session:
+            response = fetch_catalog_response(payload, session)
     except requests.HTTPError as exc:
         logging.error("HTTP error fetching Manning catalog: %s", exc)
         raise
@@ -82,20 +292,44 @@ def main() -> None:
         logging.error("Network error fetching Manning catalog: %s", exc)
         raise
 
-    items = flatten_items(raw)
-    if not items and isinstance(raw, dict) and "catalog" in raw:
-        items = flatten_items(raw["catalog"])
+    if catalog_unchanged([response]):
+        logging.info("Catalog is unchanged; keeping %s", OUTPUT_FILE)
+        return
+    items = extract_items(parse_catalog(response))
 
     if not items:
         logging.warning("No catalog items found in response")
 
     books: List[Dict[str, str]] = []
-    for item in items:
-        transformed = transform_item(item)
-        if transformed["title"]:
-            books.append(transformed)
-    save_items(books, Path(OUTPUT_FILE))
+    with run_report.span("transform"):
+        for item in items:
+            transformed = transform_item(item)
+            if transformed["title"]:
+                books.append(transformed)
+    run_report.count("books", len(books))
+    if stream:
+        stream_items_ndjson(books, change_feed.staging_path(OUTPUT_FILE))
+    else:
+        save_items(books, change_feed.staging_path(OUTPUT_FILE))
+    book_store.ingest_file("manning", change_feed.staging_path(OUTPUT_FILE))
+    change_feed.commit("manning", OUTPUT_FILE)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Fetch the newest Manning MEAP catalog")
+    parser.add_argument("--all-pages", action="store_true", help="fetch every catalog page instead of only the first")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY, help="concurrent page requests")
+    parser.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES, help="upper bound on pages to fetch")
+    parser.add_argument(
+        "--stream", action="store_true", help="append books to manning_books.ndjson as they arrive and compact it at the end"
+    )
+    return parser
+
+
+def run_cli(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    main(args.all_pages, max(1, args.max_concurrency), args.max_pages, args.stream)
 
 
 if __name__ == "__main__":
-    main()
+    run_cli()
@@ -0,0 +1,170 @@
+import json
+import os
+import textwrap
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+def ndjson_path_for(json_path: Union[str, Path]) -> Path:
+    return Path(json_path).with_suffix(".ndjson")
+
+
+class NdjsonWriter:
+    """``<path>.partial``에 JSON 레코드를 한 줄씩 바로 기록한다 (스레드 안전).
+
+    실행이 중간에 죽어도 그때까지의 결과를 :func:`iter_records`로 읽을 수 있다.
+    :meth:`close`는 partial 파일을 ``path``로 바꾸고, 실패했을 때 쓰는 :meth:`abort`는
+    확인할 수 있도록 partial 파일을 남겨 둔다.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.partial_path = self.path.with_name(self.path.name + ".partial")
+        self.count = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fp = self.partial_path.open("w", encoding="utf-8")
+
+    def write(self, record: Dict) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._fp.write(line)
+            self._fp.flush()
+            self.count += 1
+
+    def close(self) -> Path:
+        with self._lock:
+            self._fp.close()
+        os.replace(self.partial_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        with self._lock:
+            self._fp.close()
+
+    def __enter__(self) -> "NdjsonWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def iter_records(path: Union[str, Path]) -> Iterator[Dict]:
+    """NDJSON 파일의 레코드. 크래시로 잘린 마지막 줄은 건너뛴다."""
+    with Path(path).open(encoding="utf-8") as fp:
+        for line in fp:
+            if not line.endswith("\n"):
+                return
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def _index_records(path: Path, key: Callable[[Dict], str]) -> Tuple[List[str], Dict[str, int]]:
+    """처음 나온 순서대로의 키와 키마다 마지막 레코드의 바이트 위치."""
+    order: List[str] = []
+    offsets: Dict[str, int] = {}
+    with path.open("rb") as fp:
+        while True:
+            offset = fp.tell()
+            line = fp.readline()
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            record_key = key(record)
+            if record_key not in offsets:
+                order.append(record_key)
+            offsets[record_key] = offset
+    return order, offsets
+
+
+def _records_at(path: Path, offsets: Iterable[int]) -> Iterator[Dict]:
+    with path.open("rb") as fp:
+        for offset in offsets:
+            fp.seek(offset)
+            yield json.loads(fp.readline())
+
+
+def write_json_list(items: Iterable[Dict], output_path: Union[str, Path]) -> int:
+    """``items``를 임시 파일을 거쳐 들여쓴 JSON 배열로 쓰고 개수를 돌려준다.
+
+    ``json.dump(..., ensure_ascii=False, indent=2)``와 같은 바이트를 레코드 하나씩만 메모리에 두고 만든다.
+    """
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    count = 0
+    with tmp_path.open("w", encoding="utf-8") as fp:
+        fp.write("[")
+        for item in items:
+            fp.write(",\n" if count else "\n")
+            fp.write(textwrap.indent(json.dumps(item, ensure_ascii=False, indent=2), "  "))
+            count += 1
+        fp.write("\n]" if count else "]")
+    os.replace(tmp_path, output_path)
+    return count
+
+
+def write_json_groups(groups: Iterable[Tuple[str, List]], output_path: Union[str, Path]) -> int:
+    """``(name, items)`` 쌍을 임시 파일을 거쳐 들여쓴 JSON 객체로 쓴다."""
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    count = 0
+    with tmp_path.open("w", encoding="utf-8") as fp:
+        fp.write("{")
+        for name, items in groups:
+            fp.write(",\n" if count else "\n")
+            value = textwrap.indent(json.dumps(items, ensure_ascii=False, indent=2), "  ")[2:]
+            fp.write(f"  {json.dumps(name, ensure_ascii=False)}: {value}")
+            count += 1
+        fp.write("\n}" if count else "}")
+    os.replace(tmp_path, output_path)
+    return count
+
+
+def compact_list(
+    ndjson_path: Union[str, Path],
+    json_path: Union[str, Path],
+    key: Optional[Callable[[Dict], str]] = None,
+    keep: Optional[Callable[[Dict], bool]] = None,
+) -> int:
+    """한 줄에 레코드 하나인 NDJSON을 JSON 배열로 바꾼다.
+
+    ``key``가 있으면 같은 키의 레코드는 첫 레코드의 위치에 마지막 레코드의 값을 쓰고,
+    없으면 모두 남긴다. ``keep``으로 최종 레코드를 거른다.
+    """
+    ndjson_path = Path(ndjson_path)
+    if key is None:
+        records = iter_records(ndjson_path)
+    else:
+        order, offsets = _index_records(ndjson_path, key)
+        records = _records_at(ndjson_path, (offsets[record_key] for record_key in order))
+    if keep is not None:
+        records = (record for record in records if keep(record))
+    return write_json_list(records, json_path)
+
+
+def compact_groups(
+    ndjson_path: Union[str, Path],
+    json_path: Union[str, Path],
+    group_key: str,
+    items_key: str,
+    order: Optional[List[str]] = None,
+) -> int:
+    """한 줄에 그룹 하나인 NDJSON(``{group_key: name, items_key: [...]}``)을 JSON 객체로 바꾼다.
+
+    ``order``의 그룹을 먼저, 나머지는 나온 순서대로 쓰고, 여러 번 쓰인 그룹은 마지막 줄을 쓴다.
+    """
+    ndjson_path = Path(ndjson_path)
+    seen, offsets = _index_records(ndjson_path, lambda record: record[group_key])
+    names = [name for name in order or [] if name in offsets]
+    names += [name for name in seen if name not in names]
+    records = _records_at(ndjson_path, (offsets[name] for name in names))
+    return write_json_groups(((record[group_key], record[items_key]) for record in records), json_path)
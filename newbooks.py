@@ -1,378 +1,904 @@
+import argparse
 import json
+import queue
+import sys
 import time
 import urllib.parse
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import re
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def setup_driver():
-    chrome_options = Options()
-    
-    # 기본 헤드리스 설정 (안정성 우선)
-    chrome_options.add_argument('--headless=new')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--window-size=1280,1024')
+import book_store
+import change_feed
+import crawl_shards
+import driver_factory
+import http_cache
+import rate_limiter
+import release_dates
+import run_report
+from html_engines import JS_TEXT_HELPER, resolve_engine
+from detail_cache import DEFAULT_CACHE_PATH, DEFAULT_MAX_ENTRIES, DEFAULT_SELL_NUM_TTL, DetailCache
+from ndjson_output import NdjsonWriter, compact_groups, ndjson_path_for
+from publisher_checkpoint import DEFAULT_CHECKPOINT_ROOT, PublisherCheckpoint
+from publisher_schedule import DEFAULT_SCHEDULE_PATH, PublisherSchedule
+
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+# 오프라인 벤치마크 등에서 다른 서버를 가리킬 수 있도록 환경변수로 덮어쓸 수 있다
+YES24_BASE_URL = os.environ.get("YES24_BASE_URL", "https://m.yes24.com").rstrip("/")
+DETAIL_URL = YES24_BASE_URL + "/goods/detail/{goods_no}"
+# 상세 페이지에서 출간일/판매지수가 렌더링되었는지 확인하는 선택자 (parse_release_info()와 같은 요소)
+DETAIL_READY_SELECTOR = ".authPub .date, .gd_date, .gdBasicSet.gdRating .sellNum .num, .gd_sellNum"
+NO_RELEASE_DATE = "출간일 정보 없음"
+OUTPUT_FILE = "books_data.json"
+# 샤드로 나눠 실행하면 샤드마다 다른 캐시 파일을 쓴다
+HTTP_CACHE_NAME = "yes24"
+# 상세 페이지를 동시에 가져올 HTTP 요청 수 (출판사당)
+HTTP_DETAIL_WORKERS = 8
+# 브라우저 페이지 로드는 HTTP 요청보다 느리므로 이 시간을 넘을 때만 느린 응답으로 본다
+BROWSER_SLOW_AFTER = 20.0
+
+# yes24 요청은 고정 대기 대신 호스트별 적응형 속도 제한을 따른다
+rate_limiter.configure(YES24_BASE_URL, rate=8.0, max_rate=40.0, concurrency=HTTP_DETAIL_WORKERS, max_concurrency=24)
+
+def parse_release_info(page_source):
+    """상세 페이지 HTML에서 (출간일, 판매지수)를 찾는다. 요소가 없으면 해당 값은 None."""
+    with run_report.span("parse", page="detail"):
+        soup = BeautifulSoup(page_source, 'html.parser')
     
-    # 로그 및 에러 메시지 억제
-    chrome_options.add_argument('--log-level=3')
-    chrome_options.add_argument('--disable-logging')
-    chrome_options.add_argument('--silent')
+    # 출간일 정보 찾기 (여러 선택자 시도)
+    date_elem = soup.select_one('.authPub .date') or soup.select_one('.gd_date')
+    date_text = date_elem.get_text(strip=True) if date_elem else None
     
-    # 불필요한 기능 비활성화 (JavaScript는 유지)
-    chrome_options.add_argument('--disable-extensions')
-    chrome_options.add_argument('--disable-plugins')
-    chrome_options.add_argument('--disable-images')  # 성능 향상을 위해
-    chrome_options.add_argument('--disable-background-networking')
-    chrome_options.add_argument('--disable-sync')
-    chrome_options.add_argument('--disable-default-apps')
+    # 판매지수 찾기 (여러 선택자 시도)
+    sell_num_elem = soup.select_one('.gdBasicSet.gdRating .sellNum .num') or soup.select_one('.gd_sellNum')
+    sell_num = None
+    if sell_num_elem:
+        # 판매지수에서 숫자만 추출
+        sell_num_text = sell_num_elem.text.strip()
+        numbers = re.findall(r'\d+', sell_num_text)
+        sell_num = ''.join(numbers) if numbers else "0"  # 쉼표 제거하고 숫자만 합치기
     
-    # 자동화 감지 방지
-    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
+    return date_text, sell_num
+
+def create_http_session(pool_size=HTTP_DETAIL_WORKERS):
+    """상세 페이지용 keep-alive 세션 (커넥션 풀 공유)"""
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept-Language": "ko-KR,ko;q=0.9",
+    })
+    return session
+
+def fetch_release_info_http(session, goods_no, known=None):
+    """정적 HTML로 출간일/판매지수를 가져온다. 필드가 없거나 실패하면 None (브라우저로 폴백).
+
+    known은 지난번에 이 페이지에서 얻은 값이다. 페이지가 그때와 같으면(304 또는 같은 본문 해시)
+    다시 파싱하지 않고 known을 돌려준다.
+    """
+    url = DETAIL_URL.format(goods_no=goods_no)
+    try:
+        with run_report.span("detail_http", goods_no=goods_no):
+            with rate_limiter.for_url(url).request() as slot:
+                # 상세 페이지 본문은 크기 때문에 검증자와 해시만 보관한다
+                response = http_cache.named(HTTP_CACHE_NAME).request(
+                    session, "GET", url, store_body=False, revalidate=known is not None, timeout=15
+                )
+                slot.observe(response.response)
+            response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"HTTP detail fetch failed for book {goods_no}: {e}")
+        run_report.count("detail_http_errors")
+        return None
     
-    # User Agent 설정
-    chrome_options.add_argument('--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    if response.unchanged and known is not None:
+        run_report.count("detail_http_unchanged")
+        return known
+    date_text, sell_num = parse_release_info(response.text)
+    if date_text is None or sell_num is None:
+        run_report.count("detail_http_incomplete")
+        return None
+    run_report.count("detail_http_ok")
+    return date_text, sell_num
+
+def fetch_release_infos_http(session, goods_nos, workers=HTTP_DETAIL_WORKERS, known=None):
+    """여러 도서의 상세 정보를 동시에 가져온다. 정적 HTML로 얻지 못한 도서는 결과에서 빠진다.
+
+    known은 goods_no별로 지난번에 얻은 (출간일, 판매지수)다 (fetch_release_info_http 참고).
+    """
+    goods_nos = [goods_no for goods_no in dict.fromkeys(goods_nos) if goods_no]
+    if not goods_nos:
+        return {}
+    known = known or {}
     
-    # GitHub Actions 환경 설정
-    if 'GITHUB_ACTIONS' in os.environ:
-        # 안정성을 위한 GitHub Actions 전용 설정
-        chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-        chrome_options.add_argument('--disable-background-timer-throttling')
-        chrome_options.add_argument('--disable-renderer-backgrounding')
-        chrome_options.add_argument('--disable-backgrounding-occluded-windows')
-        chrome_options.add_argument('--disable-crash-reporter')
-        chrome_options.add_argument('--disable-breakpad')
-        chrome_options.add_argument('--memory-pressure-off')
-        
-        # Chrome 바이너리 경로 (여러 가능한 경로 시도)
-        possible_chrome_paths = [
-            '/usr/bin/google-chrome',
-            '/usr/bin/google-chrome-stable',
-            '/usr/bin/chromium-browser',
-            '/usr/bin/chromium'
-        ]
-        
-        for path in possible_chrome_paths:
-            if os.path.exists(path):
-                chrome_options.binary_location = path
-                print(f"Chrome binary found at: {path}")
-                break
-        
-        print("Running in GitHub Actions environment")
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(goods_nos))) as executor:
+        infos = executor.map(run_report.profiled(lambda g: fetch_release_info_http(session, g, known.get(g))), goods_nos)
+        for goods_no, info in zip(goods_nos, infos):
+            if info is not None:
+                results[goods_no] = info
+    return results
+
+def _load_detail_page(driver, url, goods_no):
+    with run_report.span("page_load", page="detail", goods_no=goods_no):
+        with rate_limiter.for_url(url).request(slow_after=BROWSER_SLOW_AFTER):
+            driver.get(url)
+            # 페이지가 로드될 때까지 대기
+            wait = WebDriverWait(driver, 20)  # 대기 시간을 20초로 조정
+            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    run_report.count("detail_browser")
     
-    # 환경변수 설정
-    os.environ['WDM_LOG_LEVEL'] = '0'
+    # 고정 대기 대신 출간일 요소가 나타날 때까지만 기다린다
+    with run_report.span("render_wait", page="detail"):
+        driver_factory.wait_for_selector(driver, DETAIL_READY_SELECTOR)
     
-    # 드라이버 초기화 시도
-    try:
-        # GitHub Actions에서는 시스템 ChromeDriver 우선 사용
-        if 'GITHUB_ACTIONS' in os.environ:
-            # 시스템에 설치된 ChromeDriver 사용
-            service = Service()
-        else:
-            # 로컬에서는 ChromeDriverManager 사용
-            service = Service(ChromeDriverManager().install())
-            
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.set_page_load_timeout(30)
-        driver.implicitly_wait(10)
-        
-        # 드라이버가 정상적으로 작동하는지 테스트
-        try:
-            driver.get("data:text/html,<html><body><h1>Test</h1></body></html>")
-            print("Chrome driver initialized successfully")
-            return driver
-        except Exception as test_error:
-            print(f"Driver test failed: {test_error}")
-            driver.quit()
-            raise test_error
-            
-    except Exception as e:
-        print(f"Chrome 드라이버 초기화 실패: {e}")
-        
-        # 대안 방법 시도
-        try:
-            if 'GITHUB_ACTIONS' in os.environ:
-                # GitHub Actions에서 ChromeDriverManager로 재시도
-                print("Trying ChromeDriverManager as fallback...")
-                service = Service(ChromeDriverManager().install())
-            else:
-                # 로컬에서 시스템 드라이버로 재시도
-                service = Service()
-                
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            driver.set_page_load_timeout(30)
-            driver.implicitly_wait(10)
-            
-            # 테스트
-            driver.get("data:text/html,<html><body><h1>Test</h1></body></html>")
-            print("Chrome driver initialized successfully with fallback method")
-            return driver
-            
-        except Exception as e2:
-            print(f"모든 초기화 방법 실패: {e2}")
-            raise Exception(f"Chrome driver initialization failed: {e2}")
+    # 페이지 소스 가져오기
+    with run_report.span("page_source", page="detail"):
+        page_source = driver.page_source
+    driver_factory.record_page_weight(driver)
+    return page_source
+
+def get_book_release_date(browser, goods_no):
+    """브라우저로 상세 페이지를 열어 (출간일, 판매지수)를 가져온다.
 
-def get_book_release_date(driver, goods_no):
+    browser는 DriverSupervisor이며, 브라우저가 죽으면 새 드라이버에서 같은 페이지를 다시 연다.
+    """
     if not goods_no:
-        return "출간일 정보 없음", "0"
+        return NO_RELEASE_DATE, "0"
         
-    url = f"https://m.yes24.com/goods/detail/{goods_no}"
+    url = DETAIL_URL.format(goods_no=goods_no)
     max_retries = 3
     retry_count = 0
     
     while retry_count < max_retries:
         try:
-            # 탭 크래시 방지를 위한 새 탭 생성 및 이동
-            if len(driver.window_handles) > 1:
-                driver.close()
-                driver.switch_to.window(driver.window_handles[0])
-            
-            driver.get(url)
-            # 페이지가 로드될 때까지 대기
-            wait = WebDriverWait(driver, 20)  # 대기 시간을 20초로 조정
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            
-            # 추가 대기 시간
-            time.sleep(1)  # 대기 시간을 1초로 줄임
-            
-            # 페이지 소스 가져오기
-            page_source = driver.page_source
+            page_source = browser.load(_load_detail_page, url, goods_no)
             if not page_source or len(page_source) < 100:
                 raise Exception("페이지 소스가 비어있거나 너무 짧습니다")
                 
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # 출간일 정보 찾기 (여러 선택자 시도)
-            date_elem = soup.select_one('.authPub .date') or soup.select_one('.gd_date')
-            date_text = date_elem.get_text(strip=True) if date_elem else "출간일 정보 없음"
-            
-            # 판매지수 찾기 (여러 선택자 시도)
-            sell_num_elem = soup.select_one('.gdBasicSet.gdRating .sellNum .num') or soup.select_one('.gd_sellNum')
-            sell_num = "0"
-            if sell_num_elem:
-                # 판매지수에서 숫자만 추출
-                sell_num_text = sell_num_elem.text.strip()
-                numbers = re.findall(r'\d+', sell_num_text)
-                if numbers:
-                    sell_num = ''.join(numbers)  # 쉼표 제거하고 숫자만 합치기
-            
-            return date_text, sell_num
+            date_text, sell_num = parse_release_info(page_source)
+            return (date_text if date_text is not None else NO_RELEASE_DATE), (sell_num or "0")
             
         except Exception as e:
             retry_count += 1
             print(f"Error fetching release date for book {goods_no} (Attempt {retry_count}/{max_retries}): {e}")
             
-            # 탭 크래시나 심각한 오류 시 새 탭 생성
-            try:
-                if "tab crashed" in str(e).lower() or "session" in str(e).lower():
-                    driver.execute_script("window.open('','_blank');")
-                    driver.switch_to.window(driver.window_handles[-1])
-            except:
-                pass
-                
-            if retry_count < max_retries:
-                time.sleep(3)  # 재시도 전 대기 시간을 3초로 줄임
-            else:
+            # 재시도 간격은 속도 제한기가 실패를 반영해 정한다
+            if retry_count >= max_retries:
                 print(f"Failed to fetch release date for book {goods_no} after {max_retries} attempts")
-                return "출간일 정보 없음", "0"
+                return NO_RELEASE_DATE, "0"
+
+# 검색 결과 한 페이지에서 가져올 최대 도서 수
+MAX_ITEMS_PER_PUBLISHER = 10
+
+# extract_items()와 같은 선택자를 페이지 안에서 실행해 필요한 필드만 JSON으로 돌려받는다
+EXTRACT_ITEMS_SCRIPT = JS_TEXT_HELPER + """
+return Array.from(document.querySelectorAll('.itemUnit'), item => {
+  const img = item.querySelector('img');
+  return {
+    title: text(item.querySelector('.info_name')),
+    author: text(item.querySelector('.info_auth')),
+    price: text(item.querySelector('.txt_num')),
+    image: img ? (img.getAttribute('data-original') || img.getAttribute('src') || '') : null,
+    goods_no: item.hasAttribute('data-goods-no') ? item.getAttribute('data-goods-no') : '',
+  };
+}).slice(0, arguments[0]);
+"""
+
+def _raw_item(item):
+    title_elem = item.select_one('.info_name')
+    author_elem = item.select_one('.info_auth')
+    price_elem = item.select_one('.txt_num')
+    img_elem = item.select_one('img')
+    return {
+        'title': title_elem.text if title_elem else None,
+        'author': author_elem.text if author_elem else None,
+        'price': price_elem.text if price_elem else None,
+        # src 또는 data-original 속성에서 URL 가져오기
+        'image': (img_elem.get('data-original') or img_elem.get('src', '')) if img_elem else None,
+        'goods_no': item.attrs.get('data-goods-no', ''),
+    }
+
+def _extract_items_soup(page_source, parse_only=None):
+    soup = BeautifulSoup(page_source, 'html.parser', parse_only=parse_only)
+    return [_raw_item(item) for item in soup.select('.itemUnit')[:MAX_ITEMS_PER_PUBLISHER]]
+
+# .itemUnit 하위 트리만 만든다
+ITEM_STRAINER = SoupStrainer(class_='itemUnit')
+
+ITEM_EXTRACTORS = {
+    'soup': _extract_items_soup,
+    'strained': lambda page_source: _extract_items_soup(page_source, ITEM_STRAINER),
+}
+
+def extract_items(page_source, engine=""):
+    """검색 결과 HTML에서 .itemUnit 원본 필드를 추출한다 (EXTRACT_ITEMS_SCRIPT와 같은 형태).
+
+    engine으로 파싱 백엔드를 고른다 (html_engines 참고). 어떤 백엔드든 결과는 같다.
+    """
+    return ITEM_EXTRACTORS[resolve_engine(engine)](page_source)
+
+def extract_items_in_browser(driver):
+    return driver.execute_script(EXTRACT_ITEMS_SCRIPT, MAX_ITEMS_PER_PUBLISHER) or []
+
+def build_book(raw):
+    """원본 필드로 도서 레코드를 만든다. 제목이 없으면 None."""
+    # 제목 선택자 수정
+    if raw['title'] is None:
+        return None
+    title = raw['title'].strip().replace('[도서]', '').strip()
+    
+    # 저자 선택자 수정
+    author = raw['author'].strip() if raw['author'] is not None else "저자 정보 없음"
+    
+    # 가격 선택자 수정
+    price = raw['price'].strip() if raw['price'] is not None else "가격 정보 없음"
+    
+    # 이미지 URL 선택자 수정
+    image_url = ""
+    if raw['image'] is not None:
+        image_url = raw['image']
+        if image_url and not image_url.startswith('http'):
+            image_url = 'https:' + image_url
+        if not image_url or 'Noimg_L.jpg' in image_url:
+            image_url = 'https://image.yes24.com/momo/Noimg_L.jpg'
+    
+    if not title:  # 제목이 있는 경우에만 추가
+        return None
+    
+    # 상품 번호 추출
+    goods_no = raw['goods_no']
+    detail_url = f"https://www.yes24.com/product/goods/{goods_no}" if goods_no else ""
+    
+    # 이미지 URL에서 상품 번호 추출 (백업 방법)
+    if not goods_no and image_url:
+        # 이미지 URL 형식: https://image.yes24.com/goods/146041188/L
+        try:
+            goods_no = image_url.split('/goods/')[1].split('/')[0]
+            detail_url = f"https://www.yes24.com/product/goods/{goods_no}"
+        except:
+            pass
+    
+    return {
+        'title': title,
+        'author': author,
+        'price': price,
+        'image_url': image_url,
+        'goods_no': goods_no,
+        'detail_url': detail_url,
+        'release_date': NO_RELEASE_DATE,
+        'sell_num': "0",
+        'sell_num_at': None,
+        'release_iso': None,
+        'release_sort': 0
+    }
+
+def _load_search_items(driver, url, publisher_name, extraction):
+    with run_report.span("page_load", page="search", publisher=publisher_name):
+        with rate_limiter.for_url(url).request(slow_after=BROWSER_SLOW_AFTER):
+            driver.get(url)
+            # 페이지가 로드될 때까지 대기 시간 증가
+            WebDriverWait(driver, 30).until(  # WebDriverWait 시간을 30초로 증가
+                EC.presence_of_element_located((By.CSS_SELECTOR, ".itemUnit"))
+            )
+    
+    # 동적 콘텐츠는 검색 결과 수가 더 이상 바뀌지 않을 때까지만 기다린다
+    with run_report.span("render_wait", page="search"):
+        driver_factory.wait_for_stable_count(driver, ".itemUnit")
+    
+    raw_items = None
+    if extraction == "dom":
+        try:
+            with run_report.span("extract_dom", page="search"):
+                raw_items = extract_items_in_browser(driver)
+        except WebDriverException as e:
+            if driver_factory.is_crash(driver, e):
+                raise
+            print(f"In-browser extraction failed for {publisher_name}, falling back to page_source: {e}")
+    
+    if raw_items is None:
+        # 페이지 소스 가져오기
+        with run_report.span("page_source", page="search"):
+            page_source = driver.page_source
+        with run_report.span("parse", page="search"):
+            raw_items = extract_items(page_source)
+    driver_factory.record_page_weight(driver)
+    return raw_items
+
+def _iso_timestamp(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec="seconds")
 
-def get_publisher_books(driver, publisher_name, publisher_id):
+def get_publisher_books(browser, publisher_name, publisher_id, session=None, cache=None, extraction="dom"):
+    """출판사 검색 결과와 상세 정보를 모은다. browser는 페이지 로드를 맡는 DriverSupervisor.
+
+    검색 결과가 없으면 빈 목록, 수집에 실패하면 None을 돌려준다.
+    """
     encoded_name = urllib.parse.quote(publisher_name)
-    url = f"https://m.yes24.com/search?query={encoded_name}&domain=BOOK&viewMode=&dispNo2=001001003&mkEntrNo={publisher_id}&order=RECENT"
+    url = f"{YES24_BASE_URL}/search?query={encoded_name}&domain=BOOK&viewMode=&dispNo2=001001003&mkEntrNo={publisher_id}&order=RECENT"
     
     try:
-        driver.get(url)
-        # 페이지가 로드될 때까지 대기 시간 증가
-        WebDriverWait(driver, 30).until(  # WebDriverWait 시간을 30초로 증가
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".itemUnit"))
-        )
-        
-        # 잠시 대기하여 동적 콘텐츠가 로드되도록 함
-        time.sleep(2)  # 대기 시간을 2초로 증가
-        
-        # 페이지 소스 가져오기
-        page_source = driver.page_source
-        soup = BeautifulSoup(page_source, 'html.parser')
+        raw_items = browser.load(_load_search_items, url, publisher_name, extraction)
         
         books = []
-        book_items = soup.select('.itemUnit')
-        
-        for item in book_items[:10]:  # 최대 5개 도서만 가져오기
+        for raw in raw_items:
             try:
-                # 제목 선택자 수정
-                title_elem = item.select_one('.info_name')
-                if not title_elem:
-                    continue
-                title = title_elem.text.strip().replace('[도서]', '').strip()
-                
-                # 저자 선택자 수정
-                author_elem = item.select_one('.info_auth')
-                author = author_elem.text.strip() if author_elem else "저자 정보 없음"
-                
-                # 가격 선택자 수정
-                price_elem = item.select_one('.txt_num')
-                price = price_elem.text.strip() if price_elem else "가격 정보 없음"
-                
-                # 이미지 URL 선택자 수정
-                img_elem = item.select_one('img')
-                image_url = ""
-                if img_elem:
-                    # src 또는 data-original 속성에서 URL 가져오기
-                    image_url = img_elem.get('data-original') or img_elem.get('src', '')
-                    if image_url and not image_url.startswith('http'):
-                        image_url = 'https:' + image_url
-                    if not image_url or 'Noimg_L.jpg' in image_url:
-                        image_url = 'https://image.yes24.com/momo/Noimg_L.jpg'
-                
-                if title:  # 제목이 있는 경우에만 추가
-                    # 상품 번호 추출
-                    goods_no = item.get('data-goods-no') if isinstance(item, dict) else item.attrs.get('data-goods-no', '')
-                    detail_url = f"https://www.yes24.com/product/goods/{goods_no}" if goods_no else ""
-                    
-                    # 이미지 URL에서 상품 번호 추출 (백업 방법)
-                    if not goods_no and image_url:
-                        # 이미지 URL 형식: https://image.yes24.com/goods/146041188/L
-                        try:
-                            goods_no = image_url.split('/goods/')[1].split('/')[0]
-                            detail_url = f"https://www.yes24.com/product/goods/{goods_no}"
-                        except:
-                            pass
-                    
-                    # 출간일 정보 가져오기
-                    release_date, sell_num = get_book_release_date(driver, goods_no)
-                    
-                    book_data = {
-                        'title': title,
-                        'author': author,
-                        'price': price,
-                        'image_url': image_url,
-                        'goods_no': goods_no,
-                        'detail_url': detail_url,
-                        'release_date': release_date,
-                        'sell_num': sell_num
-                    }
-                    
+                book_data = build_book(raw)
+                if book_data:
                     books.append(book_data)
             except Exception as e:
                 print(f"Error parsing book item for {publisher_name}: {e}")
                 continue
         
+        # 캐시에 있는 도서는 상세 페이지를 다시 열지 않는다
+        details = {}
+        # goods_no별로 판매지수를 상세 페이지에서 읽은 시각 (판매지수 이력은 새로 읽은 값만 쌓는다)
+        observed = {}
+        # 판매지수만 만료된 도서의 출간일 (출간일은 영구 보관하므로 판매지수만 다시 가져온다)
+        cached_dates = {}
+        if cache is not None:
+            for book in books:
+                if book['goods_no']:
+                    cached = cache.lookup(book['goods_no'])
+                    if cached is None:
+                        continue
+                    if cached[1] is None:
+                        cached_dates[book['goods_no']] = cached[0]
+                    else:
+                        details[book['goods_no']] = cached
+                        observed[book['goods_no']] = cache.sell_num_at(book['goods_no'])
+        
+        # 출간일 정보 가져오기: HTTP로 먼저 동시에 가져오고, 실패한 도서만 브라우저로 조회
+        if session is not None:
+            missing = [book['goods_no'] for book in books if book['goods_no'] not in details]
+            # 판매지수가 만료된 도서도 페이지가 그대로면 이전 값을 다시 쓴다
+            known = {}
+            if cache is not None:
+                for goods_no in missing:
+                    previous = cache.peek(goods_no)
+                    if previous is not None:
+                        known[goods_no] = previous
+            fetched = fetch_release_infos_http(session, missing, known=known)
+            details.update(fetched)
+            observed.update(dict.fromkeys(fetched, time.time()))
+            if cache is not None:
+                for goods_no, (release_date, sell_num) in fetched.items():
+                    cache.store(goods_no, release_date, sell_num)
+        
+        for book in books:
+            try:
+                if book['goods_no'] in details:
+                    book['release_date'], book['sell_num'] = details[book['goods_no']]
+                else:
+                    book['release_date'], book['sell_num'] = get_book_release_date(browser, book['goods_no'])
+                    if book['goods_no'] and book['release_date'] != NO_RELEASE_DATE:
+                        observed[book['goods_no']] = time.time()
+                        if cache is not None:
+                            cache.store(book['goods_no'], book['release_date'], book['sell_num'])
+                    elif book['goods_no'] in cached_dates:
+                        # 상세 페이지를 읽지 못했으면 캐시의 출간일과 이전 판매지수를 쓴다 (새로 읽은 값이 아니므로 이력에는 남기지 않는다)
+                        book['release_date'], book['sell_num'] = cache.peek(book['goods_no'])
+            except Exception as e:
+                print(f"Error fetching details for {book['title']}: {e}")
+            if observed.get(book['goods_no']):
+                book['sell_num_at'] = _iso_timestamp(observed[book['goods_no']])
+            # 화면과 피드가 날짜를 다시 파싱하지 않도록 ISO 날짜와 정렬 키를 함께 넣는다
+            release_dates.annotate(book, book['release_date'])
+        
+        run_report.count("books", len(books))
         print(f"Found {len(books)} books for {publisher_name}")
         return books
     except Exception as e:
         print(f"Error fetching data for {publisher_name}: {e}")
-        return []
-
-def main():
-    publishers = [
-        {"name": "골든래빗", "id": "287363"},
-        {"name": "한빛미디어", "id": "1469"},
-        {"name": "인사이트", "id": "289113"},
-        {"name": "리코멘드", "id": "314006"},
-        {"name": "길벗", "id": "231"},
-        {"name": "길벗캠퍼스", "id": "303742"},
-        {"name": "책만", "id": "297319"},
-        {"name": "프리렉", "id": "10755"},
-        {"name": "이지스퍼블리싱", "id": "117983"},
-        {"name": "제이펍", "id": "107878"},
-        {"name": "위키북스", "id": "120040"},
-        {"name": "시프트", "id": "327076"},
-        {"name": "루비페이퍼", "id": "183510"},
-        {"name": "에이콘출판사", "id": "7813"},
-        {"name": "에이콘온", "id": "332424"},
-        {"name": "정보문화사", "id": "1"},
-        {"name": "스마트북스", "id": "132231"},
-        {"name": "비제이퍼블릭", "id": "108933"},
-        {"name": "영진닷컴", "id": "260"},
-        {"name": "아티오", "id": "170992"},
-        {"name": "비엘북스", "id": "122064"},
-        {"name": "앤써북", "id": "109677"},
-        {"name": "디지털북스", "id": "4629"},
-        {"name": "책바세", "id": "313134"},
-        {"name": "로드북", "id": "135197"},
-        {"name": "성안당", "id": "498"},
-        {"name": "천그루숲", "id": "303200"},
-        {"name": "생능북", "id": "296623"},
-        {"name": "한빛비즈", "id": "106844"},
-        {"name": "다빈치books", "id": "156100"},
-        {"name": "미디어북", "id": "234011"},
-        {"name": "생능출판사", "id": "896"},
-        {"name": "북엔드", "id": "318093"},
-        {"name": "디비안(DBian)", "id": "246403"},
-        {"name": "아이콕스(iCox)", "id": "150859"}
-    ]
-    
+        return None
+
+PUBLISHERS_FILE = Path(__file__).with_name("publishers.json")
+
+
+def load_publishers(path=PUBLISHERS_FILE):
+    """출판사 설정 파일([{"name": ..., "id": ...}, ...])을 읽는다. 파일의 순서가 결과의 순서다."""
+    publishers = json.loads(Path(path).read_text(encoding='utf-8'))
+    for publisher in publishers:
+        if not publisher.get("name") or not str(publisher.get("id") or ""):
+            raise ValueError(f"Invalid publisher entry in {path}: {publisher}")
+        publisher["id"] = str(publisher["id"])
+    return publishers
+
+
+PUBLISHERS = load_publishers()
+
+# 헤드리스 Chrome 한 개가 yes24 모바일 페이지를 돌 때 사용하는 메모리 추정치
+CHROME_MEMORY_PER_WORKER = 600 * 1024 * 1024
+
+
+def _available_memory_bytes():
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_AVPHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def resolve_worker_count(requested, publisher_count):
+    """요청한 워커 수를 출판사 수와 가용 메모리에 맞게 제한한다."""
+    workers = max(1, min(requested, publisher_count))
+    available = _available_memory_bytes()
+    if available:
+        memory_cap = max(1, available // CHROME_MEMORY_PER_WORKER)
+        if memory_cap < workers:
+            print(f"Limiting workers from {workers} to {memory_cap} (available memory: {available // (1024 * 1024)} MB)")
+            workers = memory_cap
+    return workers
+
+
+def _warm_up(driver):
+    with run_report.span("warmup"):
+        with rate_limiter.for_url(YES24_BASE_URL).request(slow_after=BROWSER_SLOW_AFTER):
+            driver.get(YES24_BASE_URL)
+
+
+def _collect_result(results, index, publisher, books, output):
+    # output(NdjsonWriter)이 있으면 메모리에 모으지 않고 바로 한 줄로 기록한다
+    if output is not None:
+        output.write({"publisher": publisher["name"], "books": books})
+        results[index] = None
+    else:
+        results[index] = books
+
+
+def _crawl_worker(
+    worker_id, work_queue, results, total, session, cache, extraction, checkpoint=None, output=None,
+    schedule=None, deadline=None,
+):
+    # 재시도 시에는 이전 시도에서 반납된 웜 드라이버를 재사용하고,
+    # 페이지 수나 메모리가 한도를 넘으면 supervisor가 드라이버를 새로 띄운다
+    browser = driver_factory.DriverSupervisor(user_agent=USER_AGENT, page_load_timeout=30, on_start=_warm_up)
+    healthy = True
+    try:
+        print(f"[worker {worker_id}] Warming up WebDriver...")
+        browser.driver  # 첫 드라이버를 띄우면서 on_start로 웜업한다
+
+        while True:
+            # 시간 예산을 다 쓰면 남은 출판사는 다음 실행으로 미룬다
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            try:
+                index, publisher = work_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                print(f"[worker {worker_id}] Fetching data for {publisher['name']} ({index + 1}/{total})...")
+                started = time.monotonic()
+                with run_report.span("publisher", publisher=publisher["name"]):
+                    books = get_publisher_books(browser, publisher["name"], publisher["id"], session, cache, extraction)
+                if books is None:
+                    # 실패한 출판사는 스케줄에 기록하지 않으므로 다음 실행에서 다시 수집한다
+                    print(f"Failed to fetch books for {publisher['name']}")
+                    continue
+                # 결과가 없는 출판사도 확인한 것으로 기록해야 매 실행 맨 앞에서 다시 수집되지 않는다
+                if schedule is not None:
+                    schedule.record(publisher, books, time.monotonic() - started)
+                if books:  # 데이터를 성공적으로 가져온 경우에만 추가
+                    _collect_result(results, index, publisher, books, output)
+                    if checkpoint is not None:
+                        checkpoint.store(publisher["id"], publisher["name"], books)
+                    print(f"Successfully fetched {len(books)} books for {publisher['name']}")
+                else:
+                    print(f"No books found for {publisher['name']}")
+
+            except Exception as e:
+                print(f"Error processing publisher {publisher['name']}: {e}")
+                continue
+    except BaseException:
+        healthy = False
+        raise
+    finally:
+        browser.close(healthy)
+
+
+def crawl_publishers(
+    publishers, workers=1, detail_mode="http", cache=None, extraction="dom", checkpoint=None, output=None,
+    crawl=None, previous=None, schedule=None, deadline=None,
+):
+    """드라이버 풀로 출판사 목록을 수집하고 출판사 순서대로 결과를 합친다.
+
+    detail_mode가 "http"이면 상세 페이지를 공유 HTTP 세션으로 먼저 가져오고,
+    "browser"이면 기존처럼 모든 상세 페이지를 Chrome으로 연다.
+    cache(DetailCache)가 주어지면 캐시에 있는 도서는 상세 페이지를 건너뛴다.
+    extraction이 "dom"이면 검색 결과 필드를 브라우저 안에서 추출하고,
+    "source"이면 page_source를 BeautifulSoup으로 파싱한다.
+    checkpoint(PublisherCheckpoint)가 주어지면 이미 끝난 출판사는 체크포인트에서
+    읽어 오고, 새로 수집한 출판사는 끝나는 즉시 체크포인트에 기록한다.
+    output(NdjsonWriter)이 주어지면 출판사별 결과를 끝나는 즉시 한 줄씩 기록하고
+    메모리에는 남기지 않는다 (이때 반환값은 빈 dict).
+    crawl이 주어지면 그 출판사만 그 순서대로(스케줄러의 우선순위) 수집하고, 나머지와
+    deadline(time.monotonic() 기준)까지 수집하지 못한 출판사는 previous(지난 결과,
+    출판사 이름별 도서 목록)에 있는 도서를 그대로 쓴다. schedule(PublisherSchedule)이
+    주어지면 수집한 출판사의 결과를 기록한다.
+    """
+    results = {}
+    work_queue = queue.Queue()
+    position = {publisher["id"]: index for index, publisher in enumerate(publishers)}
+    crawl_ids = {publisher["id"] for publisher in crawl} if crawl is not None else None
+    resumed = 0
+    for index, publisher in enumerate(publishers):
+        if crawl_ids is not None and publisher["id"] not in crawl_ids:
+            _carry_over(results, index, publisher, previous, output)
+            continue
+        books = checkpoint.load(publisher["id"]) if checkpoint is not None else None
+        if books:
+            _collect_result(results, index, publisher, books, output)
+            resumed += 1
+    for publisher in (crawl if crawl is not None else publishers):
+        index = position[publisher["id"]]
+        if index not in results:
+            work_queue.put((index, publisher))
+
+    if resumed:
+        run_report.count("checkpoint_resumed", resumed)
+        print(f"Resuming from checkpoint: {resumed}/{len(publishers)} publishers already collected")
+    if work_queue.empty():
+        return _merge_results(publishers, results)
+
+    workers = resolve_worker_count(workers, work_queue.qsize())
+    session = create_http_session(workers * HTTP_DETAIL_WORKERS) if detail_mode == "http" else None
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    # cProfile은 스레드마다 따로 측정해야 하므로 작업 스레드에서 켠다
+                    run_report.profiled(_crawl_worker),
+                    worker_id, work_queue, results, len(publishers), session, cache, extraction, checkpoint, output,
+                    schedule, deadline,
+                )
+                for worker_id in range(1, workers + 1)
+            ]
+    finally:
+        if session is not None:
+            session.close()
+            http_cache.save_all()
+        if schedule is not None:
+            schedule.save()
+        if cache is not None:
+            cache.save()
+            run_report.count("detail_cache_hits", cache.hits)
+            run_report.count("detail_cache_misses", cache.misses)
+            print(cache.report())
+
+    errors = [future.exception() for future in futures if future.exception()]
+    if len(errors) == workers:
+        # 모든 워커가 드라이버를 띄우지 못한 경우에만 실패로 처리
+        raise errors[0]
+    for error in errors:
+        print(f"Worker stopped early: {error}")
+    if errors and not work_queue.empty():
+        raise Exception(f"{work_queue.qsize()} publishers were left unprocessed")
+    if not work_queue.empty():
+        deferred = work_queue.qsize()
+        run_report.count("publishers_deferred", deferred)
+        print(f"Time budget used up: deferring {deferred} publishers to the next run")
+        deferred_names = []
+        while not work_queue.empty():
+            index, publisher = work_queue.get_nowait()
+            deferred_names.append(publisher["name"])
+            _carry_over(results, index, publisher, previous, output)
+        run_report.note("deferred_publishers", deferred_names)
+    return _merge_results(publishers, results)
+
+
+def _carry_over(results, index, publisher, previous, output):
+    # 이번에 수집하지 않은 출판사는 지난 결과를 그대로 싣는다
+    books = (previous or {}).get(publisher["name"])
+    if books:
+        # 판매지수를 이번에 읽은 것이 아니므로 읽은 시각이 없는 옛 결과도 이력에 쌓이지 않게 한다
+        books = [dict(book, sell_num_at=book.get("sell_num_at")) for book in books]
+        _collect_result(results, index, publisher, books, output)
+
+
+def _merge_results(publishers, results):
+    # 출판사 목록 순서대로 결과를 합친다
+    all_data = {}
+    for index, publisher in enumerate(publishers):
+        if results.get(index) is not None:
+            all_data[publisher["name"]] = results[index]
+    return all_data
+
+
+def _load_previous_output():
+    try:
+        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable {OUTPUT_FILE}: {e}")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _commit_output():
+    # 판매지수 이력은 변경이 없어도 매번 쌓는다
+    book_store.ingest_file("yes24", change_feed.staging_path(OUTPUT_FILE))
+    # 이전 실행과 비교해 의미 있는 변경이 있을 때만 books_data.json을 바꾼다
+    change_feed.commit("yes24", OUTPUT_FILE)
+
+
+def merge_shards(shard_count, partials_dir=crawl_shards.DEFAULT_PARTIALS_DIR, publishers=None, schedule_path=None):
+    """샤드별 부분 결과를 출판사 목록 순서대로 books_data.json에 합친다.
+
+    빠진 샤드가 있거나 샤드 구성이 맞지 않으면 예외를 던지고 books_data.json은 그대로 둔다.
+    schedule_path가 주어지면 저장에 성공한 뒤에야 샤드들의 스케줄 기록을 그 파일에 반영한다
+    (병합이 실패하면 다음 실행에서 같은 출판사를 다시 수집한다). 합친 부분 결과 파일은 지운다.
+    """
+    publishers = publishers if publishers is not None else PUBLISHERS
+    all_data = crawl_shards.merge(publishers, shard_count, OUTPUT_FILE, partials_dir)
+    with open(change_feed.staging_path(OUTPUT_FILE), 'w', encoding='utf-8') as f:
+        json.dump(all_data, f, ensure_ascii=False, indent=2)
+    _commit_output()
+    if schedule_path is not None:
+        _merge_shard_schedules(publishers, shard_count, partials_dir, schedule_path)
+    # 다음 병합이 오래된 부분 결과를 다시 쓰지 않도록 합친 파일은 지운다
+    for index in range(shard_count):
+        crawl_shards.partial_path(OUTPUT_FILE, index, shard_count, partials_dir).unlink(missing_ok=True)
+    book_count = sum(len(books) for books in all_data.values())
+    print(f"Merged {shard_count} shards: {len(all_data)} publishers, {book_count} books")
+
+
+def _merge_shard_schedules(publishers, shard_count, partials_dir, schedule_path):
+    # 각 샤드의 스케줄 파일에서 그 샤드가 맡은 출판사의 기록만 가져온다
+    schedule = PublisherSchedule(schedule_path)
+    merged = 0
+    for index in range(shard_count):
+        path = crawl_shards.partial_path(schedule_path, index, shard_count, partials_dir)
+        if not path.exists():
+            continue
+        owned = [publisher["id"] for publisher in crawl_shards.select(publishers, index, shard_count)]
+        schedule.update(PublisherSchedule(path), owned)
+        path.unlink()
+        merged += 1
+    if merged:
+        schedule.save()
+        print(f"Merged publisher schedules of {merged}/{shard_count} shards into {schedule_path}")
+
+
+def main(
+    workers=1, detail_mode="http", cache=None, extraction="dom", checkpoint=None, stream=False,
+    publishers=None, schedule=None, time_budget=None, shard=None, partials_dir=crawl_shards.DEFAULT_PARTIALS_DIR,
+):
+    """수집을 실행하고 books_data.json 저장에 성공했는지 돌려준다.
+
+    checkpoint가 주어지면 재시도는 체크포인트가 없는 출판사만 다시 수집하고,
+    books_data.json 저장이 끝나면 체크포인트를 지운다.
+    stream이 True이면 출판사별 결과를 books_data.ndjson.partial에 바로 기록하고,
+    끝나면 books_data.ndjson으로 바꾼 뒤 books_data.json으로 압축한다.
+    publishers는 출판사 목록(기본값: publishers.json)이다. schedule(PublisherSchedule)이
+    주어지면 확인할 때가 된 출판사만 우선순위 순서로 수집하고, time_budget(초) 안에
+    끝낼 수 있는 만큼만 고른다. 건너뛴 출판사는 지난 books_data.json의 도서를 그대로 쓴다.
+    shard가 (샤드 번호, 샤드 수)이면 그 샤드가 맡은 출판사만 수집해
+    partials_dir/books_data.shard-<번호>-of-<수>.json에 쓰고, books_data.json은
+    merge_shards()가 모든 샤드를 합칠 때 바뀐다.
+    """
+    run_report.start_run("yes24")
+    publishers = publishers if publishers is not None else PUBLISHERS
+    output_file = OUTPUT_FILE
+    if shard is not None:
+        publishers = crawl_shards.select(publishers, *shard)
+        output_file = crawl_shards.partial_path(OUTPUT_FILE, *shard, partials_dir)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        print(f"Crawling {crawl_shards.shard_label(*shard)}: {len(publishers)} publishers -> {output_file}")
     max_retries = 3
     retry_count = 0
+    succeeded = False
+    output = None
+
+    crawl, previous = None, None
+    if schedule is not None or time_budget:
+        previous = _load_previous_output()
+    if schedule is not None:
+        if not len(schedule):
+            # 상태 파일이 없으면(캐시가 지워진 경우 등) 모든 출판사를 처음 보는 것으로 보고 전부 수집한다
+            print(f"No publisher schedule state in {schedule.path}; every publisher is due")
+        crawl, skipped = schedule.plan(publishers, time_budget, workers)
+        run_report.count("publishers_scheduled", len(crawl))
+        run_report.count("publishers_skipped", len(skipped))
+        run_report.note("schedule_entries", len(schedule))
+        run_report.note("skipped_publishers", [publisher["name"] for publisher in skipped])
+        print(schedule.report(crawl, skipped))
     
     while retry_count < max_retries:
         try:
-            driver = setup_driver()
-            print("Warming up WebDriver...")
-            driver.get("https://m.yes24.com")
-            time.sleep(2)  # 웜업을 위한 대기 시간
-            
-            all_data = {}
-            processed_count = 0
-            
-            for publisher in publishers:
-                try:
-                    print(f"Fetching data for {publisher['name']} ({processed_count + 1}/{len(publishers)})...")
-                    books = get_publisher_books(driver, publisher["name"], publisher["id"])
-                    if books:  # 데이터를 성공적으로 가져온 경우에만 추가
-                        all_data[publisher["name"]] = books
-                        print(f"Successfully fetched {len(books)} books for {publisher['name']}")
-                    else:
-                        print(f"No books found for {publisher['name']}")
-                    
-                    processed_count += 1
-                    
-                    # 메모리 정리를 위해 주기적으로 가비지 컬렉션 실행
-                    if processed_count % 5 == 0:
-                        import gc
-                        gc.collect()
-                        
-                    # GitHub Actions 환경에서는 더 짧은 대기 시간
-                    if 'GITHUB_ACTIONS' in os.environ:
-                        time.sleep(1)
-                    else:
-                        time.sleep(2)
-                        
-                except Exception as e:
-                    print(f"Error processing publisher {publisher['name']}: {e}")
-                    continue
+            # 재시도도 예산을 처음부터 쓴다 (아니면 예산이 지난 뒤의 재시도는 아무것도 수집하지 않는다)
+            deadline = time.monotonic() + time_budget if time_budget else None
+            # 시도마다 새로 연다 (지난 시도가 압축 도중 실패했으면 .partial은 이미 .ndjson으로 바뀌었다)
+            output = NdjsonWriter(ndjson_path_for(output_file)) if stream else None
+            all_data = crawl_publishers(
+                publishers, workers, detail_mode, cache, extraction, checkpoint, output,
+                crawl, previous, schedule, deadline,
+            )
             
             # JSON 파일로 저장
-            with open('books_data.json', 'w', encoding='utf-8') as f:
-                json.dump(all_data, f, ensure_ascii=False, indent=2)
+            with run_report.span("write_json"):
+                if output is not None:
+                    output.close()
+                    order = [publisher["name"] for publisher in publishers]
+                    compact_groups(output.path, change_feed.staging_path(output_file), "publisher", "books", order)
+                else:
+                    with open(change_feed.staging_path(output_file), 'w', encoding='utf-8') as f:
+                        json.dump(all_data, f, ensure_ascii=False, indent=2)
+            if shard is not None:
+                # 저장소 반영과 변경분 기록은 샤드를 합칠 때 한 번만 한다
+                os.replace(change_feed.staging_path(output_file), output_file)
+            else:
+                _commit_output()
             
+            if checkpoint is not None:
+                checkpoint.clear()
             print("Data collection completed!")
+            succeeded = True
             break  # 성공적으로 완료되면 루프 종료
             
         except Exception as e:
             retry_count += 1
+            if output is not None:
+                # 지금까지 모은 결과는 .partial 파일에 그대로 남겨 둔다
+                output.abort()
             print(f"Error in main process (Attempt {retry_count}/{max_retries}): {e}")
             if retry_count < max_retries:
                 print("Retrying...")
-                time.sleep(5)  # 재시도 전 대기
+                run_report.sleep(5, "main_retry")  # 재시도 전 대기
             else:
                 print("Failed to complete data collection after maximum retries")
-        finally:
-            try:
-                driver.quit()
-            except:
-                pass
+    
+    driver_factory.shutdown()
+    run_report.finish_run(output_file)
+    return succeeded
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="yes24 출판사별 신간 도서 수집")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("NEWBOOKS_WORKERS", "1")),
+        help="동시에 실행할 Chrome 드라이버 수 (기본값: 1, 환경변수 NEWBOOKS_WORKERS)",
+    )
+    parser.add_argument(
+        "--detail-mode",
+        choices=["http", "browser"],
+        default="http",
+        help="상세 페이지 수집 방식: http(정적 HTML 우선, 필요 시 브라우저) 또는 browser",
+    )
+    parser.add_argument(
+        "--cache-path",
+        default=str(DEFAULT_CACHE_PATH),
+        help="goods_no별 상세 정보 캐시 파일 경로",
+    )
+    parser.add_argument(
+        "--sell-num-ttl-hours",
+        type=float,
+        default=DEFAULT_SELL_NUM_TTL / 3600,
+        help="캐시된 판매지수를 다시 가져오기까지의 시간 (출간일은 영구 보관)",
+    )
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help="캐시에 보관할 최대 도서 수 (오래 사용되지 않은 항목부터 삭제)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="상세 정보 캐시를 사용하지 않음")
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=str(DEFAULT_CHECKPOINT_ROOT),
+        help="출판사별 중간 결과를 저장할 디렉터리 (같은 날 다시 실행하면 남은 출판사만 수집)",
+    )
+    parser.add_argument("--no-checkpoint", action="store_true", help="출판사별 체크포인트를 사용하지 않음")
+    parser.add_argument("--fresh", action="store_true", help="오늘 체크포인트를 지우고 처음부터 수집")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="출판사별 결과를 books_data.ndjson에 바로 기록하고 마지막에 books_data.json으로 압축",
+    )
+    parser.add_argument(
+        "--publishers",
+        default=str(PUBLISHERS_FILE),
+        help="수집할 출판사 목록 파일 (JSON, [{\"name\": ..., \"id\": ...}])",
+    )
+    parser.add_argument(
+        "--schedule-path",
+        default=str(DEFAULT_SCHEDULE_PATH),
+        help="출판사별 신간 빈도와 마지막 수집 시각을 저장할 파일",
+    )
+    parser.add_argument(
+        "--schedule",
+        action="store_true",
+        help="스케줄에 따라 확인할 때가 된 출판사만 수집 (상태가 --schedule-path에만 있으므로 기본값은 전체 수집)",
+    )
+    parser.add_argument(
+        "--budget-minutes",
+        type=float,
+        default=None,
+        help="이번 실행의 시간 예산 (분). 우선순위가 높은 출판사부터 예산 안에서 수집하고 나머지는 다음 실행으로 미룸",
+    )
+    parser.add_argument("--shard-index", type=int, default=0, help="이 프로세스가 맡을 샤드 번호 (0부터)")
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=1,
+        help="출판사 목록을 나눌 샤드 수. 2 이상이면 맡은 샤드만 수집해 부분 결과 파일에 씀",
+    )
+    parser.add_argument("--partials-dir", default=str(crawl_shards.DEFAULT_PARTIALS_DIR), help="샤드별 부분 결과 디렉터리")
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="수집하지 않고 --shard-count개 샤드의 부분 결과를 books_data.json으로 합침 (빠진 샤드가 있으면 실패)",
+    )
+    parser.add_argument(
+        "--extraction",
+        choices=["dom", "source"],
+        default="dom",
+        help="검색 결과 추출 방식: dom(브라우저 안에서 필드만 추출) 또는 source(page_source 파싱)",
+    )
+    args = parser.parse_args()
+    try:
+        crawl_shards.validate(args.shard_index, args.shard_count)
+    except ValueError as e:
+        parser.error(str(e))
+    publishers = load_publishers(args.publishers)
+
+    if args.merge:
+        try:
+            schedule_path = args.schedule_path if args.schedule else None
+            merge_shards(args.shard_count, args.partials_dir, publishers, schedule_path)
+        except (OSError, ValueError) as e:
+            print(f"Could not merge shards: {e}")
+            sys.exit(1)
+        sys.exit(0)
+
+    shard = None
+    if args.shard_count > 1:
+        # 같은 디렉터리에서 여러 샤드를 동시에 돌려도 캐시와 체크포인트가 겹치지 않게 한다
+        shard = (args.shard_index, args.shard_count)
+        args.cache_path = crawl_shards.shard_path(args.cache_path, *shard)
+        args.checkpoint_dir = crawl_shards.shard_path(args.checkpoint_dir, *shard)
+        HTTP_CACHE_NAME = f"yes24.{crawl_shards.shard_label(*shard)}"
+    
+    cache = None
+    if not args.no_cache:
+        cache = DetailCache(args.cache_path, args.sell_num_ttl_hours * 3600, args.cache_max_entries)
+    checkpoint = None
+    if not args.no_checkpoint:
+        checkpoint = PublisherCheckpoint(args.checkpoint_dir)
+        if args.fresh:
+            checkpoint.clear()
+    schedule = None
+    if args.schedule:
+        # 샤드는 공유 스케줄을 읽기만 하고 자기 기록은 부분 결과와 함께 내보낸다
+        # (--merge가 병합에 성공한 뒤에만 공유 스케줄에 반영된다)
+        save_path = crawl_shards.partial_path(args.schedule_path, *shard, args.partials_dir) if shard else None
+        schedule = PublisherSchedule(args.schedule_path, save_path)
+    if not main(
+        workers=args.workers,
+        detail_mode=args.detail_mode,
+        cache=cache,
+        extraction=args.extraction,
+        checkpoint=checkpoint,
+        stream=args.stream,
+        publishers=publishers,
+        schedule=schedule,
+        time_budget=args.budget_minutes * 60 if args.budget_minutes else None,
+        shard=shard,
+        partials_dir=args.partials_dir,
+    ):
+        sys.exit(1)
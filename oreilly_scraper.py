@@ -1,21 +1,34 @@
+import argparse
 import json
 import os
 import re
 import time
+from datetime import date
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
 
-TARGET_URL = "https://www.oreilly.com/search/?q=*&type=book&publishers=O%27Reilly%20Media%2C%20Inc.&rows=100&order_by=published_at"
+import book_store
+import change_feed
+import driver_factory
+import rate_limiter
+import release_dates
+import run_report
+from html_engines import JS_TEXT_HELPER, resolve_engine
+from ndjson_output import NdjsonWriter, compact_list, ndjson_path_for
+
+BASE_URL = os.environ.get("OREILLY_BASE_URL", "https://www.oreilly.com").rstrip("/")
+TARGET_URL = f"{BASE_URL}/search/?q=*&type=book&publishers=O%27Reilly%20Media%2C%20Inc.&rows=100&order_by=published_at"
+CARD_SELECTOR = '[data-testid^="search-card"]'
+# 브라우저 페이지 로드는 이 시간(초)을 넘겨야 rate_limiter가 느린 응답으로 본다
+PAGE_SLOW_AFTER = 30.0
 OUTPUT_FILE = "oreilly_books.json"
 PUBLISHED_AT_PATTERN = re.compile(
     r"(January|February|March|April|May|June|July|August|September|October|November|December|"
@@ -25,168 +38,426 @@ PUBLISHED_AT_PATTERN = re.compile(
 )
 
 
-def _ensure_chromedriver_binary(path: str) -> str:
-    candidate = Path(path)
-    if candidate.name.startswith("THIRD_PARTY_NOTICES"):
-        sibling = candidate.with_name("chromedriver")
-        if sibling.exists():
-            return str(sibling)
-        sibling = candidate.parent / "chromedriver"
-        if sibling.exists():
-            return str(sibling)
-    return str(candidate)
-
-
-def setup_driver() -> webdriver.Chrome:
-    """Create a headless Chrome webdriver configured for CI environments."""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1280,1024")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--log-level=3")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
-
-    if "GITHUB_ACTIONS" in os.environ:
-        chrome_binary_candidates = [
-            "/usr/bin/google-chrome",
-            "/usr/bin/google-chrome-stable",
-            "/usr/bin/chromium",
-            "/usr/bin/chromium-browser",
-        ]
-        for binary in chrome_binary_candidates:
-            if os.path.exists(binary):
-                chrome_options.binary_location = binary
-                break
-
-    try:
-        driver = webdriver.Chrome(options=chrome_options)
-    except Exception as manager_error:
-        print(f"Falling back to webdriver_manager due to: {manager_error}")
-        driver_path = _ensure_chromedriver_binary(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
-    driver.set_page_load_timeout(60)
-    driver.implicitly_wait(10)
-    return driver
-
-
 def clean_text(value: str) -> str:
     if not value:
         return ""
     return " ".join(value.split())
 
 
-def parse_books(page_source: str) -> List[Dict[str, str]]:
-    soup = BeautifulSoup(page_source, "html.parser")
-    cards = soup.select('[data-testid^="search-card"]')
-    dedup: Dict[str, Dict[str, str]] = {}
+# extract_cards()와 같은 선택자를 페이지 안에서 실행해 카드 필드만 돌려받는다 (DOM 전체를 옮기지 않는다)
+EXTRACT_CARDS_SCRIPT = JS_TEXT_HELPER + """
+return Array.from(document.querySelectorAll('[data-testid^="search-card"]'), card => {
+  const titleElem = card.querySelector('h4.title') || card.querySelector('a.MuiTypography-link');
+  const detailElem = card.querySelector('a.MuiTypography-link');
+  const coverElem = card.querySelector('img[src*="/covers/"]') || card.querySelector('img[data-src*="/covers/"]');
+  let cover = '';
+  if (coverElem && coverElem.hasAttribute('src')) {
+    cover = coverElem.getAttribute('src') || '';
+  } else if (coverElem && coverElem.hasAttribute('data-src')) {
+    cover = coverElem.getAttribute('data-src') || '';
+  }
+  return {
+    title: text(titleElem),
+    description: text(card.querySelector('[data-testid^="search-card-description"]')),
+    footers: Array.from(card.querySelectorAll('.MuiTypography-cardFooter'), text),
+    published: text(card.querySelector('[data-testid*="published"]')),
+    href: detailElem && detailElem.hasAttribute('href') ? detailElem.getAttribute('href') : null,
+    cover: cover,
+  };
+});
+"""
+
+
+def _raw_card(card) -> Dict:
+    title_elem = card.select_one("h4.title") or card.select_one("a.MuiTypography-link")
+    desc_elem = card.select_one('[data-testid^="search-card-description"]')
+    alt_elem = card.select_one('[data-testid*="published"]')
+    detail_elem = card.select_one("a.MuiTypography-link")
+
+    cover_elem = card.select_one('img[src*="/covers/"]') or card.select_one('img[data-src*="/covers/"]')
+    if cover_elem and cover_elem.has_attr("src"):
+        cover_src = cover_elem.get("src") or ""
+    elif cover_elem and cover_elem.has_attr("data-src"):
+        cover_src = cover_elem.get("data-src") or ""
+    else:
+        cover_src = ""
+
+    return {
+        "title": title_elem.get_text() if title_elem else None,
+        "description": desc_elem.get_text() if desc_elem else None,
+        "footers": [footer.get_text() for footer in card.select(".MuiTypography-cardFooter")],
+        "published": alt_elem.get_text() if alt_elem else None,
+        "href": detail_elem["href"] if detail_elem and detail_elem.has_attr("href") else None,
+        "cover": cover_src,
+    }
+
+
+def _extract_cards_soup(page_source: str, parse_only: Optional[SoupStrainer] = None) -> List[Dict]:
+    soup = BeautifulSoup(page_source, "html.parser", parse_only=parse_only)
+    return [_raw_card(card) for card in soup.select(CARD_SELECTOR)]
+
+
+# 검색 카드 부분만 트리로 만든다 (설명 같은 안쪽 요소는 카드 안에 그대로 남는다)
+CARD_STRAINER = SoupStrainer(attrs={"data-testid": re.compile(r"^search-card")})
+
+CARD_EXTRACTORS = {
+    "soup": _extract_cards_soup,
+    "strained": lambda page_source: _extract_cards_soup(page_source, CARD_STRAINER),
+}
+
+
+def extract_cards(page_source: str, engine: str = "") -> List[Dict]:
+    """페이지 소스의 검색 카드 필드 (EXTRACT_CARDS_SCRIPT와 같은 모양). ``engine``은 html_engines의 파서 엔진."""
+    return CARD_EXTRACTORS[resolve_engine(engine)](page_source)
+
+
+def extract_cards_in_browser(driver: webdriver.Chrome) -> List[Dict]:
+    return driver.execute_script(EXTRACT_CARDS_SCRIPT) or []
+
+
+def _build_entry(raw: Dict) -> Optional[Dict[str, str]]:
+    title = clean_text(raw["title"]) if raw["title"] is not None else ""
+
+    if not title:
+        return None
+
+    description = clean_text(raw["description"]) if raw["description"] is not None else ""
+
+    published_at = ""
+    for footer in raw["footers"]:
+        footer_text = clean_text(footer)
+        if not footer_text:
+            continue
+        normalized = footer_text
+        if "출판일" in normalized:
+            normalized = normalized.split(":", 1)[-1].strip()
+        if "page" in normalized.lower():
+            continue
+        if PUBLISHED_AT_PATTERN.search(normalized):
+            published_at = normalized
+            break
+        if not published_at and footer_text and "출판일" in footer_text:
+            published_at = normalized
+
+    if not published_at and raw["published"] is not None:
+        alt_text = clean_text(raw["published"])
+        if alt_text:
+            if "출판일" in alt_text:
+                alt_text = alt_text.split(":", 1)[-1].strip()
+            published_at = alt_text
 
-    for card in cards:
-        title_elem = card.select_one("h4.title") or card.select_one("a.MuiTypography-link")
-        title = clean_text(title_elem.get_text()) if title_elem else ""
+    detail_link = ""
+    if raw["href"] is not None:
+        detail_link = urljoin(TARGET_URL, raw["href"])  # ensure absolute URL
 
-        if not title:
-            continue
+    cover_image = ""
+    cover_src = raw["cover"]
+    if cover_src:
+        cover_image = cover_src if cover_src.startswith("http") else urljoin(TARGET_URL, cover_src)
+
+    entry = {
+        "title": title,
+        "description": description,
+        "published_at": published_at,
+        "detail_link": detail_link,
+        "cover_image": cover_image,
+    }
+    return release_dates.annotate(entry, published_at)
 
-        desc_elem = card.select_one('[data-testid^="search-card-description"]')
-        description = clean_text(desc_elem.get_text()) if desc_elem else ""
-
-        published_at = ""
-        for footer in card.select(".MuiTypography-cardFooter"):
-            footer_text = clean_text(footer.get_text())
-            if not footer_text:
-                continue
-            normalized = footer_text
-            if "출판일" in normalized:
-                normalized = normalized.split(":", 1)[-1].strip()
-            if "page" in normalized.lower():
-                continue
-            if PUBLISHED_AT_PATTERN.search(normalized):
-                published_at = normalized
-                break
-            if not published_at and footer_text and "출판일" in footer_text:
-                published_at = normalized
-
-        if not published_at:
-            alt_elem = card.select_one('[data-testid*="published"]')
-            if alt_elem:
-                alt_text = clean_text(alt_elem.get_text())
-                if alt_text:
-                    if "출판일" in alt_text:
-                        alt_text = alt_text.split(":", 1)[-1].strip()
-                    published_at = alt_text
-
-        detail_elem = card.select_one("a.MuiTypography-link")
-        detail_link = ""
-        if detail_elem and detail_elem.has_attr("href"):
-            detail_link = urljoin(TARGET_URL, detail_elem["href"])  # ensure absolute URL
-
-        cover_elem = card.select_one('img[src*="/covers/"]') or card.select_one('img[data-src*="/covers/"]')
-        cover_image = ""
-        if cover_elem and cover_elem.has_attr("src"):
-            cover_src = cover_elem.get("src") or ""
-        elif cover_elem and cover_elem.has_attr("data-src"):
-            cover_src = cover_elem.get("data-src") or ""
-        else:
-            cover_src = ""
 
-        if cover_src:
-            cover_image = cover_src if cover_src.startswith("http") else urljoin(TARGET_URL, cover_src)
+def _completeness(entry: Dict[str, str]) -> int:
+    return sum(1 for field in (entry["description"], entry["published_at"], entry["cover_image"]) if field)
 
-        entry = {
-            "title": title,
-            "description": description,
-            "published_at": published_at,
-            "detail_link": detail_link,
-            "cover_image": cover_image,
-        }
 
-        key = detail_link or title
+def book_key(entry: Dict[str, str]) -> str:
+    return entry["detail_link"] or entry["title"]
+
+
+class BookIndex:
+    """``detail_link``(없으면 제목) 기준으로 가장 완전한 항목만 남기는 중복 제거 색인.
+
+    페이지마다 나눠 넣어도 모든 카드로 ``build_books()``를 한 번 돌린 것과 같다.
+    ``on_change``는 새 항목이나 덜 완전한 항목을 바꾼 항목마다 불린다.
+    """
+
+    def __init__(self, on_change: Optional[Callable[[Dict[str, str]], None]] = None) -> None:
+        self._books: Dict[str, Dict[str, str]] = {}
+        self._on_change = on_change
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    def add(self, entry: Dict[str, str]) -> bool:
+        """``entry``를 합친다. 처음 보는 책이면 True."""
+        key = book_key(entry)
         if not key:
-            continue
+            return False
 
-        if key in dedup:
-            existing = dedup[key]
-            existing_score = sum(1 for field in (existing["description"], existing["published_at"], existing["cover_image"]) if field)
-            new_score = sum(1 for field in (entry["description"], entry["published_at"], entry["cover_image"]) if field)
-            if new_score > existing_score:
-                dedup[key] = entry
-        else:
-            dedup[key] = entry
+        existing = self._books.get(key)
+        if existing is None:
+            self._books[key] = entry
+            self._changed(entry)
+            return True
+        if _completeness(entry) > _completeness(existing):
+            self._books[key] = entry
+            self._changed(entry)
+        return False
 
-    return list(dedup.values())
+    def _changed(self, entry: Dict[str, str]) -> None:
+        if self._on_change is not None:
+            self._on_change(entry)
 
+    def add_cards(self, raw_cards: Iterable[Dict]) -> List[Dict[str, str]]:
+        """카드로 항목을 만들어 합치고, 새로 들어간 항목을 돌려준다."""
+        new_entries = []
+        for raw in raw_cards:
+            entry = _build_entry(raw)
+            if entry is not None and self.add(entry):
+                new_entries.append(entry)
+        return new_entries
+
+    def books(self) -> List[Dict[str, str]]:
+        return list(self._books.values())
+
+
+def build_books(raw_cards: Iterable[Dict]) -> List[Dict[str, str]]:
+    index = BookIndex()
+    index.add_cards(raw_cards)
+    return index.books()
 
-def fetch_books() -> List[Dict[str, str]]:
-    driver = setup_driver()
-    try:
-        driver.get(TARGET_URL)
 
-        wait = WebDriverWait(driver, 30)
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid^="search-card"]')))
+def parse_books(page_source: str, engine: str = "") -> List[Dict[str, str]]:
+    with run_report.span("parse", page="search"):
+        return build_books(extract_cards(page_source, engine))
 
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
 
+def page_url(page: int) -> str:
+    return TARGET_URL if page <= 1 else f"{TARGET_URL}&page={page}"
+
+
+def _wait_for_cards(driver: webdriver.Chrome) -> None:
+    wait = WebDriverWait(driver, 30)
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, CARD_SELECTOR)))
+
+
+def _wait_for_scroll_render(driver: webdriver.Chrome) -> None:
+    """고정 대기 대신 스크롤로 불러온 카드가 다 그려질 때까지 기다린다."""
+    with run_report.span("render_wait", page="search"):
+        driver_factory.wait_for_stable_count(driver, CARD_SELECTOR)
+
+
+def _read_cards(driver: webdriver.Chrome, extraction: str) -> List[Dict]:
+    """불러온 페이지의 카드 필드. 브라우저 안(``dom``)에서 뽑거나 ``page_source``를 파싱한다."""
+    if extraction == "dom":
+        try:
+            with run_report.span("extract_dom", page="search"):
+                return extract_cards_in_browser(driver)
+        except WebDriverException as exc:
+            print(f"In-browser extraction failed, falling back to page_source: {exc}")
+
+    with run_report.span("page_source", page="search"):
         page_source = driver.page_source
-        return parse_books(page_source)
+    with run_report.span("parse", page="search"):
+        return extract_cards(page_source)
+
+
+def fetch_books(
+    extraction: str = "dom", on_change: Optional[Callable[[Dict[str, str]], None]] = None
+) -> List[Dict[str, str]]:
+    """검색 페이지를 불러와 책 목록을 돌려준다. ``extraction``이 ``"dom"``이든 ``"source"``든 결과는 같다."""
+    browser = driver_factory.DriverSupervisor(page_load_timeout=60)
+    healthy = False
+    try:
+        raw_cards = browser.load(_load_search_page, extraction)
+        healthy = True
+    finally:
+        browser.close(healthy)
+    index = BookIndex(on_change)
+    index.add_cards(raw_cards)
+    return index.books()
+
+
+def _load_search_page(driver: webdriver.Chrome, extraction: str) -> List[Dict]:
+    with run_report.span("page_load", page="search"):
+        with rate_limiter.for_url(TARGET_URL).request(slow_after=PAGE_SLOW_AFTER):
+            driver.get(TARGET_URL)
+            _wait_for_cards(driver)
+
+    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    _wait_for_scroll_render(driver)
+
+    raw_cards = _read_cards(driver, extraction)
+    driver_factory.record_page_weight(driver)
+    return raw_cards
+
+
+def fetch_books_deep(
+    max_pages: int = 10,
+    since: Optional[date] = None,
+    tabs: int = 3,
+    extraction: str = "dom",
+    on_change: Optional[Callable[[Dict[str, str]], None]] = None,
+) -> List[Dict[str, str]]:
+    """결과 페이지를 최신순으로 ``max_pages``나 ``since``까지 넘긴다.
+
+    한 번에 ``tabs``개 페이지를 탭으로 동시에 불러오고, 카드는 ``BookIndex`` 하나에 합친 뒤
+    버리므로 메모리는 페이지 수가 아니라 책 수만큼 는다. 출간일이 ``since`` 이전인 책은 뺀다
+    (``on_change``는 마지막에 빠지는 책도 본다).
+    """
+    index = BookIndex(on_change)
+    browser = driver_factory.DriverSupervisor(page_load_timeout=60)
+    healthy = False
+    try:
+        page = 1
+        reached_end = False
+        limiter = rate_limiter.for_url(BASE_URL)
+        while page <= max_pages and not reached_end:
+            # 탭마다 로드가 끝날 때까지 rate_limiter 자리를 쥐므로 배치는 호스트 상한을 넘지 않는다
+            size = max(1, min(tabs, limiter.concurrency))
+            batch = list(range(page, min(page + size, max_pages + 1)))
+            # 죽은 배치는 새 브라우저에서 다시 불러오고, 중복은 BookIndex가 걸러 낸다
+            reached_end, loaded = browser.load(_crawl_batch, batch, index, since, extraction, pages=len(batch))
+            page += loaded
+
+        healthy = True
     finally:
-        driver.quit()
+        browser.close(healthy)
 
+    books = index.books()
+    if since is not None:
+        books = [book for book in books if is_since(book, since)]
+    return books
 
-def save_books(books: List[Dict[str, str]], output_path: str = OUTPUT_FILE) -> None:
-    with open(output_path, "w", encoding="utf-8") as fp:
-        json.dump(books, fp, ensure_ascii=False, indent=2)
 
+def is_since(book: Dict[str, str], since: date) -> bool:
+    """``book``이 ``since`` 이후에 나왔는지 (날짜가 없는 책은 남긴다)."""
+    return (release_dates.to_date(book["published_at"]) or since) >= since
 
-def main() -> None:
-    books = fetch_books()
-    save_books(books)
-    print(f"Saved {len(books)} books to {OUTPUT_FILE}")
+
+def _crawl_batch(
+    driver: webdriver.Chrome, batch: List[int], index: BookIndex, since: Optional[date], extraction: str
+) -> Tuple[bool, int]:
+    """``batch``를 탭으로 동시에 불러와 카드를 ``index``에 합친다.
+
+    끝에 닿았는지와 실제로 연 페이지 수를 돌려준다. 호스트의 동시 요청 상한이 이미 연
+    탭 수보다 줄면 ``batch``를 다 열지 않고, 남은 페이지는 다음 배치에서 연다.
+    """
+    limiter = rate_limiter.for_url(BASE_URL)
+    main_window = driver.current_window_handle
+    handles = []
+    started = []
+    reached_end = False
+    try:
+        # 탭이 동시에 불러오도록 이동을 먼저 모두 시작한다
+        for number in batch:
+            if not limiter.acquire(held=len(started)):
+                break
+            started.append(time.monotonic())
+            driver.switch_to.new_window("tab")
+            driver_factory.apply_resource_blocking(driver)
+            driver.execute_script("window.location.href = arguments[0];", page_url(number))
+            handles.append(driver.current_window_handle)
+
+        for number, handle in zip(batch, handles):
+            driver.switch_to.window(handle)
+            try:
+                with run_report.span("page_load", page="search", number=number):
+                    _wait_for_cards(driver)
+            except TimeoutException:
+                # 마지막 페이지는 원래 카드가 없으므로 서버 문제가 아니다
+                limiter.release(time.monotonic() - started.pop(0), True, slow_after=PAGE_SLOW_AFTER)
+                print(f"No search cards on page {number}; stopping")
+                reached_end = True
+            else:
+                limiter.release(time.monotonic() - started.pop(0), True, slow_after=PAGE_SLOW_AFTER)
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                _wait_for_scroll_render(driver)
+                new_entries = index.add_cards(_read_cards(driver, extraction))
+                driver_factory.record_page_weight(driver)
+                dates = [release_dates.to_date(entry["published_at"]) for entry in new_entries]
+                dated = [value for value in dates if value is not None]
+                print(f"Page {number}: {len(new_entries)} new books ({len(index)} total)")
+                if not new_entries:
+                    reached_end = True
+                elif since is not None and dated and max(dated) < since:
+                    reached_end = True
+            driver.close()
+            if reached_end:
+                for remaining in handles[handles.index(handle) + 1:]:
+                    limiter.release(time.monotonic() - started.pop(0), True, slow_after=PAGE_SLOW_AFTER)
+                    driver.switch_to.window(remaining)
+                    driver.close()
+                break
+        driver.switch_to.window(main_window)
+    finally:
+        # 끝까지 불러오지 못한 페이지(브라우저가 죽은 경우 등)도 자리를 돌려준다
+        for start in started:
+            limiter.release(time.monotonic() - start, False, "page not loaded")
+    return reached_end, len(handles)
+
+
+def _fetch_streaming(extraction: str, deep: bool, max_pages: int, since: Optional[date], tabs: int) -> int:
+    """찾는 대로 책을 NDJSON 파일에 쓰고, 끝나면 ``OUTPUT_FILE``로 합친다."""
+    with NdjsonWriter(ndjson_path_for(OUTPUT_FILE)) as output:
+        if deep:
+            fetch_books_deep(max_pages, since, tabs, extraction, on_change=output.write)
+        else:
+            fetch_books(extraction, on_change=output.write)
+    keep = (lambda book: is_since(book, since)) if since is not None else None
+    with run_report.span("write_json"):
+        return compact_list(output.path, change_feed.staging_path(OUTPUT_FILE), key=book_key, keep=keep)
+
+
+def save_books(books: List[Dict[str, str]], output_path: Union[str, Path] = OUTPUT_FILE) -> None:
+    with run_report.span("write_json"):
+        with open(output_path, "w", encoding="utf-8") as fp:
+            json.dump(books, fp, ensure_ascii=False, indent=2)
+
+
+def main(
+    extraction: str = "dom",
+    deep: bool = False,
+    max_pages: int = 10,
+    since: Optional[date] = None,
+    tabs: int = 3,
+    stream: bool = False,
+) -> None:
+    run_report.start_run("oreilly")
+    try:
+        if stream:
+            count = _fetch_streaming(extraction, deep, max_pages, since, tabs)
+        else:
+            if deep:
+                books = fetch_books_deep(max_pages, since, tabs, extraction)
+            else:
+                books = fetch_books(extraction)
+            save_books(books, change_feed.staging_path(OUTPUT_FILE))
+            count = len(books)
+        run_report.count("books", count)
+        print(f"Scraped {count} books")
+        book_store.ingest_file("oreilly", change_feed.staging_path(OUTPUT_FILE))
+        change_feed.commit("oreilly", OUTPUT_FILE)
+    finally:
+        driver_factory.shutdown()
+        run_report.finish_run(OUTPUT_FILE)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Scrape the newest O'Reilly books")
+    parser.add_argument(
+        "--extraction",
+        choices=["dom", "source"],
+        default="dom",
+        help="dom: extract card fields inside the browser; source: parse page_source with BeautifulSoup",
+    )
+    parser.add_argument("--deep", action="store_true", help="walk result pages instead of reading only the first one")
+    parser.add_argument("--max-pages", type=int, default=10, help="page limit for --deep")
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="date cutoff (YYYY-MM-DD) for --deep")
+    parser.add_argument("--tabs", type=int, default=3, help="result pages loaded in parallel tabs for --deep")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="append books to oreilly_books.ndjson as they are found and compact it at the end",
+    )
+    args = parser.parse_args()
+    main(args.extraction, args.deep, args.max_pages, args.since, args.tabs, args.stream)
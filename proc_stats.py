@@ -0,0 +1,115 @@
+import os
+import resource
+import sys
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # psutil은 선택 의존성 (없으면 /proc을 읽는다)
+    psutil = None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _proc_children() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as fp:
+                stat = fp.read()
+        except OSError:
+            continue
+        # 명령 이름에 공백이 있을 수 있으므로 닫는 괄호 뒤에서 나눈다
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def _proc_rss(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm", encoding="utf-8") as fp:
+            return int(fp.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _proc_pss(pid: int) -> Optional[int]:
+    # smaps_rollup (Linux 4.14+)은 공유 페이지를 나눠 쓰는 프로세스 수로 나눈 PSS를 준다
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="utf-8") as fp:
+            for line in fp:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, IndexError, ValueError):
+        return None
+    return None
+
+
+def process_memory(pid: int) -> int:
+    """``pid``의 PSS (바이트). PSS를 읽을 수 없으면 RSS, 프로세스가 없으면 0.
+
+    여러 Chrome 프로세스의 RSS를 더하면 공유 페이지가 프로세스마다 한 번씩 세어지므로 PSS를 먼저 쓴다.
+    """
+    pss = _proc_pss(pid)
+    if pss is not None:
+        return pss
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return 0
+    return _proc_rss(pid) if os.path.isdir("/proc") else 0
+
+
+def is_running(pid: int) -> bool:
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def process_tree_pids(pid: int) -> List[int]:
+    """``pid``와 그 모든 자손 프로세스."""
+    if psutil is not None:
+        try:
+            parent = psutil.Process(pid)
+            return [pid] + [child.pid for child in parent.children(recursive=True)]
+        except psutil.Error:
+            return []
+    if not os.path.isdir("/proc"):
+        return [pid]
+    children = _proc_children()
+    pids, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        pids.append(current)
+        stack.extend(children.get(current, []))
+    return pids
+
+
+def process_tree_rss(pid: int) -> int:
+    """``pid``와 모든 자손 프로세스의 RSS 합 (바이트, 알 수 없으면 0)."""
+    if psutil is not None:
+        total = 0
+        for child_pid in process_tree_pids(pid):
+            try:
+                total += psutil.Process(child_pid).memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+    if not os.path.isdir("/proc"):
+        return 0
+    return sum(_proc_rss(child_pid) for child_pid in process_tree_pids(pid))
+
+
+def peak_rss_self() -> int:
+    """현재 프로세스의 최대 RSS (바이트)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
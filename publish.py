@@ -0,0 +1,309 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import covers
+import search_index
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성 (없으면 .br을 만들지 않는다)
+    brotli = None
+
+DEFAULT_OUTPUT_DIR = Path("site_data")
+MANIFEST_NAME = "manifest.json"
+DEFAULT_SHARD_SIZE = 20
+DEFAULT_FEED_PAGE_SIZE = 50
+# 카드에서 4줄까지 보이므로 그보다 조금 긴 만큼만 목록에 싣는다
+EXCERPT_LENGTH = 240
+# 화면에서 쓰지 않는 yes24 필드는 인덱스에서 뺀다 (상세 샤드에는 남는다)
+INDEX_OMIT_YES24 = ("goods_no", "sell_num_at")
+HASH_LENGTH = 12
+
+SOURCE_FILES = {
+    "yes24": "books_data.json",
+    "oreilly": "oreilly_books.json",
+    "manning": "manning_books.json",
+}
+
+Artifact = Union[Dict, List]
+
+
+def minify(data: Artifact) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    """``text``를 단어 경계에서 ``length``자 정도로 자른 것."""
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    space = cut.rfind(" ")
+    if space > length // 2:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+def build_yes24(data: Dict[str, List[Dict]], shard_size: int) -> Tuple[Artifact, List[Artifact]]:
+    index = {
+        publisher: [{key: value for key, value in book.items() if key not in INDEX_OMIT_YES24} for book in books]
+        for publisher, books in data.items()
+    }
+    shards = [{publisher: books} for publisher, books in data.items()]
+    return index, shards
+
+
+def build_oreilly(data: List[Dict], shard_size: int) -> Tuple[Artifact, List[Artifact]]:
+    index = []
+    for book in data:
+        entry = {key: value for key, value in book.items() if key != "description"}
+        description = book.get("description") or ""
+        if description:
+            entry["excerpt"] = excerpt(description)
+            if entry["excerpt"] != description:
+                entry["truncated"] = True
+        index.append(entry)
+    shards = [data[start:start + shard_size] for start in range(0, len(data), shard_size)]
+    return index, shards
+
+
+def build_manning(data: List[Dict], shard_size: int) -> Tuple[Artifact, List[Artifact]]:
+    return data, []
+
+
+BUILDERS: Dict[str, Callable[[Artifact, int], Tuple[Artifact, List[Artifact]]]] = {
+    "yes24": build_yes24,
+    "oreilly": build_oreilly,
+    "manning": build_manning,
+}
+
+
+def _feed_entry(source: str, publisher: str, record: Dict) -> Dict:
+    if source == "yes24":
+        meta = f"{publisher} · {record.get('author', '')}"
+        url = record.get("detail_url", "")
+        cover = record.get("image_url", "")
+    else:
+        meta = "O'Reilly" if source == "oreilly" else "Manning"
+        url = record.get("detail_link", "")
+        cover = record.get("cover_image", "")
+    entry = {
+        "source": source,
+        "title": record.get("title", ""),
+        "meta": meta,
+        "url": url,
+        "date": record.get("release_iso"),
+        "cover": covers.absolute_url(source, cover) if cover else "",
+    }
+    if record.get("cover_original"):
+        entry["cover_original"] = record["cover_original"]
+    return entry
+
+
+def build_latest(loaded: Dict[str, Artifact], page_size: int) -> Tuple[int, List[List[Dict]]]:
+    """``loaded``의 모든 레코드를 최신순으로 페이지로 나눈다. 날짜가 있는 레코드 수와 페이지들을 돌려준다."""
+    keyed = []
+    for source, data in loaded.items():
+        groups = data.items() if isinstance(data, dict) else [("", data)]
+        for publisher, records in groups:
+            for record in records:
+                keyed.append((record.get("release_sort") or 0, _feed_entry(source, publisher, record)))
+    # sorted()는 안정 정렬이라 날짜가 같으면 소스 순서와 원래 순서가 유지된다
+    keyed.sort(key=lambda item: item[0], reverse=True)
+    entries = [entry for _, entry in keyed]
+    dated = sum(1 for sort, _ in keyed if sort)
+    return dated, [entries[start:start + page_size] for start in range(0, len(entries), page_size)]
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+def write_artifact(out_dir: Path, stem: str, data: Artifact) -> Tuple[str, Dict]:
+    """``data``를 ``<stem>.<hash>.json``과 미리 압축한 파일로 쓰고, 이름과 manifest 항목을 돌려준다."""
+    payload = minify(data)
+    digest = hashlib.sha256(payload).hexdigest()
+    name = f"{stem}.{digest[:HASH_LENGTH]}.json"
+    # mtime=0이면 같은 내용은 항상 같은 .gz가 된다
+    variants = {"gzip": (".gz", gzip.compress(payload, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        variants["br"] = (".br", brotli.compress(payload, quality=11))
+    entry = {"sha256": digest, "bytes": len(payload)}
+    path = out_dir / name
+    if not path.exists():
+        _write_atomic(path, payload)
+    for encoding, (suffix, compressed) in variants.items():
+        compressed_path = path.with_name(path.name + suffix)
+        if not compressed_path.exists():
+            _write_atomic(compressed_path, compressed)
+        entry[f"{encoding}_bytes"] = len(compressed)
+    return name, entry
+
+
+def publish_source(
+    source: str,
+    data: Artifact,
+    out_dir: Path,
+    shard_size: int,
+    files: Dict[str, Dict],
+    thumbs: Optional[Dict[str, Dict]] = None,
+) -> Dict:
+    index, shards = BUILDERS[source](data, shard_size)
+    if thumbs:
+        # 페이지는 site_data/ 밖에 있으므로 그 기준의 경로로 바꾼다
+        index = covers.rewrite(source, index, thumbs, prefix=f"{out_dir.name}/")
+    index_name, files_entry = write_artifact(out_dir, f"{source}.index", index)
+    files[index_name] = files_entry
+    detail_names = []
+    for number, shard in enumerate(shards):
+        name, files_entry = write_artifact(out_dir, f"{source}.detail-{number}", shard)
+        files[name] = files_entry
+        detail_names.append(name)
+    count = sum(len(books) for books in data.values()) if isinstance(data, dict) else len(data)
+    entry = {"index": index_name, "details": detail_names, "count": count}
+    if source == "oreilly":
+        entry["shard_size"] = shard_size
+    return entry
+
+
+def publish_search(loaded: Dict[str, Artifact], out_dir: Path, files: Dict[str, Dict]) -> Dict:
+    documents, shards = search_index.build(loaded)
+    docs_name, files_entry = write_artifact(out_dir, "search.docs", documents)
+    files[docs_name] = files_entry
+    shard_names = {}
+    for key, shard in shards.items():
+        name, files_entry = write_artifact(out_dir, f"search.{key}", shard)
+        files[name] = files_entry
+        shard_names[key] = name
+    shard_bytes = sorted(files[name]["bytes"] for name in shard_names.values())
+    print(
+        f"[publish] search: {len(documents)} documents, {len(shards)} shards "
+        f"(largest {shard_bytes[-1] if shard_bytes else 0} bytes)"
+    )
+    return {"docs": docs_name, "shards": shard_names, "count": len(documents)}
+
+
+def publish_latest(loaded: Dict[str, Artifact], out_dir: Path, page_size: int, files: Dict[str, Dict]) -> Dict:
+    dated, pages = build_latest(loaded, page_size)
+    page_names = []
+    for number, page in enumerate(pages):
+        name, files_entry = write_artifact(out_dir, f"latest.page-{number}", page)
+        files[name] = files_entry
+        page_names.append(name)
+    count = sum(len(page) for page in pages)
+    print(f"[publish] latest: {count} records ({dated} dated) in {len(pages)} pages")
+    return {"pages": page_names, "page_size": page_size, "count": count, "dated": dated}
+
+
+def prune(out_dir: Path, keep: List[str]) -> int:
+    """manifest에 더 이상 없는 파일(과 압축 파일)을 지운다."""
+    keep_names = set(keep)
+    removed = 0
+    for path in out_dir.iterdir():
+        base = path.name
+        for suffix in (".gz", ".br"):
+            if base.endswith(suffix):
+                base = base[: -len(suffix)]
+        if base == MANIFEST_NAME or base in keep_names or not base.endswith(".json"):
+            continue
+        if base.split(".", 1)[0] in SOURCE_FILES or base.startswith(("search.", "latest.")):
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def publish(
+    out_dir: Union[str, Path] = DEFAULT_OUTPUT_DIR,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    sources: Optional[Dict[str, str]] = None,
+    with_covers: bool = False,
+    cover_workers: int = covers.DEFAULT_WORKERS,
+    feed_page_size: int = DEFAULT_FEED_PAGE_SIZE,
+) -> Dict:
+    """JSON 파일이 있는 모든 소스의 게시 파일을 만들고 manifest를 쓴다.
+
+    목록은 첫 화면에 필요한 인덱스만 싣고 나머지는 필요할 때 받는 상세 샤드로 나눈다
+    (yes24는 출판사별, O'Reilly는 ``shard_size``권씩, Manning은 인덱스만). 파일 이름에
+    내용 해시를 넣어 영구히 캐시할 수 있게 하고, 페이지가 다시 확인할 파일은 manifest뿐이다.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest: Dict[str, Dict] = {"sources": {}, "files": {}}
+    loaded: Dict[str, Artifact] = {}
+    data_files: Dict[str, str] = {}
+    for source, data_file in (sources or SOURCE_FILES).items():
+        try:
+            loaded[source] = json.loads(Path(data_file).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            print(f"[publish] {source}: {data_file} not found, skipping")
+            continue
+        data_files[source] = data_file
+
+    thumbs = None
+    if with_covers:
+        if covers.available():
+            thumbs = covers.build(loaded, out_dir, cover_workers)
+        else:
+            print("[publish] Pillow is not installed; covers stay remote")
+
+    for source, data in loaded.items():
+        data_file = data_files[source]
+        entry = publish_source(source, data, out_dir, shard_size, manifest["files"], thumbs)
+        manifest["sources"][source] = entry
+        index = manifest["files"][entry["index"]]
+        legacy_bytes = Path(data_file).stat().st_size
+        print(
+            f"[publish] {source}: {entry['count']} records, index {index['bytes']} bytes "
+            f"(gzip {index['gzip_bytes']}) vs {legacy_bytes} bytes in {data_file}, "
+            f"{len(entry['details'])} detail shards"
+        )
+    manifest["search"] = publish_search(loaded, out_dir, manifest["files"])
+    if thumbs:
+        prefix = f"{out_dir.name}/"
+        feed_data = {source: covers.rewrite(source, data, thumbs, prefix) for source, data in loaded.items()}
+    else:
+        feed_data = loaded
+    manifest["latest"] = publish_latest(feed_data, out_dir, feed_page_size, manifest["files"])
+    # 매니페스트를 마지막에 바꿔야 새 파일이 모두 준비된 뒤에 페이지가 가리킨다
+    _write_atomic(out_dir / MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    removed = prune(out_dir, list(manifest["files"]))
+    if thumbs is not None:
+        removed += covers.prune(out_dir, thumbs)
+    if removed:
+        print(f"[publish] removed {removed} stale files")
+    return manifest
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Write minified, sharded and precompressed data files for the site")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUTPUT_DIR, help="output directory")
+    parser.add_argument(
+        "--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="O'Reilly books per detail shard"
+    )
+    parser.add_argument(
+        "--feed-page-size", type=int, default=DEFAULT_FEED_PAGE_SIZE, help="records per page of the latest feed"
+    )
+    parser.add_argument("--covers", action="store_true", help="download covers and publish WebP thumbnails")
+    parser.add_argument(
+        "--cover-workers", type=int, default=covers.DEFAULT_WORKERS, help="concurrent cover downloads"
+    )
+    args = parser.parse_args(argv)
+    if brotli is None:
+        print("[publish] brotli is not installed; writing .gz siblings only")
+    publish(
+        args.out,
+        max(1, args.shard_size),
+        with_covers=args.covers,
+        cover_workers=max(1, args.cover_workers),
+        feed_page_size=max(1, args.feed_page_size),
+    )
+
+
+if __name__ == "__main__":
+    main()
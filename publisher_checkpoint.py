@@ -0,0 +1,61 @@
+import json
+import os
+import shutil
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+DEFAULT_CHECKPOINT_ROOT = Path(".checkpoints") / "newbooks"
+
+
+class PublisherCheckpoint:
+    """출판사별 수집 결과를 끝나는 즉시 디스크에 기록하는 체크포인트.
+
+    ``<root>/<YYYY-MM-DD>/<출판사 id>.json``에 출판사 하나씩 저장하므로, 재시도나
+    같은 날의 새 실행은 체크포인트가 없는 출판사만 다시 수집하면 된다. 다른 날짜의
+    체크포인트는 오래된 데이터이므로 열 때 지운다.
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_CHECKPOINT_ROOT, run_date: Optional[date] = None) -> None:
+        self.root = Path(root)
+        self.path = self.root / (run_date or date.today()).isoformat()
+        self._prune_stale_runs()
+
+    def _prune_stale_runs(self) -> None:
+        if not self.root.is_dir():
+            return
+        for entry in self.root.iterdir():
+            if entry.is_dir() and entry != self.path:
+                shutil.rmtree(entry, ignore_errors=True)
+
+    def _file(self, publisher_id: str) -> Path:
+        return self.path / f"{publisher_id}.json"
+
+    def load(self, publisher_id: str) -> Optional[List[Dict[str, str]]]:
+        """저장된 도서 목록, 없거나 읽을 수 없으면 None."""
+        try:
+            data = json.loads(self._file(publisher_id).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            print(f"Ignoring unreadable checkpoint for publisher {publisher_id}: {exc}")
+            return None
+        books = data.get("books") if isinstance(data, dict) else None
+        return books if isinstance(books, list) else None
+
+    def store(self, publisher_id: str, publisher_name: str, books: List[Dict[str, str]]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        target = self._file(publisher_id)
+        tmp_path = target.with_name(target.name + ".tmp")
+        payload = {"publisher": publisher_name, "books": books}
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, target)
+
+    def clear(self) -> None:
+        """최종 병합이 끝난 뒤 이번 실행의 체크포인트를 지운다."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def __len__(self) -> int:
+        if not self.path.is_dir():
+            return 0
+        return sum(1 for _ in self.path.glob("*.json"))
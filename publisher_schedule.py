@@ -0,0 +1,194 @@
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import release_dates
+
+DEFAULT_SCHEDULE_PATH = Path(".cache") / "publisher_schedule.json"
+SCHEDULE_VERSION = 1
+DAY = 24 * 60 * 60
+# 하루 두 번 실행되므로 이보다 짧은 간격은 "매 실행"과 같다
+MIN_INTERVAL = 0.25 * DAY
+MAX_INTERVAL = 14 * DAY
+# 신간 간격의 이 비율마다 확인한다 (신간이 나온 뒤 늦어도 간격의 1/4 안에 잡힌다)
+POLL_FRACTION = 0.25
+# 마지막 신간 이후 조용했던 기간의 이 비율만큼은 확인 간격을 늘린다
+DORMANT_FRACTION = 0.25
+RATE_WINDOW_DAYS = 180
+EMA_ALPHA = 0.3
+KNOWN_LIMIT = 100
+# 아직 관찰하지 못한 출판사 하나를 도는 데 걸린다고 보는 시간
+DEFAULT_PUBLISHER_SECONDS = 60.0
+
+Publisher = Dict[str, str]
+
+
+def _ema(previous: Optional[float], value: float) -> float:
+    return value if previous is None else previous + EMA_ALPHA * (value - previous)
+
+
+def _release_times(books: List[Dict]) -> List[float]:
+    """도서 목록의 출간일(release_iso 또는 원래 문자열)을 epoch 초로."""
+    times = []
+    for book in books:
+        released = release_dates.to_date(book.get("release_iso") or book.get("release_date"))
+        if released is not None:
+            times.append(datetime(released.year, released.month, released.day).timestamp())
+    return times
+
+
+class PublisherSchedule:
+    """출판사별 신간 빈도를 기억해 이번 실행에 수집할 출판사와 순서를 정하는 스케줄러.
+
+    출판사마다 마지막으로 수집한 시각, 하루당 신간 수(목록의 출간일로 추정한
+    지수 이동 평균), 마지막 신간이 나온 시각, 한 번 수집하는 데 걸린 시간을
+    ``.cache/publisher_schedule.json``에 기록한다. 확인 간격은 신간 간격의
+    ``POLL_FRACTION``이고 ``MIN_INTERVAL``~``MAX_INTERVAL`` 사이로 제한하며,
+    마지막 신간 이후 오래 조용한 출판사는 그만큼 더 드물게 확인한다.
+
+    :meth:`plan`은 (지난 수집 후 경과 시간 / 확인 간격)이 1 이상인 출판사를 이
+    값이 큰 순서로 고르고, 시간 예산이 있으면 예상 소요 시간의 합이 예산 안에
+    들어오는 만큼만 고른다. 한 번도 수집하지 않은 출판사가 가장 먼저다.
+    """
+
+    def __init__(
+        self, path: Union[str, Path] = DEFAULT_SCHEDULE_PATH, save_path: Optional[Union[str, Path]] = None
+    ) -> None:
+        self.path = Path(path)
+        # 샤드는 공유 스케줄을 읽기만 하고 자기 기록은 부분 결과 옆(save_path)에 쓴다
+        self.save_path = Path(save_path) if save_path is not None else self.path
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            print(f"Ignoring unreadable publisher schedule {self.path}: {exc}")
+            return
+        if isinstance(data, dict) and data.get("version") == SCHEDULE_VERSION and isinstance(data.get("publishers"), dict):
+            self._entries = data["publishers"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def interval(self, publisher_id: str, now: Optional[float] = None) -> float:
+        """이 출판사를 다시 확인하기까지의 간격(초)."""
+        now = time.time() if now is None else now
+        entry = self._entries.get(publisher_id) or {}
+        rate = entry.get("rate") or 0.0
+        interval = MAX_INTERVAL if rate <= 0 else POLL_FRACTION * DAY / rate
+        if entry.get("last_new_at"):
+            interval = max(interval, DORMANT_FRACTION * (now - entry["last_new_at"]))
+        return min(max(interval, MIN_INTERVAL), MAX_INTERVAL)
+
+    def priority(self, publisher_id: str, now: Optional[float] = None) -> float:
+        """1 이상이면 확인할 때가 된 것이다. 한 번도 수집하지 않았으면 무한대."""
+        now = time.time() if now is None else now
+        entry = self._entries.get(publisher_id)
+        if not entry or not entry.get("polled_at"):
+            return math.inf
+        return (now - entry["polled_at"]) / self.interval(publisher_id, now)
+
+    def estimated_seconds(self, publisher_id: str) -> float:
+        entry = self._entries.get(publisher_id) or {}
+        return entry.get("seconds") or DEFAULT_PUBLISHER_SECONDS
+
+    def plan(
+        self,
+        publishers: List[Publisher],
+        time_budget: Optional[float] = None,
+        workers: int = 1,
+        now: Optional[float] = None,
+    ) -> Tuple[List[Publisher], List[Publisher]]:
+        """(이번에 수집할 출판사를 우선순위 순서로, 건너뛸 출판사를 원래 순서로) 돌려준다.
+
+        time_budget(초)은 워커 수만큼 나눠 쓴다고 보고 예상 소요 시간으로 채운다.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            scored = [(self.priority(publisher["id"], now), position, publisher)
+                      for position, publisher in enumerate(publishers)]
+            scored.sort(key=lambda item: (-item[0], item[1]))
+            capacity = time_budget * max(1, workers) if time_budget else None
+            used = 0.0
+            crawl = []
+            for score, _, publisher in scored:
+                if score < 1:
+                    break
+                cost = self.estimated_seconds(publisher["id"])
+                # 예산이 있어도 가장 급한 출판사 하나는 수집한다
+                if capacity is not None and crawl and used + cost > capacity:
+                    continue
+                used += cost
+                crawl.append(publisher)
+        chosen = {publisher["id"] for publisher in crawl}
+        skipped = [publisher for publisher in publishers if publisher["id"] not in chosen]
+        return crawl, skipped
+
+    def record(self, publisher: Publisher, books: List[Dict], seconds: float, now: Optional[float] = None) -> None:
+        """수집 결과로 신간 빈도, 마지막 신간 시각, 소요 시간을 갱신한다."""
+        now = time.time() if now is None else now
+        goods = [book["goods_no"] for book in books if book.get("goods_no")]
+        released = _release_times(books)
+        window_start = now - RATE_WINDOW_DAYS * DAY
+        recent = [value for value in released if value >= window_start]
+        # 목록에 보이는 도서가 모두 최근 것이면 목록 길이 때문에 잘린 것이므로 가장 오래된 것까지로 잰다
+        covered_days = RATE_WINDOW_DAYS
+        if recent and len(recent) == len(released):
+            covered_days = max(1.0, (now - min(recent)) / DAY)
+        observed_rate = len(recent) / covered_days
+
+        with self._lock:
+            entry = self._entries.setdefault(publisher["id"], {})
+            known = entry.get("known") or []
+            last_new_at = entry.get("last_new_at")
+            if released:
+                last_new_at = max(last_new_at or 0, min(max(released), now))
+            if known and any(goods_no not in known for goods_no in goods):
+                # 출간일이 없더라도 처음 보는 도서가 나타났으면 신간으로 본다
+                last_new_at = now
+            entry.update({
+                "name": publisher["name"],
+                "polled_at": now,
+                "last_new_at": last_new_at,
+                "rate": _ema(entry.get("rate"), observed_rate),
+                "seconds": _ema(entry.get("seconds"), seconds),
+                "known": (goods + [goods_no for goods_no in known if goods_no not in goods])[:KNOWN_LIMIT],
+            })
+
+    def update(self, other: "PublisherSchedule", publisher_ids: Iterable[str]) -> None:
+        """publisher_ids의 항목을 other에 기록된 것으로 바꾼다 (샤드 병합용)."""
+        with self._lock, other._lock:
+            for publisher_id in publisher_ids:
+                if publisher_id in other._entries:
+                    self._entries[publisher_id] = other._entries[publisher_id]
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"version": SCHEDULE_VERSION, "publishers": self._entries}
+
+        self.save_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.save_path.with_name(self.save_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.save_path)
+
+    def report(self, crawl: List[Publisher], skipped: List[Publisher], now: Optional[float] = None) -> str:
+        now = time.time() if now is None else now
+        summary = f"Publisher schedule: crawling {len(crawl)}, skipping {len(skipped)}"
+        due_in = [
+            self._entries[publisher["id"]]["polled_at"] + self.interval(publisher["id"], now) - now
+            for publisher in skipped
+            if (self._entries.get(publisher["id"]) or {}).get("polled_at")
+        ]
+        if due_in:
+            summary += f" (next due in {max(0.0, min(due_in)) / 3600:.1f} hours)"
+        return summary
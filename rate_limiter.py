@@ -0,0 +1,219 @@
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional
+
+import run_report
+
+# 이 상태 코드는 서버가 부하를 받고 있다는 신호로 보고 속도를 줄인다
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+# Retry-After가 너무 길면 실행 전체가 멈추지 않도록 상한을 둔다
+MAX_RETRY_AFTER = 120.0
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """``Retry-After`` 헤더(초 또는 HTTP 날짜)에 따라 기다릴 시간 (초)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return min(max(0.0, retry_at - (now if now is not None else time.time())), MAX_RETRY_AFTER)
+
+
+class Slot:
+    """요청 한 번의 결과. 호출한 쪽이 채운다."""
+
+    def __init__(self) -> None:
+        self.ok = True
+        self.reason = ""
+        self.retry_after: Optional[float] = None
+
+    def fail(self, reason: str) -> None:
+        self.ok = False
+        self.reason = reason
+
+    def observe(self, response) -> None:
+        """``requests`` 응답을 기록한다 (urllib3가 대신 재시도한 요청 포함)."""
+        retries = getattr(getattr(response, "raw", None), "retries", None)
+        history = getattr(retries, "history", None) or ()
+        throttled = [entry.status for entry in history if entry.status in THROTTLE_STATUSES]
+        if response.status_code in THROTTLE_STATUSES:
+            self.fail(f"HTTP {response.status_code}")
+        elif throttled:
+            self.fail(f"HTTP {throttled[-1]} (retried)")
+        self.retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+
+class HostLimiter:
+    """호스트 하나의 토큰 버킷과 동시 요청 상한 (스레드 안전).
+
+    정상 응답이 한 창(window)만큼 이어지면 상한과 속도를 조금씩 올리고, 오류나
+    제한 응답, 느린 응답이 오면 둘 다 절반으로 줄인다 (AIMD). ``Retry-After``를
+    받으면 그 시각까지 호스트 전체를 멈춘다.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        rate: float = 5.0,
+        min_rate: float = 0.5,
+        max_rate: float = 50.0,
+        rate_step: float = 1.0,
+        concurrency: int = 4,
+        max_concurrency: int = 16,
+        slow_after: float = 5.0,
+    ) -> None:
+        self.host = host
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate_step = rate_step
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.slow_after = slow_after
+        self.in_flight = 0
+        self._tokens = 1.0
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._healthy_streak = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        # 버스트는 동시 요청 수만큼만 허용한다
+        capacity = max(1.0, float(self.concurrency))
+        self._tokens = min(capacity, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def acquire(self, held: int = 0) -> bool:
+        """자리가 날 때까지 기다린다. 호출한 쪽이 이미 ``held``개를 쥐고 있어 상한이 찼으면 바로 ``False``.
+
+        여러 탭처럼 자리를 동시에 여러 개 쥐는 쪽은 쥔 개수를 넘겨, 백오프로 상한이
+        줄었을 때 자기 자리를 기다리며 멈추지 않게 한다.
+        """
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if held and held >= self.concurrency:
+                    return False
+                if now < self._paused_until:
+                    self._cond.wait(self._paused_until - now)
+                elif self.in_flight >= self.concurrency:
+                    self._cond.wait()
+                elif self._tokens < 1:
+                    self._cond.wait((1 - self._tokens) / self.rate)
+                else:
+                    self._tokens -= 1
+                    self.in_flight += 1
+                    break
+        waited = time.monotonic() - start
+        if waited > 0.001:
+            run_report.current().add("rate_wait", waited, host=self.host)
+        return True
+
+    def release(
+        self,
+        latency: float,
+        ok: bool,
+        reason: str = "",
+        retry_after: Optional[float] = None,
+        slow_after: Optional[float] = None,
+    ) -> None:
+        slow_after = slow_after or self.slow_after
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+                print(f"[rate] {self.host}: pausing {retry_after:.1f}s (Retry-After)")
+                run_report.count("rate_pauses")
+            if not ok or latency > slow_after:
+                self._decrease(now, reason or f"slow response {latency:.1f}s")
+            else:
+                self._increase()
+            self._cond.notify_all()
+
+    def _increase(self) -> None:
+        self._healthy_streak += 1
+        if self._healthy_streak < self.concurrency:
+            return
+        # 동시 요청 수만큼 연속으로 정상 응답을 받으면 한 단계 올린다
+        self._healthy_streak = 0
+        if self.concurrency >= self.max_concurrency and self.rate >= self.max_rate:
+            return
+        old_concurrency, old_rate = self.concurrency, self.rate
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+        self.rate = min(self.max_rate, self.rate + self.rate_step)
+        print(
+            f"[rate] {self.host}: healthy, concurrency {old_concurrency} -> {self.concurrency}, "
+            f"rate {old_rate:.1f} -> {self.rate:.1f} req/s"
+        )
+        run_report.count("rate_increases")
+
+    def _decrease(self, now: float, reason: str) -> None:
+        self._healthy_streak = 0
+        # 같은 혼잡 구간에서 실패가 몰려도 한 번만 줄인다
+        if now - self._last_decrease < self.slow_after:
+            return
+        self._last_decrease = now
+        old_concurrency, old_rate = self.concurrency, self.rate
+        self.concurrency = max(1, self.concurrency // 2)
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = min(self._tokens, 0.0)
+        print(
+            f"[rate] {self.host}: backing off ({reason}), concurrency {old_concurrency} -> {self.concurrency}, "
+            f"rate {old_rate:.1f} -> {self.rate:.1f} req/s"
+        )
+        run_report.count("rate_backoffs")
+
+    @contextmanager
+    def request(self, slow_after: Optional[float] = None) -> Iterator[Slot]:
+        """자리를 얻어 ``with`` 블록에서 요청하고, 그 결과를 속도 조절에 반영한다.
+
+        블록 밖으로 나간 예외는 실패한 요청으로 친다. ``slow_after``는 브라우저 페이지
+        로드처럼 느린 요청에 쓸 지연 기준이다.
+        """
+        self.acquire()
+        slot = Slot()
+        start = time.monotonic()
+        try:
+            yield slot
+        except Exception as exc:
+            slot.fail(type(exc).__name__)
+            raise
+        finally:
+            self.release(time.monotonic() - start, slot.ok, slot.reason, slot.retry_after, slow_after)
+
+
+_limiters: Dict[str, HostLimiter] = {}
+_settings: Dict[str, Dict] = {}
+_registry_lock = threading.Lock()
+
+
+def host_of(url: str) -> str:
+    return urllib.parse.urlsplit(url).netloc
+
+
+def configure(url: str, **settings) -> None:
+    """``url`` 호스트의 :class:`HostLimiter` 설정. 아직 만들어지지 않은 limiter에만 적용된다."""
+    with _registry_lock:
+        _settings[host_of(url)] = settings
+
+
+def for_url(url: str) -> HostLimiter:
+    """``url`` 호스트가 함께 쓰는 limiter."""
+    host = host_of(url)
+    with _registry_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = HostLimiter(host, **_settings.get(host, {}))
+        return limiter
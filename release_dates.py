@@ -0,0 +1,72 @@
+import re
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+# yes24 "2025년 06월 05일", O'Reilly "July 2027"/"Jan 5, 2025", API "2025-06-05T00:00:00Z"
+_KOREAN_DATE = re.compile(r"(\d{4})년\s*(\d{1,2})월(?:\s*(\d{1,2})일)?")
+_ISO_DATE = re.compile(r"\b(\d{4})-(\d{2})(?:-(\d{2}))?")
+_ENGLISH_DATE = re.compile(r"([A-Za-z]+)\.?\s+(?:(\d{1,2}),\s*)?(\d{4})")
+MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",),
+         ("jun", "june"), ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"),
+         ("oct", "october"), ("nov", "november"), ("dec", "december")],
+        start=1,
+    )
+    for name in names
+}
+
+
+def parse(text: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    """``text``의 첫 날짜의 ``(연, 월, 일 또는 None)``. 없으면 None."""
+    text = text or ""
+    match = _KOREAN_DATE.search(text) or _ISO_DATE.search(text)
+    if match:
+        year, month, day = match.group(1), match.group(2), match.group(3)
+    else:
+        match = _ENGLISH_DATE.search(text)
+        if not match or match.group(1).lower() not in MONTHS:
+            return None
+        year, month, day = match.group(3), MONTHS[match.group(1).lower()], match.group(2)
+    try:
+        # 존재하지 않는 날짜(2월 30일 등)는 버린다
+        date(int(year), int(month), int(day or 1))
+    except ValueError:
+        return None
+    return int(year), int(month), int(day) if day else None
+
+
+def to_iso(text: Optional[str]) -> Optional[str]:
+    parts = parse(text)
+    if parts is None:
+        return None
+    year, month, day = parts
+    return f"{year:04d}-{month:02d}-{day:02d}" if day else f"{year:04d}-{month:02d}"
+
+
+def to_date(text: Optional[str]) -> Optional[date]:
+    """``text``의 날짜. 일이 없으면 그 달 1일."""
+    parts = parse(text)
+    if parts is None:
+        return None
+    year, month, day = parts
+    return date(year, month, day or 1)
+
+
+def sort_key(iso: Optional[str]) -> int:
+    if not iso:
+        return 0
+    return int((iso.replace("-", "") + "00")[:8])
+
+
+def annotate(record: Dict, text: Optional[str]) -> Dict:
+    """원래 날짜 ``text``로 ``record``에 ``release_iso``와 ``release_sort``를 넣는다.
+
+    ``release_iso``는 ``"YYYY-MM-DD"``(월까지만 알면 ``"YYYY-MM"``, 모르면 None),
+    ``release_sort``는 ``YYYYMMDD`` 정수(월만 알면 일이 00, 모르면 0)라 내림차순이면 최신순이다.
+    """
+    iso = to_iso(text)
+    record["release_iso"] = iso
+    record["release_sort"] = sort_key(iso)
+    return record
@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import os
+import shlex
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent
+# SIGTERM 후 프로세스 그룹이 스스로 정리되기를 기다리는 시간 (초)
+KILL_GRACE_SECONDS = 5
+# source -> (script, output file, default timeout in seconds)
+SOURCES = {
+    "yes24": ("newbooks.py", "books_data.json", 3600),
+    "oreilly": ("oreilly_scraper.py", "oreilly_books.json", 900),
+    "manning": ("manning_fetch.py", "manning_books.json", 300),
+}
+
+
+def parse_timeouts(values: List[str]) -> Dict[str, float]:
+    """``["yes24=1800", ...]`` -> 소스별 제한 시간 (지정하지 않은 소스는 기본값)."""
+    timeouts = {name: float(spec[2]) for name, spec in SOURCES.items()}
+    for value in values:
+        name, sep, seconds = value.partition("=")
+        if not sep or name not in SOURCES:
+            raise argparse.ArgumentTypeError(f"Invalid --timeout {value!r}; expected SOURCE=SECONDS")
+        timeouts[name] = float(seconds)
+    return timeouts
+
+
+async def _run_subprocess(name: str, args: List[str], timeout: float) -> str:
+    # 스크레이퍼마다 프로세스를 따로 띄우므로 제한 시간을 넘긴 소스는 프로세스째 종료된다
+    script = SOURCES[name][0]
+    # 새 세션(프로세스 그룹)으로 띄워 chromedriver와 Chrome까지 그룹째 종료할 수 있게 한다
+    process = await asyncio.create_subprocess_exec(sys.executable, str(ROOT / script), *args, start_new_session=True)
+    try:
+        returncode = await asyncio.wait_for(process.wait(), timeout)
+    except asyncio.TimeoutError:
+        await _terminate_group(process)
+        return "timeout"
+    return "ok" if returncode == 0 else f"exit {returncode}"
+
+
+def _signal_group(process: asyncio.subprocess.Process, signum: int) -> None:
+    try:
+        os.killpg(process.pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+async def _terminate_group(process: asyncio.subprocess.Process) -> None:
+    """자식의 프로세스 그룹 전체에 SIGTERM을 보내고, 유예 시간 뒤 남은 프로세스는 SIGKILL로 정리한다."""
+    _signal_group(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), KILL_GRACE_SECONDS)
+    except asyncio.TimeoutError:
+        pass
+    # 스크레이퍼가 먼저 끝나도 그룹에 남은 브라우저가 있을 수 있으므로 항상 SIGKILL로 마무리한다
+    _signal_group(process, signal.SIGKILL)
+    await process.wait()
+
+
+async def run_source(name: str, args: List[str], timeout: float, budget: asyncio.Semaphore) -> Dict:
+    async with budget:
+        print(f"[{name}] started")
+        start = time.perf_counter()
+        status = await _run_subprocess(name, args, timeout)
+        elapsed = time.perf_counter() - start
+    print(f"[{name}] {status} after {elapsed:.1f}s")
+    return {"source": name, "status": status, "seconds": round(elapsed, 1), "output": SOURCES[name][1]}
+
+
+async def run_all(sources: List[str], source_args: Dict[str, List[str]], timeouts: Dict[str, float], max_parallel: int) -> List[Dict]:
+    # 동시에 실행할 소스 수만 제한한다. 요청 동시성은 각 스크레이퍼가 스스로 조절한다
+    budget = asyncio.Semaphore(max_parallel)
+    return await asyncio.gather(*(run_source(name, source_args[name], timeouts[name], budget) for name in sources))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run all book scrapers concurrently")
+    parser.add_argument("--sources", default=",".join(SOURCES), help="comma-separated subset of " + ", ".join(SOURCES))
+    parser.add_argument("--max-parallel", type=int, default=len(SOURCES), help="sources allowed to run at the same time (not a request limit)")
+    parser.add_argument("--timeout", action="append", default=[], metavar="SOURCE=SECONDS", help="per-source timeout (repeatable)")
+    for name in SOURCES:
+        parser.add_argument(f"--{name}-args", default="", help=f"extra arguments for the {name} scraper")
+    args = parser.parse_args(argv)
+
+    sources = [source.strip() for source in args.sources.split(",") if source.strip()]
+    unknown = [source for source in sources if source not in SOURCES]
+    if unknown:
+        parser.error(f"unknown source(s): {', '.join(unknown)}")
+    try:
+        timeouts = parse_timeouts(args.timeout)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+    source_args = {name: shlex.split(getattr(args, f"{name}_args")) for name in SOURCES}
+
+    start = time.perf_counter()
+    results = asyncio.run(run_all(sources, source_args, timeouts, max(1, args.max_parallel)))
+    total = time.perf_counter() - start
+
+    print(f"\n{'source':<10} {'status':<10} {'seconds':>8}  output")
+    for row in results:
+        print(f"{row['source']:<10} {row['status']:<10} {row['seconds']:>8.1f}  {row['output']}")
+    print(f"{'total':<10} {'':<10} {total:>8.1f}")
+    return 0 if all(row["status"] == "ok" for row in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
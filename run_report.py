@@ -0,0 +1,274 @@
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar, Union
+
+PROFILE_ENV = "SCRAPER_PROFILE"
+PERCENTILES = (50, 90, 95, 99)
+HOT_FUNCTION_LIMIT = 25
+SLOWEST_SPAN_LIMIT = 20
+
+T = TypeVar("T")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """``values``의 백분위수 (선형 보간, 정렬되지 않아도 된다)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def report_path_for(data_path: Union[str, Path]) -> Path:
+    data_path = Path(data_path)
+    return data_path.with_name(f"{data_path.stem}.report.json")
+
+
+class RunRecorder:
+    """스크레이퍼 한 번 실행의 단계별 소요 시간과 카운터를 모은다 (스레드 안전)."""
+
+    def __init__(self, source: str, profile: bool = False) -> None:
+        self.source = source
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._spans: List[Dict] = []
+        self.counters: Dict[str, float] = {}
+        self.notes: Dict[str, object] = {}
+        self.profile = profile
+        self._profiler: Optional[cProfile.Profile] = None
+        # cProfile은 enable()을 부른 스레드만 측정하므로 작업 스레드의 결과는 따로 모아 합친다
+        self._thread_profilers: List[cProfile.Profile] = []
+        self._profiling = threading.local()
+        self._profiled_thread = threading.get_ident()
+        if profile:
+            tracemalloc.start(10)
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def add(self, phase: str, duration: float, **tags: object) -> None:
+        record = {"phase": phase, "duration": duration}
+        if tags:
+            record["tags"] = tags
+        with self._lock:
+            self._spans.append(record)
+
+    @contextmanager
+    def span(self, phase: str, **tags: object) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            tags["error"] = True
+            raise
+        finally:
+            self.add(phase, time.perf_counter() - start, **tags)
+
+    def count(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def note(self, key: str, value: object) -> None:
+        """수치를 해석하는 데 필요한 설정(무엇을 차단했는지 등)을 기록한다."""
+        with self._lock:
+            self.notes[key] = value
+
+    @contextmanager
+    def profile_thread(self) -> Iterator[None]:
+        """이 스레드에서 블록이 실행되는 동안 cProfile로 측정한다 (프로파일 실행이 아니거나 이미 측정 중이면 그대로)."""
+        if self._profiler is None or threading.get_ident() == self._profiled_thread or getattr(
+            self._profiling, "active", False
+        ):
+            yield
+            return
+        profiler = cProfile.Profile()
+        self._profiling.active = True
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self._profiling.active = False
+            with self._lock:
+                self._thread_profilers.append(profiler)
+
+    def phase_summary(self) -> Dict[str, Dict[str, float]]:
+        grouped: Dict[str, List[float]] = {}
+        with self._lock:
+            for record in self._spans:
+                grouped.setdefault(record["phase"], []).append(record["duration"])
+
+        summary = {}
+        for phase, durations in sorted(grouped.items()):
+            stats = {
+                "count": len(durations),
+                "total": round(sum(durations), 4),
+                "min": round(min(durations), 4),
+                "max": round(max(durations), 4),
+                "mean": round(sum(durations) / len(durations), 4),
+            }
+            for pct in PERCENTILES:
+                stats[f"p{pct}"] = round(percentile(durations, pct), 4)
+            summary[phase] = stats
+        return summary
+
+    def _profile_summary(self) -> Dict:
+        result: Dict = {}
+        if self._profiler is not None:
+            self._profiler.disable()
+            stats = pstats.Stats(self._profiler)
+            with self._lock:
+                thread_profilers, self._thread_profilers = self._thread_profilers, []
+            for profiler in thread_profilers:
+                stats.add(profiler)
+            hot = []
+            for (filename, line, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+                hot.append({
+                    "function": f"{Path(filename).name}:{line}({func})",
+                    "calls": ncalls,
+                    "tottime": round(tottime, 4),
+                    "cumtime": round(cumtime, 4),
+                })
+            hot.sort(key=lambda item: item["cumtime"], reverse=True)
+            result["hot_functions"] = hot[:HOT_FUNCTION_LIMIT]
+            self._profiler = None
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result["memory"] = {
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top_allocations": [
+                    {"location": str(stat.traceback[0]), "size_bytes": stat.size, "count": stat.count}
+                    for stat in snapshot.statistics("lineno")[:HOT_FUNCTION_LIMIT]
+                ],
+            }
+        return result
+
+    def build_report(self, previous: Optional[Dict] = None) -> Dict:
+        wall_time = time.perf_counter() - self._start
+        with self._lock:
+            slowest = sorted(self._spans, key=lambda record: record["duration"], reverse=True)[:SLOWEST_SPAN_LIMIT]
+            counters = dict(self.counters)
+            notes = dict(self.notes)
+
+        report = {
+            "source": self.source,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "wall_time": round(wall_time, 4),
+            "phases": self.phase_summary(),
+            "counters": counters,
+            "notes": notes,
+            "slowest_spans": [dict(record, duration=round(record["duration"], 4)) for record in slowest],
+        }
+        if self.profile:
+            report["profile"] = self._profile_summary()
+        if previous:
+            report["compared_to_previous"] = compare_reports(previous, report)
+        return report
+
+    def write(self, data_path: Union[str, Path]) -> Path:
+        path = report_path_for(data_path)
+        previous = None
+        try:
+            previous = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+        report = self.build_report(previous)
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+def compare_reports(previous: Dict, current: Dict) -> Dict:
+    """전체 시간, 단계별 p50/p95, 카운터의 이전 실행 대비 변화량 (현재 - 이전)."""
+    phases = {}
+    for phase, stats in current.get("phases", {}).items():
+        before = previous.get("phases", {}).get(phase)
+        if not before:
+            continue
+        phases[phase] = {
+            key: round(stats[key] - before.get(key, 0), 4) for key in ("p50", "p95", "total")
+        }
+    counters = {
+        name: round(value - previous["counters"][name], 4)
+        for name, value in current.get("counters", {}).items()
+        if name in previous.get("counters", {})
+    }
+    return {
+        "previous_started_at": previous.get("started_at"),
+        "wall_time": round(current["wall_time"] - previous.get("wall_time", 0), 4),
+        "phases": phases,
+        "counters": counters,
+    }
+
+
+_current = RunRecorder("default")
+
+
+def start_run(source: str, profile: Optional[bool] = None) -> RunRecorder:
+    """새 실행 기록을 시작한다. ``profile``을 주지 않으면 SCRAPER_PROFILE 환경변수를 따른다."""
+    global _current
+    if profile is None:
+        profile = os.environ.get(PROFILE_ENV, "") not in ("", "0", "false")
+    _current = RunRecorder(source, profile=profile)
+    return _current
+
+
+def current() -> RunRecorder:
+    return _current
+
+
+def span(phase: str, **tags: object):
+    return _current.span(phase, **tags)
+
+
+def count(name: str, value: float = 1) -> None:
+    _current.count(name, value)
+
+
+def note(key: str, value: object) -> None:
+    _current.note(key, value)
+
+
+def profile_thread():
+    return _current.profile_thread()
+
+
+def profiled(func: Callable[..., T]) -> Callable[..., T]:
+    """``func``를 :func:`profile_thread` 안에서 실행하는 함수. 작업 스레드에 넘길 때 쓴다."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with profile_thread():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def sleep(seconds: float, reason: str = "") -> None:
+    """``sleep`` 단계로 기록되는 ``time.sleep``."""
+    with _current.span("sleep", reason=reason):
+        time.sleep(seconds)
+
+
+def finish_run(data_path: Union[str, Path]) -> Optional[Path]:
+    try:
+        path = _current.write(data_path)
+    except OSError as exc:
+        print(f"Failed to write run report: {exc}")
+        return None
+    print(f"Run report written to {path}")
+    return path
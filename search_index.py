@@ -0,0 +1,88 @@
+import re
+import unicodedata
+from typing import Dict, List, Tuple, Union
+
+# 영어·숫자는 단어로, 한글은 겹치는 바이그램으로 색인한다 (search.html도 같은 규칙을 쓴다)
+TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-z0-9]+")
+HANGUL_BASE = 0xAC00
+# 초성 하나당 음절 수 (중성 21 x 종성 28)
+SYLLABLES_PER_INITIAL = 588
+
+Document = List[str]
+Shard = Dict[str, Dict[str, List[int]]]
+
+
+def tokenize(text: str) -> List[str]:
+    """``text``의 검색어 (나온 순서, 중복 없이). 한 음절짜리 한글은 그대로 둔다."""
+    terms: Dict[str, None] = {}
+    for run in TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", text or "").lower()):
+        if "가" <= run[0] <= "힣":
+            if len(run) == 1:
+                terms[run] = None
+            for start in range(len(run) - 1):
+                terms[run[start:start + 2]] = None
+        else:
+            terms[run] = None
+    return list(terms)
+
+
+def shard_key(term: str) -> str:
+    first = term[0]
+    if "가" <= first <= "힣":
+        return f"ko-{(ord(first) - HANGUL_BASE) // SYLLABLES_PER_INITIAL:02d}"
+    return f"en-{first}"
+
+
+def _documents(source: str, data: Union[Dict, List]) -> List[Tuple[Document, str, str]]:
+    """``source``의 레코드마다 ``(문서, 제목 텍스트, 설명 텍스트)``."""
+    if source == "yes24":
+        return [
+            (
+                [source, book.get("title", ""), f"{publisher} · {book.get('author', '')}", book.get("detail_url", "")],
+                f"{book.get('title', '')} {book.get('author', '')} {publisher}",
+                "",
+            )
+            for publisher, books in data.items()
+            for book in books
+        ]
+    if source == "oreilly":
+        return [
+            (
+                [source, book.get("title", ""), f"O'Reilly · {book.get('published_at', '')}", book.get("detail_link", "")],
+                book.get("title", ""),
+                book.get("description", ""),
+            )
+            for book in data
+        ]
+    return [
+        ([source, book.get("title", ""), "Manning", book.get("detail_link", "")], book.get("title", ""), "")
+        for book in data
+    ]
+
+
+def build(sources: Dict[str, Union[Dict, List]]) -> Tuple[List[Document], Dict[str, Shard]]:
+    """소스별 데이터의 문서 목록과 접두어 샤드.
+
+    샤드는 영어·숫자는 첫 글자, 한글은 첫 음절의 초성으로 나누고, 색인어마다 제목·저자·출판사에
+    있는 문서(``t``)와 설명에만 있는 문서(``d``)의 id를 담는다.
+    """
+    documents: List[Document] = []
+    shards: Dict[str, Shard] = {}
+    for source, data in sources.items():
+        for document, title_text, description_text in _documents(source, data):
+            doc_id = len(documents)
+            documents.append(document)
+            title_terms = tokenize(title_text)
+            in_title = set(title_terms)
+            for field, terms in (("t", title_terms), ("d", tokenize(description_text))):
+                for term in terms:
+                    if field == "d" and term in in_title:
+                        continue
+                    shard = shards.setdefault(shard_key(term), {"t": {}, "d": {}})
+                    shard[field].setdefault(term, []).append(doc_id)
+    # 같은 입력이면 같은 파일(같은 해시)이 나오도록 정렬한다
+    ordered = {
+        key: {field: dict(sorted(postings.items())) for field, postings in shard.items()}
+        for key, shard in sorted(shards.items())
+    }
+    return documents, ordered
@@ -0,0 +1,24 @@
+// publish.py가 만든 작은 목록 인덱스를 먼저 읽고, 없으면 원본 JSON을 읽는다
+async function loadSiteData(source, legacyFile) {
+  try {
+    const manifestResponse = await fetch('site_data/manifest.json', { cache: 'no-cache' });
+    if (manifestResponse.ok) {
+      const manifest = await manifestResponse.json();
+      const entry = manifest.sources && manifest.sources[source];
+      if (entry) {
+        const response = await fetch(`site_data/${entry.index}`);
+        if (!response.ok) {
+          throw new Error(`HTTP ${response.status}`);
+        }
+        return { data: await response.json(), entry };
+      }
+    }
+  } catch (error) {
+    console.warn(`Falling back to ${legacyFile}:`, error);
+  }
+  const response = await fetch(legacyFile);
+  if (!response.ok) {
+    throw new Error(`HTTP ${response.status}`);
+  }
+  return { data: await response.json(), entry: null };
+}
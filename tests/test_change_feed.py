@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+import change_feed
+import run_report
+
+BOOK = {
+    "title": "파이썬 입문",
+    "goods_no": "123",
+    "detail_url": "https://www.yes24.com/Product/Goods/123",
+    "sell_num": "1000",
+    "sell_num_at": "2025-06-01",
+}
+
+
+@pytest.fixture(autouse=True)
+def recorder():
+    return run_report.start_run("test", profile=False)
+
+
+def write(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+@pytest.mark.parametrize("source, record, key", [
+    ("yes24", BOOK, "123"),
+    ("yes24", dict(BOOK, goods_no=""), BOOK["detail_url"]),
+    ("yes24", {"title": "파이썬 입문", "publisher": "한빛미디어"}, "한빛미디어/파이썬 입문"),
+    ("oreilly", {"title": "Learning Python", "detail_link": "/library/view/learning-python/1/"}, "/library/view/learning-python/1/"),
+    ("manning", {"title": "Grokking Algorithms"}, "Grokking Algorithms"),
+])
+def test_record_key(source, record, key):
+    assert change_feed.record_key(source, record) == key
+
+
+def test_volatile_fields_do_not_count_as_changes():
+    old = change_feed.flatten("yes24", {"한빛미디어": [BOOK]})
+    new = change_feed.flatten("yes24", {"한빛미디어": [dict(BOOK, sell_num="2000", sell_num_at="2025-06-02")]})
+    delta = change_feed.diff_snapshots("yes24", old, new)
+    assert (delta["added"], delta["removed"], delta["changed"]) == ([], [], [])
+    assert delta["base"] == delta["snapshot"]
+
+    # 다른 소스에서는 같은 필드도 변경으로 본다
+    delta = change_feed.diff_snapshots("oreilly", {"1": dict(BOOK)}, {"1": dict(BOOK, sell_num="2000")})
+    assert delta["changed"] == [dict(BOOK, sell_num="2000")]
+
+
+def test_no_change_keeps_the_data_file(tmp_path, recorder):
+    output = tmp_path / "books_data.json"
+    write(output, {"한빛미디어": [BOOK]})
+    before = output.read_bytes()
+    staged = change_feed.staging_path(output)
+    write(staged, {"한빛미디어": [dict(BOOK, sell_num="2000")]})
+
+    assert change_feed.commit("yes24", output, tmp_path / "deltas") is None
+    assert output.read_bytes() == before
+    assert not staged.exists()
+    assert not (tmp_path / "deltas").exists()
+    assert recorder.notes["data_written"] is False
+
+
+def test_changes_replace_the_data_file_and_write_a_delta(tmp_path):
+    output = tmp_path / "books_data.json"
+    write(output, {"한빛미디어": [BOOK]})
+    added = dict(BOOK, goods_no="456", title="러스트 입문")
+    write(change_feed.staging_path(output), {"한빛미디어": [BOOK, added]})
+
+    delta = change_feed.commit("yes24", output, tmp_path / "deltas")
+    assert delta["added"] == [dict(added, publisher="한빛미디어")]
+    assert json.loads(output.read_text(encoding="utf-8")) == {"한빛미디어": [BOOK, added]}
+    index = json.loads((tmp_path / "deltas" / "yes24" / "index.json").read_text(encoding="utf-8"))
+    assert index["snapshot"] == delta["snapshot"]
+    assert [entry["added"] for entry in index["deltas"]] == [1]
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import crawl_shards
+import newbooks
+
+SHARDS = 2
+PUBLISHERS = [{"name": f"출판사{index}", "id": str(index)} for index in range(8)]
+
+
+def write_partials(root, shards):
+    root.mkdir(exist_ok=True)
+    for index, publishers in shards.items():
+        path = crawl_shards.partial_path(newbooks.OUTPUT_FILE, index, SHARDS, root)
+        data = {publisher["name"]: [{"title": f"{publisher['name']} 신간"}] for publisher in publishers}
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def owned():
+    return {index: crawl_shards.select(PUBLISHERS, index, SHARDS) for index in range(SHARDS)}
+
+
+def test_shards_split_the_publishers():
+    shards = owned()
+    assert all(shards.values())
+    assert sorted(publisher["id"] for publishers in shards.values() for publisher in publishers) == sorted(
+        publisher["id"] for publisher in PUBLISHERS
+    )
+
+
+def test_merge_keeps_the_publisher_order(tmp_path):
+    write_partials(tmp_path, owned())
+    merged = crawl_shards.merge(PUBLISHERS, SHARDS, newbooks.OUTPUT_FILE, tmp_path)
+    assert list(merged) == [publisher["name"] for publisher in PUBLISHERS]
+
+
+def test_merge_fails_on_a_missing_partial(tmp_path):
+    write_partials(tmp_path, {0: owned()[0]})
+    with pytest.raises(FileNotFoundError, match="shard-1-of-2"):
+        crawl_shards.merge(PUBLISHERS, SHARDS, newbooks.OUTPUT_FILE, tmp_path)
+
+
+def test_merge_fails_on_a_publisher_from_another_shard(tmp_path):
+    shards = owned()
+    stray = shards[1][0]
+    write_partials(tmp_path, {0: shards[0] + [stray], 1: shards[1]})
+    with pytest.raises(ValueError, match=stray["name"]):
+        crawl_shards.merge(PUBLISHERS, SHARDS, newbooks.OUTPUT_FILE, tmp_path)
+
+
+def test_failed_merge_leaves_the_data_file_and_partials(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    previous = {"출판사0": [{"title": "지난 신간"}]}
+    (tmp_path / newbooks.OUTPUT_FILE).write_text(json.dumps(previous, ensure_ascii=False), encoding="utf-8")
+    write_partials(tmp_path / "partials", {0: owned()[0]})
+
+    with pytest.raises(FileNotFoundError):
+        newbooks.merge_shards(SHARDS, tmp_path / "partials", PUBLISHERS)
+    assert json.loads((tmp_path / newbooks.OUTPUT_FILE).read_text(encoding="utf-8")) == previous
+    assert crawl_shards.partial_path(newbooks.OUTPUT_FILE, 0, SHARDS, tmp_path / "partials").exists()
@@ -0,0 +1,26 @@
+import json
+import time
+
+from detail_cache import CACHE_VERSION, DetailCache
+
+
+def test_stale_sell_num_keeps_release_date(tmp_path):
+    cache = DetailCache(tmp_path / "details.json", sell_num_ttl=60)
+    cache.store("1", "2025년 06월 05일", "1200")
+    assert cache.lookup("1") == ("2025년 06월 05일", "1200")
+
+    cache._entries["1"]["sell_num_at"] = time.time() - 120
+    assert cache.lookup("1") == ("2025년 06월 05일", None)
+    assert cache.peek("1") == ("2025년 06월 05일", "1200")
+    assert cache.lookup("2") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_non_object_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "details.json"
+    path.write_text(json.dumps([{"version": CACHE_VERSION}]), encoding="utf-8")
+    cache = DetailCache(path)
+    assert len(cache) == 0
+    cache.store("1", "2025년 06월 05일", "10")
+    cache.save()
+    assert DetailCache(path).lookup("1") == ("2025년 06월 05일", "10")
@@ -0,0 +1,13 @@
+import json
+
+from http_cache import CACHE_VERSION, HttpCache
+
+
+def test_non_object_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "manning.json"
+    path.write_text(json.dumps([{"version": CACHE_VERSION}]), encoding="utf-8")
+    cache = HttpCache(path)
+    assert len(cache) == 0
+    cache._dirty = True
+    cache.save()
+    assert len(HttpCache(path)) == 0
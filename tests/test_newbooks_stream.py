@@ -0,0 +1,50 @@
+import json
+import os
+
+import change_feed
+import driver_factory
+import ndjson_output
+import newbooks
+import run_report
+
+PUBLISHERS = [{"name": "한빛미디어", "id": "1"}, {"name": "길벗", "id": "2"}]
+
+
+def test_stream_retry_after_failed_compaction(tmp_path, monkeypatch):
+    output_file = tmp_path / "books_data.json"
+    monkeypatch.setattr(newbooks, "OUTPUT_FILE", str(output_file))
+    monkeypatch.setattr(run_report, "sleep", lambda seconds, reason="": None)
+    monkeypatch.setattr(driver_factory, "shutdown", lambda: None)
+
+    attempts = []
+
+    def crawl_publishers(publishers, *args):
+        output = args[5]
+        attempts.append(output)
+        for publisher in publishers:
+            output.write({"publisher": publisher["name"], "books": [{"title": f"{publisher['name']} 신간"}]})
+        return {}
+
+    compactions = []
+
+    def compact_groups(*args, **kwargs):
+        compactions.append(args)
+        if len(compactions) == 1:
+            raise OSError("disk full")
+        return ndjson_output.compact_groups(*args, **kwargs)
+
+    def commit_output():
+        os.replace(change_feed.staging_path(newbooks.OUTPUT_FILE), newbooks.OUTPUT_FILE)
+
+    monkeypatch.setattr(newbooks, "crawl_publishers", crawl_publishers)
+    monkeypatch.setattr(newbooks, "compact_groups", compact_groups)
+    monkeypatch.setattr(newbooks, "_commit_output", commit_output)
+
+    assert newbooks.main(stream=True, publishers=PUBLISHERS)
+
+    assert len(attempts) == 2
+    assert attempts[0] is not attempts[1]
+    assert json.loads(output_file.read_text(encoding="utf-8")) == {
+        "한빛미디어": [{"title": "한빛미디어 신간"}],
+        "길벗": [{"title": "길벗 신간"}],
+    }
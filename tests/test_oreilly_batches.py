@@ -0,0 +1,146 @@
+import threading
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+import driver_factory
+import oreilly_scraper
+import rate_limiter
+
+CARDS_PER_PAGE = 2
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def new_window(self, kind):
+        self._driver._next += 1
+        handle = f"tab-{self._driver._next}"
+        self._driver.pages[handle] = None
+        self._driver.current_window_handle = handle
+
+    def window(self, handle):
+        self._driver.current_window_handle = handle
+
+
+class FakeDriver:
+    def __init__(self):
+        self._next = 0
+        self.current_window_handle = "main"
+        self.pages = {"main": None}
+        self.switch_to = FakeSwitchTo(self)
+
+    def execute_script(self, script, *args):
+        if args:
+            url = args[0]
+            self.pages[self.current_window_handle] = int(url.rsplit("page=", 1)[1]) if "page=" in url else 1
+
+    def close(self):
+        del self.pages[self.current_window_handle]
+
+    @property
+    def page(self):
+        return self.pages[self.current_window_handle]
+
+
+class FakeSupervisor:
+    def __init__(self, **kwargs):
+        self.driver = FakeDriver()
+
+    def load(self, fetch, *args, pages=1):
+        return fetch(self.driver, *args)
+
+    def close(self, healthy=True):
+        pass
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    host = rate_limiter.host_of(oreilly_scraper.BASE_URL)
+    limiter = rate_limiter.HostLimiter(host, rate=1000.0, concurrency=4)
+    monkeypatch.setitem(rate_limiter._limiters, host, limiter)
+    return limiter
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """``site.last_page``쪽짜리 가짜 결과 목록. 탭이 열릴 때마다 ``site.on_tab``을 실행한다."""
+
+    class Site:
+        last_page = 7
+        on_tab = None
+        loaded = []
+
+    def wait_for_cards(driver):
+        if driver.page > Site.last_page:
+            raise TimeoutException()
+        Site.loaded.append(driver.page)
+
+    def read_cards(driver, extraction):
+        return [
+            {
+                "title": f"Book {driver.page}-{number}",
+                "description": None,
+                "footers": [],
+                "published": None,
+                "href": f"/library/view/book-{driver.page}-{number}/",
+                "cover": None,
+            }
+            for number in range(CARDS_PER_PAGE)
+        ]
+
+    def apply_resource_blocking(driver):
+        if Site.on_tab is not None:
+            Site.on_tab(driver)
+
+    monkeypatch.setattr(driver_factory, "DriverSupervisor", FakeSupervisor)
+    monkeypatch.setattr(driver_factory, "apply_resource_blocking", apply_resource_blocking)
+    monkeypatch.setattr(driver_factory, "record_page_weight", lambda driver: None)
+    monkeypatch.setattr(oreilly_scraper, "_wait_for_cards", wait_for_cards)
+    monkeypatch.setattr(oreilly_scraper, "_wait_for_scroll_render", lambda driver: None)
+    monkeypatch.setattr(oreilly_scraper, "_read_cards", read_cards)
+    return Site
+
+
+def crawl(tabs, max_pages=10):
+    """교착 상태면 테스트가 멈추지 않고 실패하도록 스레드에서 크롤링한다."""
+    result = {}
+    worker = threading.Thread(
+        target=lambda: result.update(books=oreilly_scraper.fetch_books_deep(max_pages, tabs=tabs)), daemon=True
+    )
+    worker.start()
+    worker.join(timeout=10)
+    assert not worker.is_alive(), "deep crawl is stuck waiting for rate-limiter slots"
+    return result["books"]
+
+
+def test_more_tabs_than_concurrency(limiter, site):
+    books = crawl(tabs=5)
+
+    assert len(books) == site.last_page * CARDS_PER_PAGE
+    assert site.loaded == list(range(1, site.last_page + 1))
+    assert limiter.in_flight == 0
+
+
+def test_concurrency_drop_in_the_middle_of_a_batch(limiter, site):
+    in_flight_after_drop = []
+
+    def fail_another_request(driver):
+        if in_flight_after_drop or limiter.concurrency != 4:
+            in_flight_after_drop.append(limiter.in_flight)
+            return
+        # 첫 탭이 자리를 쥔 동안 같은 호스트의 다른 요청이 실패한다: 4 -> 2
+        with pytest.raises(RuntimeError):
+            with limiter.request():
+                raise RuntimeError("server error")
+        in_flight_after_drop.append(limiter.in_flight)
+
+    site.on_tab = fail_another_request
+    books = crawl(tabs=3)
+
+    # 첫 배치는 세 번째 자리를 기다리지 않고 탭 두 개에서 멈춘다
+    assert in_flight_after_drop[:2] == [1, 2]
+    assert len(books) == site.last_page * CARDS_PER_PAGE
+    assert site.loaded == list(range(1, site.last_page + 1))
+    assert limiter.in_flight == 0
@@ -0,0 +1,49 @@
+import json
+
+import driver_factory
+import run_report
+
+
+def event(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+class FakeDriver:
+    def __init__(self, entries):
+        self.entries = entries
+
+    def get_log(self, log_type):
+        assert log_type == "performance"
+        entries, self.entries = self.entries, []
+        return entries
+
+
+def test_counters_are_recorded_without_profiling(monkeypatch):
+    monkeypatch.setattr(driver_factory, "_observed_sizes", {})
+    recorder = run_report.start_run("test", profile=False)
+    driver = FakeDriver([
+        event("Network.requestWillBeSent", requestId="1", type="Image"),
+        event("Network.loadingFinished", requestId="1", encodedDataLength=3000),
+        event("Network.requestWillBeSent", requestId="2", type="Document"),
+        event("Network.loadingFinished", requestId="2", encodedDataLength=500),
+        event("Network.loadingFailed", requestId="3", type="Image", blockedReason="inspector"),
+        event("Network.loadingFailed", requestId="4", type="Font", errorText="net::ERR_FAILED"),
+    ])
+    driver_factory.record_page_weight(driver)
+    assert recorder.counters == {
+        "network_bytes": 3500,
+        "network_requests": 2,
+        "blocked_requests": 1,
+        "blocked_bytes_estimate": 3000,
+    }
+
+
+def test_full_performance_log_only_in_profile_runs(monkeypatch):
+    recorder = run_report.start_run("test", profile=False)
+    options = driver_factory.build_chrome_options()
+    assert options.to_capabilities()["goog:loggingPrefs"] == {"performance": "ALL"}
+    assert options.experimental_options["perfLoggingPrefs"]["enablePage"] is False
+
+    # 프로파일러를 실제로 켜지 않고 SCRAPER_PROFILE 실행처럼 보이게 한다
+    monkeypatch.setattr(recorder, "profile", True)
+    assert "perfLoggingPrefs" not in driver_factory.build_chrome_options().experimental_options
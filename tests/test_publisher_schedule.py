@@ -0,0 +1,89 @@
+import json
+import math
+import queue
+
+import pytest
+
+import driver_factory
+import newbooks
+from publisher_schedule import DAY, MAX_INTERVAL, MIN_INTERVAL, POLL_FRACTION, SCHEDULE_VERSION, PublisherSchedule
+
+NOW = 1_750_000_000.0
+PUBLISHERS = [{"name": "한빛미디어", "id": "1"}, {"name": "길벗", "id": "2"}, {"name": "인사이트", "id": "3"}]
+
+
+@pytest.fixture
+def schedule(tmp_path):
+    return PublisherSchedule(tmp_path / "schedule.json")
+
+
+def polled(schedule, publisher_id, ago, rate=0.0, last_new_ago=None, seconds=60.0):
+    schedule._entries[publisher_id] = {
+        "polled_at": NOW - ago,
+        "rate": rate,
+        "last_new_at": NOW - last_new_ago if last_new_ago is not None else None,
+        "seconds": seconds,
+    }
+
+
+def test_interval(schedule):
+    assert schedule.interval("unknown", NOW) == MAX_INTERVAL
+    polled(schedule, "1", ago=0, rate=0.5)
+    assert schedule.interval("1", NOW) == POLL_FRACTION * DAY / 0.5
+    polled(schedule, "2", ago=0, rate=100)
+    assert schedule.interval("2", NOW) == MIN_INTERVAL
+    # 마지막 신간 이후 오래 조용했으면 더 드물게 확인한다
+    polled(schedule, "3", ago=0, rate=0.5, last_new_ago=20 * DAY)
+    assert schedule.interval("3", NOW) == 5 * DAY
+
+
+def test_priority(schedule):
+    assert schedule.priority("1", NOW) == math.inf
+    polled(schedule, "1", ago=DAY, rate=0.5)
+    assert schedule.priority("1", NOW) == pytest.approx(2.0)
+    polled(schedule, "2", ago=0.25 * DAY, rate=0.5)
+    assert schedule.priority("2", NOW) == pytest.approx(0.5)
+
+
+def test_plan_orders_due_publishers_and_respects_the_budget(schedule):
+    polled(schedule, "1", ago=DAY, rate=0.5, seconds=100)
+    polled(schedule, "2", ago=0.1 * DAY, rate=0.5, seconds=100)
+    crawl, skipped = schedule.plan(PUBLISHERS, now=NOW)
+    assert [publisher["id"] for publisher in crawl] == ["3", "1"]
+    assert [publisher["id"] for publisher in skipped] == ["2"]
+
+    crawl, skipped = schedule.plan(PUBLISHERS, time_budget=90, now=NOW)
+    assert [publisher["id"] for publisher in crawl] == ["3"]
+    assert [publisher["id"] for publisher in skipped] == ["1", "2"]
+
+
+def test_empty_poll_is_recorded(schedule):
+    schedule.record(PUBLISHERS[0], [], 12.0, now=NOW)
+    assert schedule.priority("1", NOW) == 0.0
+    assert schedule._entries["1"]["seconds"] == 12.0
+
+
+def test_non_object_schedule_file_is_ignored(tmp_path):
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps([{"version": SCHEDULE_VERSION}]), encoding="utf-8")
+    assert len(PublisherSchedule(path)) == 0
+
+
+class FakeSupervisor:
+    def __init__(self, **kwargs):
+        self.driver = object()
+
+    def close(self, healthy=True):
+        pass
+
+
+@pytest.mark.parametrize("fetched, recorded", [([], True), (None, False)])
+def test_worker_records_empty_results_but_not_failures(schedule, monkeypatch, fetched, recorded):
+    monkeypatch.setattr(driver_factory, "DriverSupervisor", FakeSupervisor)
+    monkeypatch.setattr(newbooks, "get_publisher_books", lambda *args: fetched)
+    work_queue = queue.Queue()
+    work_queue.put((0, PUBLISHERS[0]))
+    results = {}
+    newbooks._crawl_worker(1, work_queue, results, 1, None, None, "dom", schedule=schedule)
+    assert results == {}
+    assert ("1" in schedule._entries) is recorded
@@ -0,0 +1,35 @@
+from datetime import date
+
+import pytest
+
+import release_dates
+
+
+@pytest.mark.parametrize("text, iso", [
+    ("2025년 06월 05일", "2025-06-05"),
+    ("출간일 2025년 6월 5일", "2025-06-05"),
+    ("2025년 06월", "2025-06"),
+    ("July 2027", "2027-07"),
+    ("Sept. 2026", "2026-09"),
+    ("Jan 5, 2025", "2025-01-05"),
+    ("2025-06-05T00:00:00Z", "2025-06-05"),
+    ("2025년 02월 30일", None),
+    ("Coming soon", None),
+    ("", None),
+    (None, None),
+])
+def test_to_iso(text, iso):
+    assert release_dates.to_iso(text) == iso
+
+
+def test_month_only_dates_sort_before_the_days_of_that_month():
+    assert release_dates.to_date("July 2027") == date(2027, 7, 1)
+    keys = [release_dates.sort_key(iso) for iso in ("2027-07-01", "2027-07", "2027-06-30", None)]
+    assert keys == [20270701, 20270700, 20270630, 0]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_annotate():
+    record = release_dates.annotate({"title": "파이썬 입문"}, "2025년 06월 05일")
+    assert record == {"title": "파이썬 입문", "release_iso": "2025-06-05", "release_sort": 20250605}
+    assert release_dates.annotate({}, "미정") == {"release_iso": None, "release_sort": 0}
@@ -0,0 +1,39 @@
+import asyncio
+import os
+import time
+
+import run_all
+
+SCRIPT = """
+import subprocess, sys, time
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+open(sys.argv[1], "w").write(str(child.pid))
+time.sleep(60)
+"""
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # 부모가 회수하지 않은 좀비는 이미 끝난 것으로 본다
+    with open(f"/proc/{pid}/stat") as stat:
+        return stat.read().split()[2] != "Z"
+
+
+def test_timeout_kills_the_whole_process_group(tmp_path, monkeypatch):
+    script = tmp_path / "spawner.py"
+    script.write_text(SCRIPT, encoding="utf-8")
+    pid_file = tmp_path / "child.pid"
+    monkeypatch.setitem(run_all.SOURCES, "fake", (str(script), "fake.json", 2))
+    monkeypatch.setattr(run_all, "KILL_GRACE_SECONDS", 1)
+
+    status = asyncio.run(run_all._run_subprocess("fake", [str(pid_file)], timeout=2))
+
+    assert status == "timeout"
+    grandchild = int(pid_file.read_text())
+    deadline = time.time() + 5
+    while _alive(grandchild) and time.time() < deadline:
+        time.sleep(0.1)
+    assert not _alive(grandchild)
@@ -0,0 +1,21 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import run_report
+
+
+def busy_worker_function():
+    deadline = time.perf_counter() + 0.2
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+def test_worker_threads_appear_in_hot_functions():
+    recorder = run_report.start_run("test", profile=True)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(run_report.profiled(busy_worker_function)).result()
+    report = recorder.build_report()
+    functions = [entry["function"] for entry in report["profile"]["hot_functions"]]
+    assert any("busy_worker_function" in function for function in functions)